@@ -0,0 +1,319 @@
+# 파일 위치: activity_mart.py
+"""
+활동 분석 페이지용 '주간 활동 마트' 빌드 도구.
+
+성장 로그에서 주차별 weekly_exp_gain / activity_status / level_range를 미리 계산해
+주차(date)별 Arrow 파일로 저장합니다. 새 주차가 들어오면 ocid별 직전 상태(state)와의
+차이만 계산해 해당 주차 파일 하나만 추가하므로, 17주차 추가 비용은 O(유저 수)입니다.
+
+    python activity_mart.py growth_log_v2_f_v2.csv
+"""
+
+import json
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from artifacts import artifact
+from cache import cached
+from utils import (
+    CACHE_DIR,
+    GROWTH_LOG_PATH,
+    LEVEL_BINS,
+    LEVEL_LABELS,
+    growth_log_dates,
+    is_partitioned_store,
+    partition_fingerprints,
+    read_growth_log,
+    source_fingerprint,
+    use_duckdb,
+    use_streaming,
+)
+
+MART_VERSION = 1
+MART_ROOT = CACHE_DIR / 'activity_mart'
+
+ACTIVITY_STATUSES = ['첫 주', '성장', '정체']
+
+MART_COLUMNS = ['ocid', 'date', 'character_level', 'has_guild', 'weekly_exp_gain', 'activity_status', 'level_range']
+
+
+def empty_state():
+    """ocid별 직전 주차 상태 (마지막 경험치, 지금까지 관측된 주차 수)."""
+    return pd.DataFrame(
+        {'last_exp': pd.Series(dtype='float64'), 'weeks_seen': pd.Series(dtype='int32')},
+        index=pd.Index([], dtype='string', name='ocid'),
+    )
+
+
+def append_week(state, week_df):
+    """
+    한 주차의 로그(week_df)에 대해 활동 지표를 계산하고, 갱신된 state와 함께 반환합니다.
+    week_df는 ocid가 중복되지 않는 단일 날짜의 행이어야 합니다.
+    """
+    ocids = pd.Index(week_df['ocid'].astype('string'), name='ocid')
+    prev = state.reindex(ocids)
+    exp = week_df['character_exp'].astype('float64').to_numpy(na_value=np.nan)
+
+    # 이전 주차 경험치가 없거나(첫 관측·월드 리프) 이번 주 값이 없으면 0으로 봅니다.
+    gain = np.nan_to_num(exp - prev['last_exp'].to_numpy(), nan=0.0)
+    first_week = prev['weeks_seen'].isna().to_numpy()
+    status_codes = np.where(first_week, 0, np.where(gain > 0, 1, 2)).astype('int8')
+
+    week = pd.DataFrame({
+        'ocid': week_df['ocid'].astype('string').to_numpy(),
+        'date': week_df['date'].to_numpy(),
+        'character_level': week_df['character_level'].to_numpy(),
+        'has_guild': week_df['has_guild'].to_numpy(),
+        'weekly_exp_gain': gain,
+        'activity_status': pd.Categorical.from_codes(status_codes, categories=ACTIVITY_STATUSES),
+    })
+    week['level_range'] = pd.cut(week['character_level'], bins=LEVEL_BINS, labels=LEVEL_LABELS, right=False)
+
+    updated = pd.DataFrame(
+        {
+            'last_exp': exp,
+            'weeks_seen': (prev['weeks_seen'].fillna(0).to_numpy() + 1).astype('int32'),
+        },
+        index=ocids,
+    )
+    # Arrow 문자열 인덱스의 isin은 원소별 파이썬 비교로 떨어지므로 해시 조회(get_indexer)로 거릅니다.
+    new_state = pd.concat([state[ocids.get_indexer(state.index) < 0], updated])
+    return week, new_state
+
+
+def _partition_path(mart_dir, date):
+    return mart_dir / f"date={pd.Timestamp(date):%Y-%m-%d}.arrow"
+
+
+def _read_meta(mart_dir):
+    try:
+        meta = json.loads((mart_dir / 'meta.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == MART_VERSION else None
+
+
+def _write_meta(mart_dir, meta):
+    (mart_dir / 'meta.json').write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def write_weeks(mart_dir, state, weeks):
+    """weeks(날짜별 로그 프레임 목록)를 순서대로 마트에 추가하고 갱신된 state를 반환합니다."""
+    mart_dir.mkdir(parents=True, exist_ok=True)
+    for week_df in weeks:
+        week, state = append_week(state, week_df)
+        feather.write_feather(week, _partition_path(mart_dir, week_df['date'].iloc[0]), compression='uncompressed')
+    feather.write_feather(state.reset_index(), mart_dir / 'state.arrow', compression='uncompressed')
+    return state
+
+
+def read_state(mart_dir):
+    path = mart_dir / 'state.arrow'
+    if not path.exists():
+        return empty_state()
+    return feather.read_feather(path).set_index('ocid')
+
+
+def update_activity_mart(file_path):
+    """
+    원본 성장 로그와 마트를 비교해 필요한 만큼만 다시 계산합니다.
+
+    - 원본 지문이 같으면 아무 것도 하지 않습니다.
+    - 기존 주차가 모두 그대로이고 더 최근 날짜만 늘었다면 새 주차만 추가합니다.
+      파티션 저장소는 기존 주차 파티션의 지문(version)까지 같아야 그대로인 것으로 봅니다.
+    - 그 밖의 경우(과거 주차 삭제·수정, 중간 날짜 삽입 등)에는 전체를 다시 빌드합니다.
+    """
+    mart_dir = MART_ROOT / Path(file_path).stem
+    fingerprint = source_fingerprint(file_path)
+    meta = _read_meta(mart_dir)
+    if meta and meta['fingerprint'] == fingerprint:
+        return mart_dir
+
+    source_dates = growth_log_dates(file_path)
+    built_dates = [pd.Timestamp(d) for d in meta['dates']] if meta else []
+    partitions = partition_fingerprints(file_path) if is_partitioned_store(file_path) else {}
+
+    new_dates = [d for d in source_dates if d not in set(built_dates)]
+    appendable = (
+        built_dates
+        and set(built_dates) <= set(source_dates)
+        and new_dates
+        and min(new_dates) > max(built_dates)
+        and all(meta.get('partitions', {}).get(d) == partitions.get(d) for d in meta['dates'])
+    )
+    if appendable:
+        state = read_state(mart_dir)
+    else:
+        shutil.rmtree(mart_dir, ignore_errors=True)
+        state = empty_state()
+        new_dates = source_dates
+
+    # 파티션 저장소라면 새 주차의 파티션만 읽습니다.
+    by_date = read_growth_log(file_path, dates=new_dates).groupby('date', sort=True)
+    write_weeks(mart_dir, state, (week_df for _, week_df in by_date))
+    _write_meta(mart_dir, {
+        'version': MART_VERSION,
+        'fingerprint': fingerprint,
+        'dates': [f"{pd.Timestamp(d):%Y-%m-%d}" for d in source_dates],
+        'partitions': partitions,
+    })
+    return mart_dir
+
+
+def read_activity_mart(mart_dir):
+    """주차별 파티션을 메모리 매핑으로 읽어 하나의 프레임으로 합칩니다."""
+    tables = [feather.read_table(path, memory_map=True) for path in sorted(mart_dir.glob('date=*.arrow'))]
+    if not tables:
+        return pd.DataFrame(columns=MART_COLUMNS)
+    return pa.concat_tables(tables).to_pandas(split_blocks=True)
+
+
+def load_activity_mart(file_path, shared=True):
+    """
+    마트를 최신 상태로 맞춘 뒤 전체 주차를 반환합니다.
+    shared면 dataset_server.py가 같은 원본 지문으로 게시한 마트에 먼저 붙습니다.
+    """
+    if shared:
+        from dataset_server import attach_dataset  # dataset_server가 이 모듈을 임포트하므로 호출 시점에 가져옵니다.
+
+        mart = attach_dataset('activity_mart', file_path)
+        if mart is not None:
+            return mart
+    return read_activity_mart(update_activity_mart(file_path))
+
+
+@dataclass(frozen=True)
+class ActivityCube:
+    """
+    날짜 × 활동 상태 × 레벨 구간별 유저 수를 담은 작은 집계 큐브.
+
+    counts[d, s, l]은 dates[d], ACTIVITY_STATUSES[s], LEVEL_LABELS[l]에 해당하는 행 수이며,
+    마지막 레벨 축(l == len(LEVEL_LABELS))은 레벨 구간이 없는(결측) 행입니다.
+    페이지의 집계 차트는 모두 이 배열을 잘라서 만들므로 행 단위 로그를 다시 훑지 않습니다.
+    """
+
+    dates: pd.DatetimeIndex
+    counts: np.ndarray
+
+    def _status(self, status):
+        return ACTIVITY_STATUSES.index(status)
+
+    def status_trend(self, statuses=('성장', '정체')):
+        """주차별 활동 상태 비율(%) — '첫 주'를 제외한 행 기준."""
+        by_status = self.counts.sum(axis=2)[:, [self._status(s) for s in statuses]]
+        totals = by_status.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = by_status / totals * 100
+        trend = pd.DataFrame({
+            'date': np.repeat(self.dates, len(statuses)),
+            'activity_status': np.tile(statuses, len(self.dates)),
+            'user_count': by_status.ravel(),
+            'percentage': share.ravel(),
+        })
+        trend = trend[trend['user_count'] > 0]
+        return trend.sort_values(['date', 'user_count'], ascending=[True, False]).drop(columns='user_count')
+
+    def level_distribution(self, statuses=('성장', '정체')):
+        """(날짜, 상태)별 레벨 구간 분포를 long 형식으로 반환합니다. 결측 레벨은 제외합니다."""
+        idx = [self._status(s) for s in statuses]
+        counts = self.counts[:, idx, :len(LEVEL_LABELS)]
+        totals = counts.sum(axis=2, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = counts / totals * 100
+        d, s, l = np.nonzero(counts)
+        return pd.DataFrame({
+            'date': self.dates[d],
+            'activity_status': np.asarray(statuses)[s],
+            'level_range': pd.Categorical.from_codes(l, categories=LEVEL_LABELS, ordered=True),
+            'user_count': counts[d, s, l],
+            'percentage': share[d, s, l],
+        })
+
+    def level_heatmap(self, status):
+        """레벨 구간(행, 내림차순) × 날짜(열) 비율(%) 표. 유저가 없는 칸은 NaN입니다."""
+        counts = self.counts[:, self._status(status), :len(LEVEL_LABELS)].T.astype('float64')
+        totals = counts.sum(axis=0, keepdims=True)
+        counts[counts == 0] = np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = counts / totals * 100
+        heatmap = pd.DataFrame(share, index=pd.CategoricalIndex(LEVEL_LABELS, ordered=True, name='level_range'), columns=pd.Index(self.dates, name='date'))
+        return heatmap.dropna(how='all').dropna(axis=1, how='all').sort_index(ascending=False)
+
+    def status_share_by_level(self, status, statuses=('성장', '정체')):
+        """전체 기간 레벨 구간별로 statuses 중 status가 차지하는 비율(%)."""
+        counts = self.counts[:, [self._status(s) for s in statuses], :len(LEVEL_LABELS)].sum(axis=0)
+        target = counts[list(statuses).index(status)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = target / counts.sum(axis=0) * 100
+        present = target > 0
+        return pd.DataFrame({
+            'level_range': pd.Categorical(np.asarray(LEVEL_LABELS)[present], categories=LEVEL_LABELS, ordered=True),
+            'activity_status': status,
+            'percentage': share[present],
+        })
+
+
+def build_activity_cube(mart):
+    """활동 마트를 한 번 훑어 ActivityCube를 만듭니다."""
+    dates = pd.DatetimeIndex(np.sort(mart['date'].dropna().unique()))
+    date_codes = dates.get_indexer(mart['date'])
+    status_codes = mart['activity_status'].cat.codes.to_numpy()
+    level_codes = mart['level_range'].cat.codes.to_numpy().astype('int64')
+    level_codes[level_codes < 0] = len(LEVEL_LABELS)
+
+    shape = (len(dates), len(ACTIVITY_STATUSES), len(LEVEL_LABELS) + 1)
+    valid = (date_codes >= 0) & (status_codes >= 0)
+    flat = np.ravel_multi_index((date_codes[valid], status_codes[valid], level_codes[valid]), shape)
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape).astype('int32')
+    return ActivityCube(dates=dates, counts=counts)
+
+
+# --- 활동 분석 페이지용 캐시된 로더 ---
+# 캐시 키는 원본 지문이라 데이터가 바뀌면 새로 계산합니다. precompute.py가 만든 아티팩트가 있으면 그것을 읽습니다.
+# 스트리밍 모드에서는 마트 전체를 읽지 않고 주차를 하나씩 훑으며 큐브와 박스 통계를 함께 만들고,
+# DuckDB 백엔드에서는 같은 지표를 윈도 함수·GROUP BY로 계산합니다.
+# (growth_stream·sql_backend가 이 모듈을 임포트하므로 호출 시점에 가져옵니다.)
+
+@cached('activity_cube', max_entries=2, sources=lambda file_path: [file_path])
+@artifact('activity_cube', sources=lambda file_path: [file_path])
+def read_activity_cube(file_path):
+    if use_duckdb():
+        import sql_backend
+
+        return sql_backend.activity_cube(file_path)
+    if use_streaming(file_path):
+        from growth_stream import read_activity_aggregates
+
+        return read_activity_aggregates(file_path)[0]
+    return build_activity_cube(load_activity_mart(file_path))
+
+
+@cached('guild_gain_box_stats', max_entries=2, sources=lambda file_path: [file_path])
+@artifact('guild_gain_box_stats', sources=lambda file_path: [file_path])
+def read_guild_gain_box_stats(file_path):
+    if use_duckdb():
+        import sql_backend
+
+        return sql_backend.guild_gain_box_stats(file_path)
+    if use_streaming(file_path):
+        from growth_stream import read_activity_aggregates
+
+        return read_activity_aggregates(file_path)[1]
+    from chart_data import box_stats  # chart_data는 plotly를 임포트하므로 호출 시점에 가져옵니다.
+
+    # 박스플롯도 '성장' 행의 사분위수·수염만 미리 계산해 둡니다.
+    mart = load_activity_mart(file_path)
+    return box_stats(mart[mart['weekly_exp_gain'] > 0], 'weekly_exp_gain', 'has_guild')
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:] or [GROWTH_LOG_PATH]:
+        mart_dir = update_activity_mart(path)
+        print(f"{path} -> {mart_dir} ({len(list(mart_dir.glob('date=*.arrow')))} weeks)")
@@ -0,0 +1,87 @@
+# 파일 위치: artifacts.py
+"""
+미리 계산한 파생 데이터(아티팩트) 저장소.
+
+precompute.py가 페이지의 파생 데이터(활동 큐브, 스냅샷 인덱스, 코디 집계 등)를 미리 만들어
+버전별 디렉터리(.cache/artifacts/v{ARTIFACT_VERSION})에 pickle로 저장해 두면,
+@artifact로 표시한 로더는 계산하지 않고 이 파일을 읽습니다. 파일이 없거나 깨졌으면 기존처럼 계산합니다.
+
+파일 이름에는 원본 파일 지문과 (성장 로그에서 파생한 아티팩트라면) 그 로그의 계산 방식
+(utils.derivation_variant: 로딩 모드, 집계 엔진, 스키마 버전)이 들어가므로
+원본이 바뀌거나 다른 모드로 실행하면 예전 아티팩트는 쓰이지 않습니다.
+아티팩트에 담기는 객체의 구조가 바뀌면 ARTIFACT_VERSION을 올립니다.
+
+    @cached('activity_cube', max_entries=2, sources=lambda file_path: [file_path])
+    @artifact('activity_cube', sources=lambda file_path: [file_path])
+    def read_activity_cube(file_path):
+        ...
+"""
+
+import hashlib
+import os
+import pickle
+from functools import wraps
+
+from utils import CACHE_DIR, derivation_variant, source_fingerprint
+
+ARTIFACT_VERSION = 5
+ARTIFACT_DIR = CACHE_DIR / 'artifacts' / f"v{ARTIFACT_VERSION}"
+
+
+def artifact_path(name, paths, from_growth_log=True):
+    """
+    원본 파일 paths로 만든 아티팩트 name의 경로.
+    from_growth_log면 paths[0]이 성장 로그이며, 그 로그의 계산 방식별로 파일을 나눕니다.
+    """
+    parts = [source_fingerprint(path) for path in paths]
+    if from_growth_log:
+        parts.append(':'.join(map(str, derivation_variant(paths[0]))))
+    raw = ':'.join(parts)
+    return ARTIFACT_DIR / f"{name}.{hashlib.sha1(raw.encode()).hexdigest()[:16]}.pkl"
+
+
+def read_artifact(name, paths, from_growth_log=True):
+    """저장된 아티팩트. 없거나 읽을 수 없으면 None."""
+    try:
+        with open(artifact_path(name, paths, from_growth_log), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def write_artifact(name, paths, value, from_growth_log=True):
+    """아티팩트를 원자적으로 저장하고, 같은 이름의 예전 아티팩트는 지웁니다. 저장한 경로를 반환합니다."""
+    path = artifact_path(name, paths, from_growth_log)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    for stale in ARTIFACT_DIR.glob(f"{name}.*.pkl"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+def artifact(name, sources, from_growth_log=True):
+    """
+    저장된 아티팩트가 있으면 읽고, 없으면 함수를 실행하는 데코레이터.
+    sources는 같은 인자를 받아 원본 파일 경로 목록을 돌려주는 함수이며, 첫 번째가 성장 로그입니다.
+    성장 로그와 무관한 아티팩트(코디 CSV만 읽는 것 등)는 from_growth_log=False로 표시합니다.
+    precompute.py는 wrapper.precompute(*args)로 계산 결과를 아티팩트로 저장하고,
+    wrapper.artifact_path(*args)로 저장 위치를 확인합니다.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            value = read_artifact(name, sources(*args, **kwargs), from_growth_log)
+            return func(*args, **kwargs) if value is None else value
+
+        def precompute(*args, **kwargs):
+            return write_artifact(name, sources(*args, **kwargs), func(*args, **kwargs), from_growth_log)
+
+        wrapper.artifact_name = name
+        wrapper.artifact_path = lambda *args, **kwargs: artifact_path(name, sources(*args, **kwargs), from_growth_log)
+        wrapper.precompute = precompute
+        return wrapper
+    return decorator
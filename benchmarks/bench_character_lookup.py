@@ -0,0 +1,61 @@
+# 파일 위치: benchmarks/bench_character_lookup.py
+"""
+캐릭터 탐색 페이지의 조회 비용(character_index.py)을 측정합니다.
+
+인덱스를 한 번 만든 뒤 무작위 캐릭터에 대해
+- search: 이름 접두어 검색 (이름 앞 2글자)
+- trajectory: ocid → 16주 궤적 (행 범위 슬라이스)
+- similar: 주간 성장량 코사인 유사도 TOP 10
+의 호출당 평균 시간(µs)을 출력합니다. trajectory는 1ms 미만이어야 정상입니다.
+
+    python benchmarks/bench_character_lookup.py
+    python benchmarks/bench_character_lookup.py --csv /tmp/synth/growth_log_v2_f_v2.csv
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from character_index import TRAJECTORY_COLUMNS, build_character_index  # noqa: E402
+from utils import read_growth_log  # noqa: E402
+
+
+def per_call_us(func, args):
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(ROOT / 'growth_log_v2_f_v2.csv'))
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    df = read_growth_log(args.csv, columns=TRAJECTORY_COLUMNS)
+    start = time.perf_counter()
+    index = build_character_index(df)
+    build = time.perf_counter() - start
+
+    rng = np.random.default_rng(args.seed)
+    named = index.profiles.dropna(subset=['character_name'])
+    picked = named.iloc[rng.integers(0, len(named), args.queries)]
+    ocids = picked['ocid'].tolist()
+    prefixes = [name[:2] for name in picked['character_name']]
+
+    print(f"characters: {len(index.ocids):,}  weeks: {len(index.dates)}  build: {build:.2f}s")
+    print(f"{'search':>10} {per_call_us(index.search, prefixes):>10.0f} µs")
+    print(f"{'trajectory':>10} {per_call_us(index.trajectory, ocids):>10.0f} µs")
+    print(f"{'similar':>10} {per_call_us(index.similar, ocids[:100]):>10.0f} µs")
+
+
+if __name__ == '__main__':
+    main()
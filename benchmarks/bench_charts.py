@@ -0,0 +1,87 @@
+# 파일 위치: benchmarks/bench_charts.py
+"""
+차트 payload 크기와 생성·직렬화 시간을 기존 방식(px에 행 단위 프레임 전달)과
+chart_data 계층(서버 측 집계·점 제한)으로 비교합니다.
+
+브라우저 렌더링 시간은 헤드리스로 잴 수 없으므로, 렌더링 비용에 비례하는
+figure JSON 크기와 서버의 figure 생성 + to_json 시간을 측정합니다.
+
+    python benchmarks/bench_charts.py --scales 1 10 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench_preprocess import scaled_raw_log  # noqa: E402
+from chart_data import box_figure, decimate_points, histogram_figure, payload_bytes  # noqa: E402
+from utils import GROWTH_LOG_DTYPES, preprocess_growth_log  # noqa: E402
+
+
+def chart_cases(df):
+    """(차트 이름, 기존 방식 함수, 새 방식 함수) 목록."""
+    snapshot = df[df['date'] == df['date'].max()]
+    top_classes = snapshot['character_class'].value_counts().nlargest(10).index
+    top_df = snapshot[snapshot['character_class'].isin(top_classes)]
+    return [
+        (
+            'p1 레벨 히스토그램',
+            lambda: px.histogram(df, x='character_level', color='user_status'),
+            lambda: histogram_figure(df, 'character_level', bin_width=1, color='user_status'),
+        ),
+        (
+            'p3 전투력 히스토그램',
+            lambda: px.histogram(snapshot.dropna(subset=['전투력']), x='전투력', nbins=50),
+            lambda: histogram_figure(snapshot, '전투력', nbins=50),
+        ),
+        (
+            'p3 직업별 박스플롯',
+            lambda: px.box(top_df, x='character_class', y='전투력', color='character_class', points=False),
+            lambda: box_figure(top_df, 'character_class', '전투력', category_order=top_classes),
+        ),
+        (
+            'p3 레벨-전투력 산점도',
+            lambda: px.scatter(snapshot, x='character_level', y='전투력', hover_name='character_name'),
+            lambda: px.scatter(
+                decimate_points(snapshot, 'character_level', '전투력'),
+                x='character_level', y='전투력', hover_name='character_name',
+            ),
+        ),
+    ]
+
+
+def measure(build):
+    start = time.perf_counter()
+    fig = build()
+    size = payload_bytes(fig)
+    return size, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(ROOT / 'growth_log_v2_f_v2.csv'))
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.csv, dtype=GROWTH_LOG_DTYPES)
+    print(f"{'rows':>10} {'chart':<16} {'before KB':>10} {'after KB':>9} {'before s':>9} {'after s':>8}")
+    for scale in args.scales:
+        df = preprocess_growth_log(scaled_raw_log(base, scale))
+        for name, before, after in chart_cases(df):
+            before_size, before_time = measure(before)
+            after_size, after_time = measure(after)
+            print(
+                f"{len(df):>10,} {name:<16} {before_size / 1024:>10.1f} {after_size / 1024:>9.1f}"
+                f" {before_time:>9.3f} {after_time:>8.3f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
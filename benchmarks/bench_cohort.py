@@ -0,0 +1,62 @@
+# 파일 위치: benchmarks/bench_cohort.py
+"""
+코호트 생존 분석 페이지의 계산 비용(cohort_survival.py)을 측정합니다.
+
+패널을 한 번 만든 뒤 이탈 기준 × 코호트 기준마다
+- survival: 코호트별 Kaplan–Meier 생존 곡선
+- summary: 코호트별 요약 표
+- retention: 코호트 × 주차 성장 유저 비율
+의 호출당 시간(ms)을 출력합니다. 필터를 바꿀 때 페이지가 다시 계산하는 것은 이 세 가지뿐입니다.
+
+    python benchmarks/bench_cohort.py
+    python benchmarks/bench_cohort.py --csv /tmp/synth/growth_log_v2_f_v2.csv --stream
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from cohort_survival import COHORT_DIMENSIONS, EVENTS, PANEL_COLUMNS, build_cohort_panel  # noqa: E402
+from growth_stream import iter_growth_chunks  # noqa: E402
+from utils import read_growth_log  # noqa: E402
+
+
+def per_call_ms(func, *args, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(ROOT / 'growth_log_v2_f_v2.csv'))
+    parser.add_argument('--stream', action='store_true', help='청크 단위로 읽어 패널을 만듭니다 (스트리밍 모드와 같은 경로)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.stream:
+        panel = build_cohort_panel(iter_growth_chunks(args.csv, PANEL_COLUMNS))
+    else:
+        panel = build_cohort_panel(read_growth_log(args.csv, columns=PANEL_COLUMNS, shared=False))
+    build = time.perf_counter() - start
+
+    print(f"users: {panel.n_users:,}  weeks: {len(panel.dates)}  build (읽기 포함): {build:.2f}s")
+    print(f"{'이탈 기준':<8} {'코호트 기준':<10} {'survival':>9} {'summary':>9} {'retention':>10}  (ms)")
+    for event in EVENTS:
+        for dimension in COHORT_DIMENSIONS:
+            print(
+                f"{event:<8} {dimension:<10}"
+                f" {per_call_ms(panel.survival, event, dimension, repeat=args.repeat):>9.1f}"
+                f" {per_call_ms(panel.summary, event, dimension, repeat=args.repeat):>9.1f}"
+                f" {per_call_ms(panel.retention, dimension, repeat=args.repeat):>10.1f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
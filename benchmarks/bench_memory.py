@@ -0,0 +1,51 @@
+# 파일 위치: benchmarks/bench_memory.py
+"""
+성장 로그 프레임의 컬럼별 메모리 사용량을 pandas 기본 dtype과 압축 스키마(utils.GROWTH_LOG_DTYPES)로 비교합니다.
+
+- 기본값: dtype 지정 없이 read_csv (문자열은 object, 수치는 float64/int64) 후 공통 전처리
+- 압축: GROWTH_LOG_DTYPES로 파싱 후 공통 전처리 (범주·Int16·UInt8·boolean·float32)
+
+큰 데이터는 합성 로그로 확인합니다.
+
+    python benchmarks/bench_memory.py
+    python benchmarks/synth_data.py --users 200000 --out-dir /tmp/synth && \\
+        python benchmarks/bench_memory.py --csv /tmp/synth/growth_log_v2_f_v2.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils import GROWTH_LOG_DTYPES, memory_report, preprocess_growth_log  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(ROOT / 'growth_log_v2_f_v2.csv'))
+    args = parser.parse_args()
+
+    with pd.option_context('future.infer_string', False):
+        default = preprocess_growth_log(pd.read_csv(args.csv))
+    compact = preprocess_growth_log(pd.read_csv(args.csv, dtype=GROWTH_LOG_DTYPES))
+
+    before, after = memory_report(default), memory_report(compact)
+    table = pd.DataFrame({
+        'dtype(기본)': before['dtype'],
+        'MB(기본)': before['bytes'] / 1024 ** 2,
+        'dtype(압축)': after['dtype'],
+        'MB(압축)': after['bytes'] / 1024 ** 2,
+        'B/행(압축)': after['bytes_per_row'],
+    })
+    table['배율'] = table['MB(기본)'] / table['MB(압축)']
+    with pd.option_context('display.width', 160, 'display.max_rows', None, 'display.max_columns', None, 'display.float_format', '{:,.2f}'.format):
+        print(f"rows: {len(compact):,}")
+        print(table)
+
+
+if __name__ == '__main__':
+    main()
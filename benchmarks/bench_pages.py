@@ -0,0 +1,251 @@
+# 파일 위치: benchmarks/bench_pages.py
+"""
+대시보드 전체 페이지의 헤드리스 벤치마크·프로파일링 도구.
+
+원본 성장 로그·코디 스냅샷·후보 유저 파일을 scale배로 키운 작업 디렉터리를 만들고
+(--synthetic이면 synth_data.py로 원본 유저 수 × scale명의 합성 데이터를 만들고),
+페이지마다 새 프로세스에서 AppTest로 두 번(첫 실행 / 캐시가 찬 재실행) 실행해
+- 전체 실행 시간, 최대 RSS
+- 단계별 시간: load(파일 읽기), transform(전처리·집계·인덱스), chart(figure 생성),
+  serialize(figure JSON·표 Arrow 직렬화), other(위젯·스크립트 나머지)
+를 기록합니다. 단계 시간은 해당 함수를 감싸 측정하며, 중첩 호출은 가장 안쪽 단계로만 셉니다.
+
+결과는 JSON으로 저장하고 --baseline으로 이전 결과와 비교해 회귀가 있으면 종료 코드 1을 반환합니다.
+
+    python benchmarks/bench_pages.py --scales 1 10 100 --output bench_pages.json
+    python benchmarks/bench_pages.py --scales 1 10 --baseline bench_pages.json
+    python benchmarks/bench_pages.py --scales 100 1000 --synthetic
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench_preprocess import scaled_raw_log  # noqa: E402
+from synth_data import generate  # noqa: E402
+
+PAGES = sorted(str(p.relative_to(ROOT)) for p in (ROOT / 'pages').glob('*.py'))
+
+GROWTH_LOG_FILE = 'growth_log_v2_f_v2.csv'
+CODY_FILE = '코디_분석_결과.csv'
+CANDIDATES_FILE = 'candidates_챌린저스_lv260_and_above.csv'
+
+# 단계 -> 감쌀 함수 ('모듈:속성')
+STAGES = {
+    'load': [
+        'utils:read_growth_log',
+        'utils:_load_candidate_level_histogram',
+        'activity_mart:read_activity_mart',
+        'cody_data:read_cody_dataframe',
+        'growth_stream:spill_weeks',
+        'growth_stream:read_week',
+        'sql_backend:ensure_loaded',
+        'sections:_stored_spec',
+        'artifacts:read_artifact',
+    ],
+    'transform': [
+        'activity_mart:update_activity_mart',
+        'activity_mart:build_activity_cube',
+        'snapshot_index:build_snapshot_index',
+        'chart_data:histogram_counts',
+        'chart_data:box_stats',
+        'chart_data:decimate_points',
+        'segment_aggregates:build_segment_aggregates',
+        'cody_data:read_cody_growth_join',
+        'growth_stream:build_growth_summary',
+        'growth_stream:build_activity_aggregates',
+        'character_index:build_character_index',
+        'cohort_survival:build_cohort_panel',
+        'sql_backend:query',
+    ],
+    'chart': [
+        'chart_data:histogram_figure',
+        'chart_data:box_figure_from_stats',
+        *(f'plotly.express:{name}' for name in ('bar', 'line', 'pie', 'scatter', 'imshow', 'histogram', 'box')),
+    ],
+    'serialize': [
+        'plotly.io:to_json',
+        'streamlit.dataframe_util:convert_anything_to_arrow_bytes',
+    ],
+}
+STAGE_NAMES = [*STAGES, 'other']
+
+
+# --- 작업 디렉터리 (scale배 데이터) ---
+
+def build_workdir(base_dir, scale, synthetic=False):
+    """scale배 데이터 파일을 담은 작업 디렉터리. 이미 만들어져 있으면 재사용합니다."""
+    workdir = Path(base_dir) / (f"synth{scale}" if synthetic else f"x{scale}")
+    stamp = workdir / '.complete'
+    if stamp.exists():
+        return workdir
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    growth = pd.read_csv(ROOT / GROWTH_LOG_FILE, dtype=str, keep_default_na=False)
+    if synthetic:
+        generate(workdir, users=growth['ocid'].nunique() * scale, weeks=growth['date'].nunique())
+    else:
+        # 문자열 그대로 읽고 써서 원본과 같은 형식의 CSV를 만듭니다. ocid 접미사는 파일 간에 맞춥니다.
+        scaled_raw_log(growth, scale).to_csv(workdir / GROWTH_LOG_FILE, index=False)
+        cody = pd.read_csv(ROOT / CODY_FILE, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        scaled_raw_log(cody, scale).to_csv(workdir / CODY_FILE, index=False, encoding='utf-8')
+    candidates = pd.read_csv(ROOT / CANDIDATES_FILE, dtype=str, keep_default_na=False)
+    pd.concat([candidates] * scale, ignore_index=True).to_csv(workdir / CANDIDATES_FILE, index=False)
+
+    stamp.touch()
+    return workdir
+
+
+# --- 단계별 프로파일러 (워커 프로세스) ---
+
+class StageProfiler:
+    def __init__(self):
+        self.totals = dict.fromkeys(STAGES, 0.0)
+        self._stack = []  # [단계, 자식 단계에 쓴 시간]
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            self._stack.append([stage, 0.0])
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _, child_time = self._stack.pop()
+                self.totals[stage] += elapsed - child_time
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+        return timed
+
+    def install(self):
+        """대상 함수를 감싸고, 'from x import f'로 이미 가져간 모듈의 이름도 함께 바꿉니다."""
+        replacements = {}
+        for stage, targets in STAGES.items():
+            for target in targets:
+                module_name, attr = target.split(':')
+                module = importlib.import_module(module_name)
+                original = getattr(module, attr)
+                replacements[id(original)] = (original, self.wrap(stage, original))
+        for module in list(sys.modules.values()):
+            for name, value in list(getattr(module, '__dict__', {}).items()):
+                if id(value) in replacements and replacements[id(value)][0] is value:
+                    setattr(module, name, replacements[id(value)][1])
+
+    def take(self):
+        totals, self.totals = self.totals, dict.fromkeys(STAGES, 0.0)
+        return totals
+
+
+def run_page(page):
+    """(워커) 현재 디렉터리의 데이터로 page를 두 번 실행하고 측정 결과를 반환합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    profiler = StageProfiler()
+    profiler.install()
+    app = AppTest.from_file(str(ROOT / page), default_timeout=3600)
+
+    result = {}
+    for run in ('cold', 'warm'):
+        start = time.perf_counter()
+        app.run()
+        wall = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f"{page}: {app.exception[0].value}")
+        stages = profiler.take()
+        stages['other'] = max(wall - sum(stages.values()), 0.0)
+        result[run] = {'wall': wall, 'stages': stages}
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+# --- 실행·보고 ---
+
+def measure(page, workdir):
+    env = {k: v for k, v in os.environ.items() if k != 'GROWTH_LOG_PATH'}
+    env['PYTHONPATH'] = os.pathsep.join([str(ROOT), str(ROOT / 'benchmarks'), env.get('PYTHONPATH', '')])
+    shutil.rmtree(Path(workdir) / '.cache', ignore_errors=True)  # 페이지마다 캐시 없이 시작합니다.
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', page],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr[-2000:])
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def print_report(report):
+    header = f"{'scale':>5} {'page':<40} {'run':<4} {'wall(s)':>8} " + ' '.join(f"{s:>9}" for s in STAGE_NAMES) + f" {'RSS(MB)':>8}"
+    print(header)
+    for scale, pages in report.items():
+        for page, result in pages.items():
+            for run in ('cold', 'warm'):
+                stages = ' '.join(f"{result[run]['stages'][s]:>9.3f}" for s in STAGE_NAMES)
+                rss = f"{result['peak_rss_mb']:>8.0f}" if run == 'cold' else ''
+                print(f"{scale:>5} {Path(page).stem:<40} {run:<4} {result[run]['wall']:>8.3f} {stages} {rss}")
+
+
+def compare(report, baseline, threshold, min_seconds):
+    """baseline 대비 threshold 비율 이상 (그리고 min_seconds 이상) 느려진 항목 목록."""
+    regressions = []
+    for scale, pages in report.items():
+        for page, result in pages.items():
+            old = baseline.get(scale, {}).get(page)
+            if old is None:
+                continue
+            metrics = [(f"{run} wall", result[run]['wall'], old[run]['wall']) for run in ('cold', 'warm')]
+            metrics += [(f"cold {s}", result['cold']['stages'][s], old['cold']['stages'][s]) for s in STAGES]
+            for name, new_value, old_value in metrics:
+                if new_value - old_value > min_seconds and new_value > old_value * (1 + threshold):
+                    regressions.append(f"x{scale} {page} {name}: {old_value:.3f}s -> {new_value:.3f}s")
+            if result['peak_rss_mb'] > old['peak_rss_mb'] * (1 + threshold):
+                regressions.append(f"x{scale} {page} peak RSS: {old['peak_rss_mb']:.0f}MB -> {result['peak_rss_mb']:.0f}MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--pages', nargs='+', default=PAGES)
+    parser.add_argument('--data-dir', default=str(Path(tempfile.gettempdir()) / 'maple_bench'), help='scale별 작업 디렉터리 위치')
+    parser.add_argument('--synthetic', action='store_true', help='원본 복제 대신 합성 데이터(synth_data.py) 사용')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=0.25, help='회귀로 볼 증가 비율')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='회귀로 볼 최소 증가 시간')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker)))
+        return 0
+
+    report = {}
+    for scale in args.scales:
+        workdir = build_workdir(args.data_dir, scale, args.synthetic)
+        report[str(scale)] = {page: measure(page, workdir) for page in args.pages}
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text(encoding='utf-8')), args.threshold, args.min_seconds)
+        print('\n'.join(['', '회귀 항목:', *regressions]) if regressions else '\n회귀 없음')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# 파일 위치: benchmarks/bench_preprocess.py
+"""
+공통 전처리(utils.preprocess_growth_log)의 행당 비용을 데이터 규모별로 측정합니다.
+
+원본 성장 로그를 ocid만 바꿔 반복해 15k → 수천만 행으로 키운 뒤,
+벡터화된 변환 단계와 예전 방식(행 단위 apply)의 ns/행을 비교합니다.
+행당 비용이 규모와 무관하게 거의 일정해야 정상입니다.
+
+    python benchmarks/bench_preprocess.py --scales 1 10 100 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils import GROWTH_LOG_DTYPES, PREPROCESS_STEPS, preprocess_growth_log  # noqa: E402
+
+# 공개된 전처리 단계 목록에서 user_status 변환만 따로 꺼내 측정합니다.
+user_status = dict(PREPROCESS_STEPS)['user_status']
+
+
+def scaled_raw_log(base, scale):
+    """
+    원본 로그를 scale배로 복제합니다. 복제본마다 ocid에 접미사를 붙여 서버를 늘린 것처럼 만듭니다.
+    ocid는 범주형이라 문자열로 바꿔 접미사를 붙이고, 합친 뒤 다시 범주형으로 되돌립니다.
+    """
+    if scale == 1:
+        return base.copy()
+    parts = []
+    for i in range(scale):
+        part = base.copy()
+        part['ocid'] = part['ocid'].astype('string') + f"_{i}"
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True).astype({'ocid': GROWTH_LOG_DTYPES['ocid']})
+
+
+def legacy_user_status(df):
+    return df['character_name'].apply(
+        lambda x: '월드 리프 유저' if pd.isna(x) else '챌린저스 잔류 유저'
+    )
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=str(ROOT / 'growth_log_v2_f_v2.csv'))
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.csv, dtype=GROWTH_LOG_DTYPES)
+    print(f"{'rows':>12} {'stage(s)':>9} {'stage ns/row':>13} {'user_status ns/row':>19} {'legacy apply ns/row':>20}")
+    for scale in args.scales:
+        raw = scaled_raw_log(base, scale)
+        n_rows = len(raw)
+        elapsed = best_of(lambda: preprocess_growth_log(raw.copy()), args.repeat)
+        status = best_of(lambda: user_status(raw), args.repeat)
+        legacy = best_of(lambda: legacy_user_status(raw), 1)
+        print(
+            f"{n_rows:>12,} {elapsed:>9.3f} {elapsed / n_rows * 1e9:>13.0f}"
+            f" {status / n_rows * 1e9:>19.0f} {legacy / n_rows * 1e9:>20.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# 파일 위치: benchmarks/bench_startup.py
+"""
+페이지별 시작 시간(time-to-first-paint)을 헤드리스로 측정합니다.
+
+페이지마다 새 파이썬 프로세스에서 AppTest로 스크립트를 실행하고
+- first paint: 실행 시작부터 첫 화면 요소(delta)가 전송될 때까지
+- cold run: 첫 실행 완료까지 (모듈 임포트 + 데이터 로드 + 모든 섹션)
+- rerun: 같은 세션에서 다시 실행 (캐시된 데이터·figure 재사용)
+- pandas: 첫 실행 후 pandas가 임포트되었는지 (랜딩 페이지는 False여야 정상)
+를 기록합니다. streamlit 자체 임포트 시간은 서버가 이미 떠 있다고 보고 제외합니다.
+
+    python benchmarks/bench_startup.py --runs 3
+    python benchmarks/bench_startup.py --pages pages/2_activity_analysis.py --open activity_level_animation
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PAGES = ['final_dashboard.py', *sorted(str(p.relative_to(ROOT)) for p in (ROOT / 'pages').glob('*.py'))]
+
+
+def measure_page(page, open_sections=()):
+    """(현재 프로세스에서) page를 실행하고 시간 측정 결과 dict를 반환합니다."""
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    marks = {}
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        if msg.HasField('delta'):
+            marks.setdefault('first_paint', time.perf_counter())
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+    app = AppTest.from_file(str(ROOT / page), default_timeout=600)
+    for key in open_sections:
+        app.session_state[key] = True  # lazy_section 펼침 상태
+
+    run_start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - run_start
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].value}")
+    pandas_loaded = 'pandas' in sys.modules
+
+    start = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - start
+    return {
+        'first_paint': marks['first_paint'] - run_start,
+        'cold': cold,
+        'rerun': rerun,
+        'pandas': pandas_loaded,
+    }
+
+
+def run_worker(page, open_sections, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', page, '--open', *open_sections],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', nargs='+', default=PAGES)
+    parser.add_argument('--open', nargs='*', default=[], help='펼친 상태로 실행할 lazy_section 키')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(measure_page(args.worker, args.open)))
+        return
+
+    print(f"{'page':<42} {'first paint(s)':>15} {'cold run(s)':>12} {'rerun(s)':>9} {'pandas':>7}")
+    for page in args.pages:
+        results = run_worker(page, args.open, args.runs)
+        median = {key: statistics.median(r[key] for r in results) for key in ('first_paint', 'cold', 'rerun')}
+        print(
+            f"{page:<42} {median['first_paint']:>15.3f} {median['cold']:>12.3f} "
+            f"{median['rerun']:>9.3f} {str(results[0]['pandas']):>7}"
+        )
+
+
+if __name__ == '__main__':
+    main()
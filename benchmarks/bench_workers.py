@@ -0,0 +1,104 @@
+# 파일 위치: benchmarks/bench_workers.py
+"""
+대시보드 워커 N개가 같은 데이터셋(성장 로그·활동 마트·코디 스냅샷)을 올렸을 때의 메모리를 측정합니다.
+
+- 공유: dataset_server.py로 게시한 뒤 워커가 게시본에 붙습니다. (SHARED_DATASETS=auto)
+- 개별: 워커마다 직접 읽습니다. (SHARED_DATASETS=off)
+
+워커는 별도 프로세스(spawn)로 띄우고, 세 프레임을 읽어 모든 컬럼을 한 번씩 훑은 뒤
+/proc/self/smaps_rollup의 Rss·Pss·Private를 보고합니다. 공유 페이지는 Pss에서 워커 수로 나뉘므로
+Pss 합계가 N개 워커가 실제로 차지하는 메모리입니다.
+
+    python benchmarks/bench_workers.py
+    python benchmarks/bench_workers.py --workdir /tmp/synth --workers 1 4 16
+    python benchmarks/bench_workers.py --workdir /tmp/synth --modes 공유 --workers 16
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+MODES = {'공유': 'auto', '개별': 'off'}
+
+
+def smaps_rollup():
+    """현재 프로세스의 {Rss, Pss, Private} (MB)."""
+    fields = {}
+    with open('/proc/self/smaps_rollup', encoding='ascii') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'Rss': fields['Rss'],
+        'Pss': fields['Pss'],
+        'Private': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def worker(mode, barrier, results):
+    os.environ['SHARED_DATASETS'] = mode
+    import pandas as pd
+
+    from activity_mart import load_activity_mart
+    from cody_data import find_cody_path, read_cody_dataframe
+    from utils import GROWTH_LOG_PATH, read_growth_log
+
+    baseline = smaps_rollup()
+    frames = [read_growth_log(GROWTH_LOG_PATH), load_activity_mart(GROWTH_LOG_PATH)]
+    cody_path = find_cody_path()
+    if cody_path is not None:
+        frames.append(read_cody_dataframe(cody_path)[0])
+    for frame in frames:
+        for name in frame.columns:
+            # 모든 페이지를 실제로 건드리도록 컬럼마다 한 번씩 훑습니다.
+            pd.isna(frame[name]).sum()
+    # 모든 워커가 데이터를 올린 뒤에 재야 공유 페이지가 Pss에 나뉘어 잡힙니다.
+    barrier.wait()
+    usage = smaps_rollup()
+    results.put({key: usage[key] - (baseline[key] if key == 'Private' else 0) for key in usage} | {'baseline': baseline['Rss']})
+    barrier.wait()
+
+
+def run(mode, workers):
+    ctx = mp.get_context('spawn')
+    barrier, results = ctx.Barrier(workers), ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workdir', default=str(ROOT), help='growth_log_v2_f_v2.csv와 코디 CSV가 있는 디렉터리')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    os.chdir(args.workdir)
+    import dataset_server
+    from utils import GROWTH_LOG_PATH
+
+    published = dataset_server.publish(GROWTH_LOG_PATH)
+    print(f"게시 위치: {dataset_server.SHARED_ROOT} (새로 게시: {', '.join(published) or '없음'})")
+    print(f"{'모드':>4} {'워커':>4} {'Rss/워커':>10} {'Pss/워커':>10} {'추가 Private/워커':>18} {'Pss 합계':>10}  (MB)")
+    for label in args.modes:
+        mode = MODES[label]
+        for workers in args.workers:
+            rows = run(mode, workers)
+            mean = {key: sum(row[key] for row in rows) / len(rows) for key in rows[0]}
+            total = sum(row['Pss'] for row in rows)
+            print(f"{label:>4} {workers:>4} {mean['Rss']:>10.0f} {mean['Pss']:>10.0f} {mean['Private']:>18.0f} {total:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
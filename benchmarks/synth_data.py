@@ -0,0 +1,357 @@
+# 파일 위치: benchmarks/synth_data.py
+"""
+부하·확장성 테스트용 합성 데이터 생성기.
+
+growth_log_v2_f_v2.csv / 코디_분석_결과.csv와 같은 컬럼·형식의 파일을 원하는 규모로 만듭니다.
+분포는 원본(챌린저스 933명 × 16주)에서 잡은 값을 따릅니다.
+- 유저마다 직업을 뽑고, 직업별 로그정규 전투력에 맞춰 보스 데미지·방무·아케인 등 스탯을 만듭니다.
+- character_exp는 주마다 0 이상씩 늘고, 레벨별 필요 경험치를 넘으면 레벨업합니다. (단조 증가)
+- 월드 리프 유저는 첫 주부터 복귀 주 전까지 ocid·date 외 컬럼이 모두 빈 행입니다.
+- 캐릭터 생성일은 유저가 처음 기록되는 주(리프 유저는 복귀 주)보다 항상 앞섭니다.
+- 길드는 주마다 일정 확률로 옮기거나 탈퇴합니다.
+- 코디 스냅샷은 마지막 주에 활동 중인 유저 일부에 대해 소비 세그먼트·아이템 목록을 만듭니다.
+
+유저를 chunk_size명씩 나눠 만들고 바로 CSV에 이어 쓰므로, 메모리 사용량은 전체 규모가 아니라
+청크 크기(유저 수 × 주 수)에만 비례합니다. 같은 seed·chunk_size면 같은 파일이 나옵니다.
+
+    python benchmarks/synth_data.py --users 1000000 --out-dir tmp/synth
+    python benchmarks/synth_data.py --users 50000 --weeks 52 --chunk-size 20000 --seed 7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GROWTH_LOG_FILE = 'growth_log_v2_f_v2.csv'
+CODY_FILE = '코디_분석_결과.csv'
+
+GROWTH_COLUMNS = [
+    'ocid', 'date', 'character_name', 'world_name', 'character_gender', 'character_class',
+    'character_class_level', 'character_level', 'character_exp', 'character_exp_rate',
+    'character_guild_name', 'character_date_create', 'access_flag', 'liberation_quest_clear',
+    '전투력', '보스_데미지', '방어율_무시', '크리티컬_데미지', '아케인포스', '어센틱포스', '스타포스',
+]
+
+# 직업 -> (유저 비율, log(전투력) 평균). 원본 활동 행 기준이며 나머지 직업은 '기타 직업'으로 묶어 뽑습니다.
+CLASS_PROFILE = {
+    '렌': (0.790, 17.22), '일리움': (0.029, 17.30), '보우마스터': (0.025, 17.06), '배틀메이지': (0.015, 17.45),
+    '팬텀': (0.010, 17.49), '제로': (0.009, 17.75), '칼리': (0.009, 17.39), '에반': (0.008, 17.12),
+    '바이퍼': (0.008, 16.92), '섀도어': (0.008, 17.08), '팔라딘': (0.007, 17.32), '히어로': (0.006, 17.20),
+}
+OTHER_CLASSES = [
+    '나이트로드', '비숍', '아크메이지(불,독)', '엔젤릭버스터', '아델', '카이저', '아크', '제논', '카데나',
+    '캡틴', '아크메이지(썬,콜)', '키네시스', '다크나이트', '메르세데스', '미하일', '메카닉', '스트라이커', '호영',
+]
+OTHER_CLASS_LOG_POWER = 17.05
+LOG_POWER_SD = 0.65
+
+WORLDS = {'챌린저스': 0.845, '스카니아': 0.044, '크로아': 0.034, '루나': 0.023, '베라': 0.020, '엘리시움': 0.018, '리부트': 0.016}
+GENDERS = {'여': 0.79, '남': 0.20, '기타': 0.01}
+
+LEAP_RATE = 0.31            # 월드 리프 유저 비율
+ACCESS_RATE = 0.70          # access_flag True 비율
+LIBERATION_RATE = 0.36      # 해방 퀘스트 완료 비율 (한 번 완료하면 유지)
+NO_GUILD_RATE = 0.18        # 길드 없는 유저 비율
+GUILD_CHURN = 0.06          # 주당 길드 이동 확률
+GUILDS_PER_USER = 0.65      # 길드 수 = 유저 수 × 이 값
+GAIN_MEDIAN = 2.9e12        # 성장 주차의 경험치 획득량 중앙값
+GAIN_SIGMA = 1.0
+MAX_LEVEL = 300
+
+# 레벨 구간 시작 -> (그 레벨의 필요 경험치, 구간 안 레벨당 증가율). 원본 exp/exp_rate에서 역산한 값입니다.
+EXP_BANDS = {
+    200: (2.0e11, 1.03), 260: (1.732e12, 1.01), 265: (2.343e12, 1.01), 270: (5.412e12, 1.01),
+    275: (1.1377e13, 1.10), 280: (3.3648e13, 1.10), 285: (9.9512e13, 1.10), 290: (2.9e14, 1.10),
+}
+
+# 코디 스냅샷
+CODY_COLUMNS = [
+    'ocid', '유료아이템착용 개수', '총 코디금액(원)', '착용코디금액(원)', '스페셜라벨 개수', '레드라벨 개수',
+    '마스터라벨 개수', '일루전 링 개수', '비싼 헤어(부티크, 마스터라벨) 유무', '헤어 믹스염색 여부',
+    '헤어 믹스염색 비율', '성형 믹스염색 여부', '성형 믹스염색 비율', '착용 아이템 리스트',
+    '착용 헤어,성형,피부', '세분화 유저 그룹',
+]
+CODY_SEGMENTS = {
+    '1. 유료 유저 (아이템 구매 지출)': 0.236,
+    '2. 무료/이벤트 유저 (뷰티 컨텐츠 지출)': 0.095,
+    '3. 순수 무료 유저 (지출 0원)': 0.669,
+}
+CODY_RATE = 0.91            # 마지막 주 활동 유저 중 코디 스냅샷이 있는 비율
+FREE_ITEMS = [
+    '하이퍼 버닝 크라운', '투명 얼굴장식', '투명 안경', '투명 귀고리', '하이퍼 버닝 로브', '난생 첫걸음',
+    '투명 장갑', '버닝 플레임 윙즈', '하이퍼 버닝 소드', '유랑자의 말풍선 반지', '유랑자의 명찰 반지',
+    '매화나무 나막신', '푸른 하늘 은하수', '투명 망토', '투명 모자', '투명 신발',
+]
+PAID_ITEM_PREFIXES = ['별빛', '달빛', '솜사탕', '벚꽃', '한여름', '겨울밤', '루나', '마스터', '스페셜', '레드']
+PAID_ITEM_SUFFIXES = ['리본', '모자', '원피스', '코트', '망토', '날개', '신발', '장갑', '귀고리', '무기']
+ITEM_PRICES = np.array([2900, 4900, 8900, 12900, 19900, 29900])
+HAIR_COLORS = ['검은색', '빨간색', '주황색', '노란색', '초록색', '파란색', '보라색', '갈색']
+HAIR_STYLES = ['설화', '룰루', '엔젤', '하루', '블리스', '마리', '라온', '미르']
+FACES = ['동그래', '새침', '초롱', '방긋', '몽글', '도도']
+SKINS = ['뽀송 꽃잎', '홍조 꽃잎', '맑은', '하얀', '구릿빛']
+
+# 캐릭터·길드 이름에 쓰는 음절
+NAME_SYLLABLES = np.array(list(
+    '가나다라마바사아자차카타파하별달빛솔린렌아린하늘구름바람꽃잎눈비새봄여름가을겨울'
+    '은월초롱소리나래온결해윤슬미르도담예린지유서연민준시우하준도윤루나세라엘리아'
+), dtype='<U1')
+
+
+# --- 공통 도구 ---
+
+def _mix(values, salt):
+    """정수 배열 → 섞인 uint64 배열 (splitmix64). 청크와 무관하게 id마다 같은 값을 냅니다."""
+    with np.errstate(over='ignore'):
+        x = np.asarray(values, dtype=np.uint64) + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def korean_names(ids, salt, min_len=2, max_len=6):
+    """id마다 고정된 한글 이름. 음절 코드포인트 배열을 고정폭 유니코드 배열로 바로 해석합니다."""
+    ids = np.asarray(ids, dtype=np.int64)
+    lengths = min_len + (_mix(ids, salt) % np.uint64(max_len - min_len + 1)).astype(np.int64)
+    pool = NAME_SYLLABLES.view(np.uint32)
+    codes = np.zeros((len(ids), max_len), dtype=np.uint32)
+    for k in range(max_len):
+        syllables = pool[(_mix(ids, salt * 31 + k + 1) % np.uint64(len(pool))).astype(np.intp)]
+        codes[:, k] = np.where(k < lengths, syllables, 0)
+    return codes.view(f'<U{max_len}').ravel().astype(object)
+
+
+def hex_ocids(ids, seed):
+    """id마다 고정된 32자리 16진수 ocid."""
+    hex_digits = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    words = np.stack([_mix(ids, seed * 4 + 101), _mix(ids, seed * 4 + 202)], axis=1)
+    nibbles = (words[:, :, None] >> np.arange(60, -4, -4, dtype=np.uint64)) & np.uint64(0xF)
+    ascii_codes = hex_digits[nibbles.reshape(len(ids), 32).astype(np.intp)]
+    return ascii_codes.view('S32').ravel().astype(str).astype(object)
+
+
+def _choice(rng, options, size):
+    names = np.array(list(options), dtype=object)
+    weights = np.array(list(options.values()), dtype=float)
+    return names[rng.choice(len(names), size=size, p=weights / weights.sum())]
+
+
+def exp_table():
+    """레벨 -> 다음 레벨까지 필요 경험치 (인덱스 = 레벨)."""
+    table = np.zeros(MAX_LEVEL + 1)
+    starts = sorted(EXP_BANDS)
+    for level in range(starts[0], MAX_LEVEL + 1):
+        band = max(s for s in starts if s <= level)
+        base, growth = EXP_BANDS[band]
+        table[level] = base * growth ** (level - band)
+    return table
+
+
+def _nullable_int(values, mask):
+    """mask가 False인 칸은 결측인 Int64 배열. (CSV에 빈 칸으로 써집니다)"""
+    values = pd.array(np.asarray(values).astype('int64'), dtype='Int64')
+    values[~mask] = pd.NA
+    return values
+
+
+# --- 성장 로그 ---
+
+def growth_chunk(rng, user_ids, dates, n_guilds, seed):
+    """user_ids 유저들의 주간 성장 로그 (주 단위로 정렬된 DataFrame)와 마지막 주 활동 여부."""
+    n, n_weeks = len(user_ids), len(dates)
+    need = exp_table()
+
+    # 유저 고정 속성
+    class_names = np.array([*CLASS_PROFILE, *OTHER_CLASSES], dtype=object)
+    class_weights = np.array([w for w, _ in CLASS_PROFILE.values()] + [0.0] * len(OTHER_CLASSES))
+    class_weights[len(CLASS_PROFILE):] = (1 - class_weights.sum()) / len(OTHER_CLASSES)
+    class_code = rng.choice(len(class_names), size=n, p=class_weights / class_weights.sum())
+    class_log_power = np.array([m for _, m in CLASS_PROFILE.values()] + [OTHER_CLASS_LOG_POWER] * len(OTHER_CLASSES))
+    spec = rng.standard_normal(n)  # 직업 안에서의 상대 스펙 (z 점수)
+    log_power = class_log_power[class_code] + LOG_POWER_SD * spec
+
+    ocids = hex_ocids(user_ids, seed)
+    names = korean_names(user_ids, seed * 7 + 1, 2, 6)
+    worlds = _choice(rng, WORLDS, n)
+    genders = _choice(rng, GENDERS, n)
+    activity = rng.beta(1.4, 2.6, n)  # 주마다 성장할 확률 (평균 약 0.35)
+    access = rng.random(n) < ACCESS_RATE
+    liberation_week = np.where(rng.random(n) < LIBERATION_RATE * 1.4, rng.integers(-n_weeks, n_weeks, n), n_weeks)
+    leap = rng.random(n) < LEAP_RATE
+    return_week = np.where(leap, rng.integers(1, n_weeks + 1, n), 0)  # 이 주 전까지 빈 행
+    # 생성일은 처음 기록되는 주(리프 유저는 돌아온 주)보다 1~72일 앞섭니다.
+    first_seen = pd.DatetimeIndex(dates)[np.minimum(return_week, n_weeks - 1)]
+    created = first_seen - pd.to_timedelta(rng.integers(1, 73, n), unit='D')
+    created = created.strftime('%Y-%m-%dT00:00+09:00').to_numpy(dtype=object)
+
+    level = np.clip(np.round(rng.normal(271, 5, n)), 260, 289).astype(np.int64)
+    exp = rng.random(n) * need[level]
+    guild = np.where(rng.random(n) < NO_GUILD_RATE, -1, (n_guilds * rng.random(n) ** 2).astype(np.int64))
+
+    frames = []
+    for week, date in enumerate(dates):
+        if week > 0:
+            grows = rng.random(n) < activity
+            exp = exp + np.where(grows, rng.lognormal(np.log(GAIN_MEDIAN), GAIN_SIGMA, n), 0.0)
+            log_power = log_power + np.where(grows, rng.normal(0.01, 0.02, n), 0.0)
+            while True:
+                up = (exp >= need[level]) & (level < MAX_LEVEL)
+                if not up.any():
+                    break
+                exp = np.where(up, exp - need[level], exp)
+                level = level + up
+            exp = np.minimum(exp, need[level] - 1)
+            moves = rng.random(n) < GUILD_CHURN
+            guild = np.where(
+                moves,
+                np.where(rng.random(n) < 0.2, -1, (n_guilds * rng.random(n) ** 2).astype(np.int64)),
+                guild,
+            )
+
+        active = week >= return_week
+        z = log_power - class_log_power[class_code]
+        exp_int = np.floor(exp).astype(np.int64)
+        frame = pd.DataFrame({
+            'ocid': ocids,
+            'date': date,
+            'character_name': np.where(active, names, None),
+            'world_name': np.where(active, worlds, None),
+            'character_gender': np.where(active, genders, None),
+            'character_class': np.where(active, class_names[class_code], None),
+            'character_class_level': _nullable_int(np.full(n, 6), active),
+            'character_level': _nullable_int(level, active),
+            'character_exp': _nullable_int(exp_int, active),
+            'character_exp_rate': np.where(active, np.floor(exp_int / need[level] * 1e5) / 1e3, np.nan),
+            'character_guild_name': np.where(active & (guild >= 0), korean_names(np.maximum(guild, 0), seed * 7 + 2, 2, 5), None),
+            'character_date_create': np.where(active, created, None),
+            'access_flag': np.where(active, np.where(access, 'TRUE', 'FALSE'), None),
+            'liberation_quest_clear': _nullable_int((week >= liberation_week).astype(np.int64), active),
+            '전투력': _nullable_int(np.exp(log_power).astype(np.int64), active),
+            '보스_데미지': _nullable_int(np.clip(np.round(306 + 60 * z + rng.normal(0, 40, n)), 0, 600), active),
+            '방어율_무시': np.where(active, np.round(np.clip(94 + 2.5 * z + rng.normal(0, 2.5, n), 50, 99.5), 2), np.nan),
+            '크리티컬_데미지': _nullable_int(np.clip(np.round(68 + 15 * z + rng.normal(0, 10, n)), 0, 180), active),
+            '아케인포스': _nullable_int(np.clip(np.round((1250 + 130 * z + rng.normal(0, 100, n)) / 10) * 10, 0, 1650), active),
+            '어센틱포스': _nullable_int(np.clip(np.round((235 + 80 * z + rng.normal(0, 60, n)) / 10) * 10, 0, 560), active),
+            '스타포스': _nullable_int(np.clip(np.round(243 + 25 * z + rng.normal(0, 15, n)), 0, 400), active),
+        }, columns=GROWTH_COLUMNS)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True), active
+
+
+# --- 코디 스냅샷 ---
+
+def _item_lists(rng, vocab, counts, zipf=1.2):
+    """행마다 counts개의 아이템을 인기도(지프 분포) 순으로 뽑아 ', '로 이은 문자열."""
+    weights = 1.0 / np.arange(1, len(vocab) + 1) ** zipf
+    picks = rng.choice(len(vocab), size=int(counts.sum()), p=weights / weights.sum())
+    rows = np.repeat(np.arange(len(counts)), counts)
+    items = pd.Series(np.asarray(vocab, dtype=object)[picks])
+    lists = items.groupby(rows).agg(', '.join)
+    return lists.reindex(range(len(counts)), fill_value='').to_numpy(dtype=object)
+
+
+def cody_chunk(rng, ocids):
+    """ocid마다 코디 스냅샷 한 행."""
+    n = len(ocids)
+    segment = _choice(rng, CODY_SEGMENTS, n)
+    paid = segment == next(iter(CODY_SEGMENTS))
+    beauty = segment == list(CODY_SEGMENTS)[1]
+
+    paid_count = np.where(paid, rng.integers(1, 7, n), 0)
+    worn_amount = np.zeros(n, dtype=np.int64)
+    for k in range(paid_count.max(initial=0)):
+        worn_amount += np.where(k < paid_count, rng.choice(ITEM_PRICES, n), 0)
+    extra_amount = np.round(rng.exponential(16000, n) / 100) * 100
+    beauty_amount = np.round(rng.gamma(2.0, 22500, n) / 100) * 100
+    total_amount = np.where(paid, worn_amount + extra_amount, np.where(beauty, beauty_amount, 0)).astype(np.int64)
+
+    special = np.where(paid, rng.poisson(1.08, n), 0)
+    red = np.where(paid, rng.random(n) < 0.06, 0)
+    master = np.where(paid, rng.poisson(0.65, n), 0)
+    illusion = np.where(paid, rng.random(n) < 0.06, 0)
+    hair_mix = np.where(paid, rng.random(n) < 0.33, np.where(beauty, rng.random(n) < 0.96, False))
+    face_mix = np.where(paid | beauty, rng.random(n) < 0.21, False)
+
+    paid_vocab = [f"{p} {s}" for p in PAID_ITEM_PREFIXES for s in PAID_ITEM_SUFFIXES]
+    free_lists = _item_lists(rng, FREE_ITEMS, np.full(n, 11) - np.minimum(paid_count, 6))
+    paid_lists = _item_lists(rng, paid_vocab, paid_count)
+    item_lists = np.where(paid_count > 0, np.char.add(np.char.add(paid_lists.astype(str), ', '), free_lists.astype(str)), free_lists)
+
+    hair = np.char.add(np.array(HAIR_COLORS)[rng.integers(0, len(HAIR_COLORS), n)], ' ')
+    hair = np.char.add(np.char.add(hair, np.array(HAIR_STYLES)[rng.integers(0, len(HAIR_STYLES), n)]), ' 헤어')
+    face = np.char.add(np.array(FACES)[rng.integers(0, len(FACES), n)], ' 얼굴')
+    skin = np.char.add(np.array(SKINS)[rng.integers(0, len(SKINS), n)], ' 피부')
+    beauty_lists = np.char.add(np.char.add(np.char.add(np.char.add(hair, ', '), face), ', '), skin)
+
+    return pd.DataFrame({
+        'ocid': ocids,
+        '유료아이템착용 개수': paid_count,
+        '총 코디금액(원)': total_amount,
+        '착용코디금액(원)': np.where(paid, worn_amount, 0),
+        '스페셜라벨 개수': special,
+        '레드라벨 개수': red.astype(np.int64),
+        '마스터라벨 개수': master,
+        '일루전 링 개수': illusion.astype(np.int64),
+        '비싼 헤어(부티크, 마스터라벨) 유무': 0,
+        '헤어 믹스염색 여부': hair_mix.astype(np.int64),
+        '헤어 믹스염색 비율': np.where(hair_mix, rng.integers(10, 51, n), 0),
+        '성형 믹스염색 여부': face_mix.astype(np.int64),
+        '성형 믹스염색 비율': np.where(face_mix, rng.integers(10, 51, n), 0),
+        '착용 아이템 리스트': item_lists.astype(object),
+        '착용 헤어,성형,피부': beauty_lists.astype(object),
+        '세분화 유저 그룹': segment,
+    }, columns=CODY_COLUMNS)
+
+
+# --- 파일 생성 ---
+
+def generate(out_dir, users, weeks=16, start='2025-07-03', chunk_size=20_000, seed=0, cody_rate=CODY_RATE, verbose=False):
+    """out_dir에 성장 로그·코디 스냅샷 CSV를 만들고 (성장 로그 행 수, 코디 행 수)를 반환합니다."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    growth_path, cody_path = out_dir / GROWTH_LOG_FILE, out_dir / CODY_FILE
+    dates = pd.date_range(start, periods=weeks, freq='7D').strftime('%Y-%m-%d').tolist()
+    n_guilds = max(1, int(users * GUILDS_PER_USER))
+
+    growth_rows = cody_rows = 0
+    started = time.perf_counter()
+    for chunk_index, first in enumerate(range(0, users, chunk_size)):
+        rng = np.random.default_rng([seed, chunk_index])
+        user_ids = np.arange(first, min(first + chunk_size, users))
+        growth, active_last = growth_chunk(rng, user_ids, dates, n_guilds, seed)
+        cody = cody_chunk(rng, growth['ocid'].to_numpy()[-len(user_ids):][active_last & (rng.random(len(user_ids)) < cody_rate)])
+
+        header = chunk_index == 0
+        growth.to_csv(growth_path, mode='w' if header else 'a', header=header, index=False)
+        # 원본 코디 파일처럼 BOM이 붙은 UTF-8로 씁니다. (BOM은 파일 맨 앞에 한 번만)
+        cody.to_csv(cody_path, mode='w' if header else 'a', header=header, index=False, encoding='utf-8-sig' if header else 'utf-8')
+        growth_rows += len(growth)
+        cody_rows += len(cody)
+        if verbose:
+            print(f"  {user_ids[-1] + 1:>10,} / {users:,} 유저  ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+    return growth_rows, cody_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--weeks', type=int, default=16)
+    parser.add_argument('--start', default='2025-07-03', help='첫 주 날짜')
+    parser.add_argument('--chunk-size', type=int, default=20_000, help='한 번에 만드는 유저 수')
+    parser.add_argument('--cody-rate', type=float, default=CODY_RATE, help='마지막 주 활동 유저 중 코디 스냅샷 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default='tmp/synth')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    growth_rows, cody_rows = generate(
+        args.out_dir, args.users, args.weeks, args.start, args.chunk_size, args.seed, args.cody_rate, verbose=True,
+    )
+    print(f"성장 로그 {growth_rows:,}행, 코디 스냅샷 {cody_rows:,}행 → {args.out_dir} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
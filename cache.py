@@ -0,0 +1,251 @@
+# 파일 위치: cache.py
+"""
+프로젝트 공용 캐시 계층.
+
+@st.cache_data는 항목 수·수명 제한이 없고, 데이터프레임 인자를 통째로 해시하며,
+호출할 때마다 결과를 복사해 돌려줍니다. 여기서는 프로세스 안에서 모든 세션이 공유하는
+이름 있는 캐시를 두고 다음을 제공합니다.
+
+- LRU(max_entries, max_bytes) + TTL 기반 축출
+- 항목별 메모리 크기(바이트) 집계
+- 캐시 키는 함수 인자(경로 등)와 원본 파일 지문(utils.source_fingerprint)으로 구성
+- 적중/미스/축출 통계와 이를 보여주는 Streamlit 패널(render_cache_stats)
+- 같은 키를 동시에 처음 요청하면 한 번만 계산 (키별 계산 잠금)
+
+캐시된 값은 복사 없이 공유되므로 호출한 쪽에서 제자리 수정(inplace)을 하면 안 됩니다.
+"""
+
+import dataclasses
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+# 만든 지 이 시간(초)이 지난 항목은 지문이 같아도 내보내, 오래 떠 있는 프로세스의 메모리를 돌려받습니다.
+DEFAULT_TTL = 6 * 60 * 60
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+# memoize의 키별 계산 잠금: (캐시 이름, 키) -> (잠금, 사용 중인 스레드 수)
+_COMPUTE_LOCKS = {}
+_COMPUTE_LOCKS_LOCK = threading.Lock()
+
+# plotly trace에서 크기 대부분을 차지하는 데이터 배열 속성
+PLOTLY_ARRAY_PROPS = ('x', 'y', 'z', 'text', 'hovertext', 'customdata', 'ids', 'values', 'labels', 'lat', 'lon', 'locations')
+
+
+def estimate_bytes(value):
+    """캐시 항목의 대략적인 메모리 크기(바이트)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, 'to_plotly_json'):
+        return _figure_bytes(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(estimate_bytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _figure_bytes(fig):
+    """
+    plotly figure: 넣을 때마다 JSON으로 직렬화하지 않고 trace(애니메이션 프레임 포함)의 데이터 배열 크기를 더합니다.
+    차트는 보통 FigureSpec(JSON 문자열)으로 캐시하므로 이 경로는 figure를 직접 캐시할 때만 쓰입니다.
+    """
+    traces = [*fig.data, *(trace for frame in fig.frames for trace in frame.data)]
+    return sys.getsizeof(fig) + sum(
+        estimate_bytes(getattr(trace, prop, None)) for trace in traces for prop in PLOTLY_ARRAY_PROPS
+    )
+
+
+class BoundedCache:
+    """스레드 안전한 LRU + TTL 캐시. 항목별 크기와 적중/미스/축출 횟수를 기록합니다."""
+
+    def __init__(self, name, max_entries=8, max_bytes=None, ttl=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, nbytes, created_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def total_bytes(self):
+        return sum(nbytes for _, nbytes, _ in self._entries.values())
+
+    def get(self, key, count=True):
+        """
+        (찾았는지, 값)을 반환합니다. 수명이 지난 항목은 지우고 미스로 셉니다.
+        count=False면 적중/미스 횟수를 세지 않습니다. (이미 미스로 센 조회를 다시 확인할 때)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += count
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += count
+            return True, entry[0]
+
+    def put(self, key, value):
+        nbytes = estimate_bytes(value)
+        with self._lock:
+            self._entries[key] = (value, nbytes, time.monotonic())
+            self._entries.move_to_end(key)
+            # 가장 오래 쓰지 않은 항목부터 내보내되, 방금 넣은 항목은 남깁니다.
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def items(self):
+        """(키, 값) 목록의 사본. (오래 쓰지 않은 항목부터)"""
+        with self._lock:
+            return [(key, value) for key, (value, _, _) in self._entries.items()]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'cache': self.name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+def get_cache(name, max_entries=8, max_bytes=None, ttl=None):
+    """이름으로 공용 캐시를 가져옵니다. 페이지 스크립트가 다시 실행돼도 같은 캐시를 씁니다."""
+    with _REGISTRY_LOCK:
+        cache = _REGISTRY.get(name)
+        if cache is None:
+            cache = _REGISTRY[name] = BoundedCache(name, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        return cache
+
+
+@contextmanager
+def _compute_lock(lock_key):
+    """lock_key마다 하나씩 두는 계산 잠금. 기다리는 쪽이 없어지면 잠금도 지웁니다."""
+    with _COMPUTE_LOCKS_LOCK:
+        lock, users = _COMPUTE_LOCKS.get(lock_key, (None, 0))
+        lock = lock or threading.Lock()
+        _COMPUTE_LOCKS[lock_key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _COMPUTE_LOCKS_LOCK:
+            _, users = _COMPUTE_LOCKS[lock_key]
+            if users == 1:
+                del _COMPUTE_LOCKS[lock_key]
+            else:
+                _COMPUTE_LOCKS[lock_key] = (lock, users - 1)
+
+
+def memoize(name, key, compute, sources=(), **limits):
+    """
+    (key, 원본 파일 지문들)로 name 캐시를 조회하고, 없으면 compute()를 저장해 반환합니다.
+    limits(max_entries, max_bytes, ttl)는 캐시를 처음 만들 때만 적용됩니다.
+    여러 세션이 같은 키를 동시에 처음 요청하면 한 세션만 계산하고 나머지는 그 결과를 기다립니다.
+    다른 키의 계산은 서로 막지 않습니다.
+    """
+    from utils import source_fingerprint  # utils가 이 모듈을 임포트하므로 호출 시점에 가져옵니다.
+
+    limits.setdefault('ttl', DEFAULT_TTL)
+    cache = get_cache(name, **limits)
+    full_key = (key, tuple(source_fingerprint(path) for path in sources))
+    found, value = cache.get(full_key)
+    if found:
+        return value
+    with _compute_lock((name, full_key)):
+        # 잠금을 기다리는 동안 다른 세션이 계산해 두었을 수 있습니다.
+        found, value = cache.get(full_key, count=False)
+        if not found:
+            value = compute()
+            cache.put(full_key, value)
+    return value
+
+
+def cached(name, max_entries=8, max_bytes=None, ttl=DEFAULT_TTL, sources=None):
+    """
+    함수 결과를 공용 캐시에 저장하는 데코레이터.
+
+    키는 (위치 인자, 키워드 인자, 원본 파일 지문들)입니다. sources는 같은 인자를 받아
+    원본 파일 경로 목록을 돌려주는 함수로, 해당 파일이 바뀌면 자동으로 새 키가 됩니다.
+    인자는 해시 가능한 값(경로, 날짜 문자열 등)이어야 합니다.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return memoize(
+                name,
+                (args, tuple(sorted(kwargs.items()))),
+                lambda: func(*args, **kwargs),
+                sources=sources(*args, **kwargs) if sources else (),
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+                ttl=ttl,
+            )
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """등록된 모든 캐시의 통계 표."""
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.values())
+    return pd.DataFrame([cache.stats() for cache in caches])
+
+
+def render_cache_stats():
+    """캐시 통계 패널 (컨테이너 메모리 산정용)."""
+    import streamlit as st
+
+    stats = cache_stats()
+    if stats.empty:
+        st.caption("아직 사용된 캐시가 없습니다.")
+        return
+    total_mb = stats['bytes'].sum() / 1024 ** 2
+    lookups = stats['hits'].sum() + stats['misses'].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("캐시 메모리", f"{total_mb:,.1f} MB")
+    col2.metric("적중률", f"{stats['hits'].sum() / lookups:.1%}" if lookups else "-")
+    col3.metric("축출 횟수", f"{int(stats['evictions'].sum() + stats['expirations'].sum()):,}")
+    stats = stats.assign(MB=stats['bytes'] / 1024 ** 2).drop(columns='bytes')
+    st.dataframe(stats, hide_index=True)
+    if st.button("캐시 비우기", key='cache_stats_clear'):
+        with _REGISTRY_LOCK:
+            for cache in _REGISTRY.values():
+                cache.clear()
+        st.rerun()
@@ -0,0 +1,280 @@
+# 파일 위치: character_index.py
+"""
+캐릭터 성장 궤적 탐색 페이지용 캐릭터 인덱스.
+
+성장 로그를 (ocid, date) 순으로 한 번 정렬해 두고 ocid → 행 범위(start, stop)를 기록하므로,
+한 캐릭터의 16주 궤적은 로그를 훑지 않고 연속 구간을 잘라 바로 얻습니다.
+
+- 이름 검색: 정렬된 (소문자) 이름 배열에서 이진 탐색으로 접두어 일치를 찾고,
+  없으면 부분 문자열 → 유사 이름(difflib) 순으로 찾습니다. 이름을 바꾼 캐릭터는 옛 이름으로도 찾습니다.
+- 비슷한 성장 유저: 캐릭터별 주간 성장량 벡터를 L2 정규화한 행렬을 만들어 두고,
+  코사인 유사도(행렬 × 벡터 한 번)로 가장 비슷한 K명을 고릅니다. 성장량의 크기가 아니라 주차별 분포(성장 패턴)를 비교합니다.
+
+character_exp는 레벨업마다 0부터 다시 쌓이므로, 주간 성장량은 레벨 진행도
+(레벨 + 경험치 비율/100)의 주간 증가분으로 계산합니다.
+
+스트리밍 모드에서는 로그 전체 프레임을 만들지 않고 주차를 하나씩 읽어 캐릭터별 배열(프로필, 성장량 벡터,
+캐릭터 × 주차별 주차 파일 행 번호)만 쌓습니다. 궤적은 조회할 때 그 캐릭터의 행만 주차 파일에서 골라 읽습니다.
+"""
+
+import difflib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from artifacts import artifact
+from cache import cached
+from ranking import top_k_indices
+from utils import read_growth_log, use_streaming
+
+TRAJECTORY_COLUMNS = [
+    'ocid', 'date', 'character_name', 'character_class', 'character_level', 'character_exp',
+    'character_exp_rate', '전투력', '보스_데미지', '방어율_무시', '크리티컬_데미지', '아케인포스', '어센틱포스', '스타포스',
+]
+SEARCH_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class FrameTrajectories:
+    """메모리 모드의 궤적: (ocid, date) 순으로 정렬한 프레임과 캐릭터 번호별 행 범위."""
+    frame: pd.DataFrame          # TRAJECTORY_COLUMNS + progress
+    starts: np.ndarray
+    stops: np.ndarray
+
+    def get(self, position):
+        return self.frame.iloc[self.starts[position]:self.stops[position]]  # 복사 없는 연속 구간
+
+    def empty(self):
+        return self.frame.iloc[:0]
+
+
+@dataclass(frozen=True)
+class WeekTrajectories:
+    """스트리밍 모드의 궤적: 캐릭터 번호 × 주차별 주차 파일(growth_stream.week_table) 행 번호."""
+    file_path: str
+    dates: pd.DatetimeIndex
+    rows: np.ndarray             # (캐릭터 수, 주차 수) int32, 기록이 없으면 -1
+
+    def get(self, position):
+        from growth_stream import read_week_rows
+
+        weeks = np.flatnonzero(self.rows[position] >= 0)
+        if len(weeks) == 0:
+            return self.empty()
+        frame = read_week_rows(self.file_path, [(self.dates[w], [self.rows[position, w]]) for w in weeks], TRAJECTORY_COLUMNS)
+        return frame.assign(progress=level_progress(frame))
+
+    def empty(self):
+        return pd.DataFrame(columns=[*TRAJECTORY_COLUMNS, 'progress'])
+
+
+@dataclass(frozen=True)
+class CharacterIndex:
+    trajectories: object         # FrameTrajectories(메모리 모드) 또는 WeekTrajectories(스트리밍 모드)
+    ocids: pd.Index              # 위치 = 캐릭터 번호
+    profiles: pd.DataFrame       # 캐릭터 번호별 최근 이름·직업·레벨·전체 기간 레벨 상승폭
+    name_keys: np.ndarray        # 정렬된 소문자 이름 (이름 변경 이력 포함)
+    name_owners: np.ndarray      # name_keys 위치별 캐릭터 번호
+    dates: pd.DatetimeIndex      # gain_vectors의 열 순서
+    gain_vectors: np.ndarray     # (캐릭터 수, 주차 수) L2 정규화된 주간 성장량 (float32)
+
+    def lookup(self, ocid):
+        """ocid의 캐릭터 번호. 없으면 None."""
+        try:
+            return self.ocids.get_loc(ocid)
+        except KeyError:
+            return None
+
+    def trajectory(self, ocid):
+        """ocid의 주차별 기록을 날짜 순으로 반환합니다."""
+        position = self.lookup(ocid)
+        if position is None:
+            return self.trajectories.empty()
+        return self.trajectories.get(position)
+
+    def _prefix_range(self, prefix):
+        lo = np.searchsorted(self.name_keys, prefix, side='left')
+        hi = np.searchsorted(self.name_keys, prefix + '\U0010ffff', side='left')
+        return slice(lo, hi)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """이름 검색 결과 (캐릭터 프로필 프레임). 접두어 → 부분 문자열 → 유사 이름 순으로 찾습니다."""
+        query = query.strip().lower()
+        if not query:
+            return self.profiles.iloc[:0]
+        found = self.name_owners[self._prefix_range(query)]
+        if len(found) == 0:
+            found = self.name_owners[np.char.find(self.name_keys, query) >= 0]
+        if len(found) == 0:
+            # 오타 보정: 첫 글자가 같은 이름 중에서만 유사도를 계산합니다.
+            candidates = self.name_keys[self._prefix_range(query[0])]
+            close = difflib.get_close_matches(query, pd.unique(candidates).tolist(), n=limit, cutoff=0.5)
+            found = self.name_owners[np.searchsorted(self.name_keys, close)]
+        found = pd.unique(found)
+        return self.profiles.iloc[found[:limit]]
+
+    def similar(self, ocid, k=10):
+        """주간 성장 패턴이 ocid와 가장 비슷한 캐릭터 K명 (유사도 내림차순). 성장 기록이 없으면 빈 프레임."""
+        position = self.lookup(ocid)
+        if position is None or not self.gain_vectors[position].any():
+            return self.profiles.iloc[:0].assign(similarity=pd.Series(dtype='float64'))
+        similarity = self.gain_vectors @ self.gain_vectors[position]
+        similarity[position] = np.nan
+        similarity[~self.gain_vectors.any(axis=1)] = np.nan
+        positions = top_k_indices(similarity, k)
+        return self.profiles.iloc[positions].assign(similarity=similarity[positions].astype('float64'))
+
+    def weekly_gains(self, ocids):
+        """ocids의 주간 성장량(레벨 진행도 증가분, 정규화 전) 프레임 (행: 날짜, 열: ocid)."""
+        columns = {}
+        for ocid in ocids:
+            week = self.trajectory(ocid)
+            columns[ocid] = pd.Series(_weekly_gain(week['progress'].to_numpy(), np.zeros(len(week), dtype=int)), index=week['date'])
+        return pd.DataFrame(columns).reindex(self.dates, fill_value=0.0)
+
+
+def level_progress(frame):
+    """레벨 + 현재 레벨 경험치 비율(0~1). 결측은 NaN."""
+    level = frame['character_level'].astype('float64').to_numpy(na_value=np.nan)
+    rate = frame['character_exp_rate'].astype('float64').to_numpy(na_value=np.nan)
+    return level + np.nan_to_num(rate, nan=0.0) / 100
+
+
+def _weekly_gain(progress, codes):
+    # 같은 캐릭터의 직전 기록과의 차이 (첫 기록·결측은 0, activity_mart와 같은 규칙)
+    gain = np.zeros(len(progress))
+    same = np.r_[False, codes[1:] == codes[:-1]]
+    gain[same] = np.nan_to_num(progress[1:][same[1:]] - progress[:-1][same[1:]], nan=0.0)
+    return gain
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _name_index(names):
+    """(소문자 이름, 캐릭터 번호) 프레임 → 정렬된 (name_keys, name_owners)."""
+    names = names.dropna().drop_duplicates().sort_values('key', kind='stable')
+    return names['key'].to_numpy(dtype=str), names['owner'].to_numpy()
+
+
+def build_character_index(df):
+    """전처리된 성장 로그(TRAJECTORY_COLUMNS 포함)로 CharacterIndex를 만듭니다."""
+    df = df[TRAJECTORY_COLUMNS].dropna(subset=['ocid', 'date'])
+    codes, ocids = pd.factorize(df['ocid'].astype('string'), sort=True)
+    order = np.lexsort((df['date'].to_numpy(), codes))
+    frame = df.take(order).reset_index(drop=True)
+    codes = codes[order]
+    n_characters = len(ocids)
+    starts = np.searchsorted(codes, np.arange(n_characters), side='left')
+    stops = np.searchsorted(codes, np.arange(n_characters), side='right')
+
+    frame['progress'] = level_progress(frame)
+    gain = _weekly_gain(frame['progress'].to_numpy(), codes)
+    dates = pd.DatetimeIndex(np.unique(frame['date'].to_numpy()))
+    vectors = np.zeros((n_characters, len(dates)), dtype='float32')
+    vectors[codes, dates.get_indexer(frame['date'])] = gain
+
+    grouped = frame.groupby(codes, sort=True)
+    profiles = pd.DataFrame({
+        'ocid': ocids,
+        'character_name': grouped['character_name'].last().reindex(range(n_characters)).to_numpy(),
+        'character_class': grouped['character_class'].last().reindex(range(n_characters)).to_numpy(),
+        'character_level': grouped['character_level'].last().reindex(range(n_characters)).to_numpy(),
+        'level_gain': np.bincount(codes, weights=gain, minlength=n_characters),
+    })
+
+    name_keys, name_owners = _name_index(
+        pd.DataFrame({'key': frame['character_name'].astype('string').str.lower(), 'owner': codes})
+    )
+    return CharacterIndex(
+        trajectories=FrameTrajectories(frame=frame, starts=starts, stops=stops),
+        ocids=pd.Index(ocids, name='ocid'),
+        profiles=profiles,
+        name_keys=name_keys,
+        name_owners=name_owners,
+        dates=dates,
+        gain_vectors=_normalize_rows(vectors),
+    )
+
+
+PROFILE_COLUMNS = ['character_name', 'character_class', 'character_level']
+
+
+def build_character_index_by_week(file_path):
+    """
+    스트리밍 모드: 주차 파일을 한 번에 한 주차씩 읽어 CharacterIndex를 만듭니다.
+    build_character_index와 같은 결과를 내며, 유지하는 상태는 캐릭터별 배열뿐입니다.
+    (직전 기록의 레벨 진행도, 항목별 마지막 비결측 값, 누적 성장량, 주차별 행 번호)
+    """
+    from growth_stream import week_dates, week_table
+
+    dates = pd.DatetimeIndex(week_dates(file_path))
+    # 1) ocid 사전: ocid 컬럼만 주차별로 읽어 정렬된 고유 목록을 만듭니다.
+    ocids = pd.Index(
+        pd.concat([pd.Series(week_table(file_path, date).column('ocid').unique().to_pandas(), dtype='string') for date in dates]),
+        name='ocid',
+    ).dropna().unique().sort_values()
+    n_characters = len(ocids)
+
+    # 2) 캐릭터별 배열을 주차 순서로 갱신합니다.
+    rows = np.full((n_characters, len(dates)), -1, dtype='int32')
+    vectors = np.zeros((n_characters, len(dates)), dtype='float32')
+    last_progress = np.full(n_characters, np.nan)
+    seen = np.zeros(n_characters, dtype=bool)
+    level_gain = np.zeros(n_characters)
+    latest = {column: np.full(n_characters, None, dtype=object) for column in PROFILE_COLUMNS}
+    names = []
+    for w, date in enumerate(dates):
+        week = week_table(file_path, date).select(TRAJECTORY_COLUMNS).to_pandas()
+        positions = np.flatnonzero(week['ocid'].notna().to_numpy())
+        week = week.iloc[positions]
+        codes = ocids.get_indexer(week['ocid'].astype('string'))
+
+        progress = level_progress(week)
+        gain = np.where(seen[codes], np.nan_to_num(progress - last_progress[codes], nan=0.0), 0.0)
+        rows[codes, w] = positions
+        vectors[codes, w] = gain
+        np.add.at(level_gain, codes, gain)
+        last_progress[codes] = progress
+        seen[codes] = True
+        for column, values in latest.items():
+            present = week[column].notna().to_numpy()
+            values[codes[present]] = week[column].to_numpy(dtype=object)[present]
+        names.append(pd.DataFrame({'key': week['character_name'].astype('string').str.lower(), 'owner': codes}).dropna().drop_duplicates())
+
+    latest['character_level'] = latest['character_level'].astype('float64')
+    profiles = pd.DataFrame({'ocid': ocids.to_numpy(), **latest, 'level_gain': level_gain})
+    name_keys, name_owners = _name_index(pd.concat(names, ignore_index=True) if names else pd.DataFrame({'key': [], 'owner': []}))
+    return CharacterIndex(
+        trajectories=WeekTrajectories(file_path=str(file_path), dates=dates, rows=rows),
+        ocids=ocids,
+        profiles=profiles,
+        name_keys=name_keys,
+        name_owners=name_owners,
+        dates=dates,
+        gain_vectors=_normalize_rows(vectors),
+    )
+
+
+# 인덱스는 원본 지문별로 한 번만 만들고, 읽기 전용으로 모든 세션이 공유합니다.
+# precompute.py가 만든 아티팩트가 있으면 계산 없이 읽습니다.
+@cached('character_index', max_entries=1, sources=lambda file_path: [file_path])
+@artifact('character_index', sources=lambda file_path: [file_path])
+def read_character_index(file_path):
+    if use_streaming(file_path):
+        return build_character_index_by_week(file_path)
+    return build_character_index(read_growth_log(file_path, columns=TRAJECTORY_COLUMNS))
+
+
+def load_character_index(file_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 None을 반환합니다."""
+    try:
+        return read_character_index(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return None
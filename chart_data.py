@@ -0,0 +1,214 @@
+# 파일 위치: chart_data.py
+"""
+plotly 차트용 서버 측 데이터 계층.
+
+px.histogram / px.box / px.scatter에 행 단위 프레임을 그대로 넘기면 모든 행이 JSON으로
+브라우저에 전송됩니다. 여기서는 히스토그램 구간 집계, 박스플롯 사분위수·수염 계산,
+산점도 점 개수 제한을 서버에서 처리해 차트 크기가 데이터 행 수와 무관하게 유지되도록 합니다.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from segment_aggregates import weighted_quantile
+
+# 차트 하나당 브라우저로 보내는 산점도 점의 최대 개수
+MAX_SCATTER_POINTS = 5000
+
+
+def _as_numeric(series):
+    """datetime 컬럼은 정수(ns)로 바꿔 numpy 연산이 가능하도록 합니다."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.tz_localize(None).astype('datetime64[ns]').astype('int64').where(series.notna()).to_numpy(dtype='float64')
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def histogram_counts(df, x, nbins=None, bin_width=None, color=None, weights=None):
+    """
+    x 컬럼을 구간으로 나눈 개수표를 반환합니다. (color 지정 시 그룹별)
+    bin_width를 주면 고정 폭 구간, 아니면 nbins개(기본 'auto') 구간을 사용합니다.
+    weights 컬럼을 주면 df를 (값, 개수) 형식의 집계로 보고 개수를 더합니다.
+    이때 구간 경계는 값의 최솟값·최댓값만 쓰므로 bin_width나 정수 nbins를 지정해야 합니다.
+    """
+    values = _as_numeric(df[x])
+    row_weights = None if weights is None else df[weights].to_numpy(dtype='float64')
+    present = ~np.isnan(values)
+    if not present.any():
+        return pd.DataFrame(columns=([color] if color else []) + ['bin_start', 'bin_end', 'count'])
+
+    if bin_width is not None:
+        low = np.floor(values[present].min() / bin_width) * bin_width
+        edges = np.arange(low, values[present].max() + bin_width, bin_width)
+        if len(edges) < 2:
+            edges = np.array([low, low + bin_width])
+    else:
+        edges = np.histogram_bin_edges(values[present], bins=nbins or 'auto')
+
+    groups = [(None, present)] if color is None else [
+        (name, present & (df[color] == name).to_numpy()) for name in pd.unique(df[color].dropna())
+    ]
+    frames = []
+    for name, mask in groups:
+        counts, _ = np.histogram(values[mask], bins=edges, weights=None if row_weights is None else row_weights[mask])
+        counts = counts.astype('int64')
+        frame = pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+        if color is not None:
+            frame.insert(0, color, name)
+        frames.append(frame)
+    result = pd.concat(frames, ignore_index=True)
+
+    if pd.api.types.is_datetime64_any_dtype(df[x]):
+        result['bin_start'] = pd.to_datetime(result['bin_start'].astype('int64'))
+        result['bin_end'] = pd.to_datetime(result['bin_end'].astype('int64'))
+    return result
+
+
+def histogram_figure(df, x, nbins=None, bin_width=None, color=None, title=None, labels=None, weights=None):
+    """px.histogram과 같은 모양의 막대 그래프를 미리 집계한 구간으로 그립니다."""
+    counts = histogram_counts(df, x, nbins=nbins, bin_width=bin_width, color=color, weights=weights)
+    counts = counts[counts['count'] > 0].reset_index(drop=True)  # 빈 구간은 전송하지 않습니다.
+    counts['bin_center'] = counts['bin_start'] + (counts['bin_end'] - counts['bin_start']) / 2
+
+    labels = dict(labels or {})
+    fig = px.bar(
+        counts,
+        x='bin_center',
+        y='count',
+        color=color,
+        title=title,
+        labels={'bin_center': labels.get(x, x), 'count': labels.get('count', 'count'), **labels},
+        hover_data={'bin_start': True, 'bin_end': True, 'bin_center': False},
+    )
+    # 구간 중심 간격이 곧 구간 폭이므로 plotly가 막대 폭을 자동으로 맞춥니다.
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def box_stats(df, y, by):
+    """
+    그룹별 박스플롯 통계(사분위수, 평균, 1.5 IQR 수염, 노치 폭)를 계산합니다.
+    사분위수는 plotly 기본값과 같은 선형 보간 방식입니다.
+    """
+    data = pd.DataFrame({'group': df[by], 'value': _as_numeric(df[y])}).dropna(subset=['value'])
+    grouped = data.groupby('group', observed=True, sort=False)['value']
+    stats = pd.DataFrame({
+        'q1': grouped.quantile(0.25),
+        'median': grouped.median(),
+        'q3': grouped.quantile(0.75),
+        'mean': grouped.mean(),
+        'n': grouped.size(),
+    })
+    iqr = stats['q3'] - stats['q1']
+    low_limit = data['group'].map(stats['q1'] - 1.5 * iqr).astype('float64')
+    high_limit = data['group'].map(stats['q3'] + 1.5 * iqr).astype('float64')
+    stats['lowerfence'] = data['value'].where(data['value'] >= low_limit).groupby(data['group'], observed=True).min()
+    stats['upperfence'] = data['value'].where(data['value'] <= high_limit).groupby(data['group'], observed=True).max()
+    stats['notchspan'] = 1.57 * iqr / np.sqrt(stats['n'])
+    return stats.rename_axis(by).reset_index()
+
+
+def box_stats_from_sketch(sketch, y, by):
+    """
+    (group, value, count) 형식의 값 분포 스케치로 box_stats와 같은 통계를 계산합니다.
+    스케치 값이 반올림되어 있으면 사분위수·수염도 그 정밀도의 근삿값입니다.
+    """
+    rows = []
+    for group, part in sketch.groupby('group', sort=False):
+        values, counts = part['value'].to_numpy(dtype='float64'), part['count'].to_numpy()
+        order = np.argsort(values, kind='stable')
+        values, counts = values[order], counts[order]
+        n = counts.sum()
+        q1, median, q3 = (weighted_quantile(values, counts, q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        rows.append({
+            by: group,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'mean': (values * counts).sum() / n,
+            'n': n,
+            'lowerfence': values[values >= q1 - 1.5 * iqr].min(),
+            'upperfence': values[values <= q3 + 1.5 * iqr].max(),
+            'notchspan': 1.57 * iqr / np.sqrt(n),
+        })
+    return pd.DataFrame(rows, columns=[by, 'q1', 'median', 'q3', 'mean', 'n', 'lowerfence', 'upperfence', 'notchspan'])
+
+
+def box_figure(df, x, y, title=None, labels=None, notched=False, category_order=None):
+    """px.box(color=x)와 같은 모양의 박스플롯을 서버에서 계산한 통계로 그립니다. 원본 값은 전송하지 않습니다."""
+    return box_figure_from_stats(box_stats(df, y, x), x, y, title=title, labels=labels, notched=notched, category_order=category_order)
+
+
+def box_figure_from_stats(stats, x, y, title=None, labels=None, notched=False, category_order=None):
+    """box_stats 결과(미리 계산해 캐시해 둔 통계)로 박스플롯을 그립니다."""
+    if category_order is not None:
+        order = {name: i for i, name in enumerate(category_order)}
+        stats = stats.sort_values(x, key=lambda s: s.map(order)).reset_index(drop=True)
+
+    labels = labels or {}
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, row in stats.iterrows():
+        name = str(row[x])
+        fig.add_trace(go.Box(
+            name=name,
+            x=[name],
+            q1=[row['q1']],
+            median=[row['median']],
+            q3=[row['q3']],
+            mean=[row['mean']],
+            lowerfence=[row['lowerfence']],
+            upperfence=[row['upperfence']],
+            notchspan=[row['notchspan']] if notched else None,
+            notched=notched,
+            marker_color=palette[i % len(palette)],
+            legendgroup=name,
+            offsetgroup=name,
+        ))
+    fig.update_layout(
+        title=title,
+        boxmode='group',
+        legend_title_text=labels.get(x, x),
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+    )
+    return fig
+
+
+def decimate_points(df, x, y, max_points=MAX_SCATTER_POINTS, grid_size=64, seed=0):
+    """
+    산점도용으로 최대 max_points개 행만 남깁니다. (이하이면 그대로 반환)
+
+    x·y를 grid_size × grid_size 격자로 나눠 점이 있는 모든 칸에서 최소 1개를 남기고
+    (외곽·희소 영역 보존), 남은 예산은 무작위 균등 추출로 채워 밀도 분포를 유지합니다.
+    """
+    if len(df) <= max_points:
+        return df
+
+    xs = _as_numeric(df[x])
+    ys = _as_numeric(df[y])
+    present = np.flatnonzero(~np.isnan(xs) & ~np.isnan(ys))
+    if len(present) == 0:
+        return df.iloc[:0]  # 그릴 수 있는 점이 없습니다.
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permutation(present)
+
+    def cell(values):
+        low, high = np.nanmin(values), np.nanmax(values)
+        span = high - low if high > low else 1.0
+        return np.minimum(((values - low) / span * grid_size).astype('int64'), grid_size - 1)
+
+    cells = cell(xs[shuffled]) * grid_size + cell(ys[shuffled])
+    first_in_cell = pd.Series(cells).groupby(cells).cumcount().to_numpy() == 0
+    keep = shuffled[first_in_cell][:max_points]
+    remaining = max_points - len(keep)
+    if remaining > 0:
+        keep = np.concatenate([keep, shuffled[~first_in_cell][:remaining]])
+    return df.iloc[np.sort(keep)]
+
+
+def payload_bytes(fig):
+    """브라우저로 전송되는 figure JSON 크기(바이트)."""
+    return len(fig.to_json().encode('utf-8'))
@@ -0,0 +1,229 @@
+# 파일 위치: cody_data.py
+"""
+코디 분석 스냅샷(코디_분석_결과.csv) 로더.
+
+코디 페이지와 교차 분석 페이지가 같은 캐시 항목을 공유하도록 로드·전처리를 한곳에 둡니다.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from activity_mart import append_week, empty_state, load_activity_mart
+from artifacts import artifact
+from cache import cached
+from dataset_server import attach_dataset
+from item_matrix import ItemMatrix
+from ocid_index import OcidIndex
+from segment_aggregates import build_segment_aggregates
+from utils import GROWTH_LOG_PATH, read_growth_log, use_duckdb, use_streaming
+
+DATA_CANDIDATES = [
+    Path("코디_분석_결과.csv"),
+    Path(r"C:\Users\MSG\Desktop\DAB6기\윤석진_데이터톤파일 정리\7팀_데이터톤_사용데이터프레임\코디_분석_결과.csv"),
+]
+
+COLUMN_MAP = {
+    "유료아이템착용 개수": "paid_item_count",
+    "총 코디금액(원)": "total_cody_amount",
+    "착용코디금액(원)": "equipped_cody_amount",
+    "스페셜라벨 개수": "special_label_cnt",
+    "레드라벨 개수": "red_label_cnt",
+    "마스터라벨 개수": "master_label_cnt",
+    "일루전 링 개수": "illusion_ring_cnt",
+    "비싼 헤어(부티크, 마스터라벨) 유무": "premium_hair_flag",
+    "헤어 믹스염색 여부": "mix_hair_flag",
+    "헤어 믹스염색 비율": "mix_hair_ratio",
+    "성형 믹스염색 여부": "mix_face_flag",
+    "성형 믹스염색 비율": "mix_face_ratio",
+    "착용 아이템 리스트": "equipped_items",
+    "착용 헤어,성형,피부": "equipped_beauty",
+    "세분화 유저 그룹": "user_segment",
+}
+
+# 세그먼트별로 미리 세어 둘 조건 (이름 -> 조건을 만족하는 행 마스크)
+SEGMENT_FLAGS = {
+    "master_label_users": lambda d: d["master_label_cnt"] > 0,
+    "red_label_users": lambda d: d["red_label_cnt"] > 0,
+    "special_label_users": lambda d: d["special_label_cnt"] > 0,
+    "hair_mix_users": lambda d: d["mix_hair_flag"] > 0,
+    "face_mix_users": lambda d: d["mix_face_flag"] > 0,
+    # 믹스 사용자 중 50:50이 아닌 커스텀 비율을 고른 유저
+    "hair_custom_mix_users": lambda d: (d["mix_hair_flag"] > 0) & (d["mix_hair_ratio"] != 50),
+    "face_custom_mix_users": lambda d: (d["mix_face_flag"] > 0) & (d["mix_face_ratio"] != 50),
+}
+AMOUNT_COLUMNS = ["total_cody_amount", "equipped_cody_amount"]
+
+# 쉼표로 이어 붙인 아이템 목록 컬럼 -> 화면 표시 이름
+ITEM_COLUMNS = {
+    "equipped_items": "코디 아이템",
+    "equipped_beauty": "헤어·성형·피부",
+}
+
+SEGMENT_ALIAS = {
+    "1. 유료 유저 (아이템 구매 지출)": "코디 유저",
+    "2. 무료/이벤트 유저 (뷰티 컨텐츠 지출)": "헤어/성형 유저",
+    "3. 순수 무료 유저 (지출 0원)": "무과금 유저",
+}
+SEGMENT_ORDER = [*SEGMENT_ALIAS.values(), "기타"]
+
+
+def parse_cody_csv(path):
+    """코디 CSV를 읽어 컬럼명·세그먼트·수치 컬럼을 정리한 프레임 (아이템 목록은 문자열 그대로)."""
+    df = pd.read_csv(path, encoding="utf-8").rename(columns=COLUMN_MAP)
+    df["user_segment"] = df["user_segment"].astype(str).str.strip()
+    df["segment_simple"] = df["user_segment"].map(SEGMENT_ALIAS).fillna("기타")
+
+    numeric_cols = [
+        "paid_item_count",
+        "total_cody_amount",
+        "equipped_cody_amount",
+        "special_label_cnt",
+        "red_label_cnt",
+        "master_label_cnt",
+        "illusion_ring_cnt",
+        "premium_hair_flag",
+        "mix_hair_flag",
+        "mix_hair_ratio",
+        "mix_face_flag",
+        "mix_face_ratio",
+    ]
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return df.reset_index(drop=True)  # 행 위치 = ItemMatrix 행 번호
+
+
+def cody_frame(path):
+    """dataset_server.py가 게시한 공유 프레임에 붙고, 없으면 CSV를 파싱합니다."""
+    df = attach_dataset("cody", path)
+    return parse_cody_csv(path) if df is None else df
+
+
+# 아이템 목록 문자열은 로드할 때 한 번만 잘라 희소 행렬(ItemMatrix)로 바꿉니다.
+# 세그먼트·라벨·믹스 지표는 세그먼트별 부분 집계로 만들어 두고, 필터를 바꾸면 선택된 세그먼트만 합칩니다.
+# 아티팩트에는 이 파생 객체만 담고 프레임은 담지 않으므로, 워커는 프레임을 공유 버퍼에 붙인 채로 아티팩트를 읽습니다.
+@artifact("cody_derived", sources=lambda path, df=None: [path], from_growth_log=False)
+def read_cody_derived(path, df=None):
+    """(아이템 행렬 dict, 세그먼트 부분 집계). df를 주지 않으면 cody_frame(path)로 읽습니다."""
+    if df is None:
+        df = cody_frame(path)
+    item_matrices = {
+        col: ItemMatrix.from_strings(df[col]) for col in ITEM_COLUMNS if col in df.columns
+    }
+    aggregates = build_segment_aggregates(
+        df, "segment_simple", flags=SEGMENT_FLAGS, value_columns=AMOUNT_COLUMNS
+    )
+    return item_matrices, aggregates
+
+
+# 캐시 키는 (경로, 파일 지문)이라 CSV가 바뀌면 다시 읽습니다.
+# 프레임은 공유 버퍼에 붙이거나 파싱하고, 파생 객체는 precompute.py가 만든 아티팩트가 있으면 읽습니다.
+@cached("cody_dataframe", max_entries=2, sources=lambda path: [path])
+def read_cody_dataframe(path):
+    df = cody_frame(path)
+    item_matrices, aggregates = read_cody_derived(path, df)
+    return df.drop(columns=[col for col in ITEM_COLUMNS if col in df.columns]), item_matrices, aggregates
+
+
+def find_cody_path():
+    """코디 분석 CSV 경로 (후보 중 처음 존재하는 파일). 없으면 None."""
+    for path in DATA_CANDIDATES:
+        if path.exists():
+            return str(path)
+    return None
+
+
+def load_cody_dataframe():
+    """(코디 데이터프레임, 아이템 행렬 dict, 세그먼트 부분 집계)를 반환합니다."""
+    path = find_cody_path()
+    if path is not None:
+        return read_cody_dataframe(path)
+    st.error("코디 분석용 CSV 파일을 찾을 수 없습니다. 경로를 다시 확인해주세요.")
+    return pd.DataFrame(), {}, None
+
+
+# --- 성장 로그와의 조인 ---
+# 성장 로그·활동 마트·코디 스냅샷의 ocid를 하나의 OcidIndex로 인코딩해 정수 id로 조인합니다.
+GROWTH_JOIN_COLUMNS = ["ocid", "date", "character_level", "전투력"]
+WEEKLY_JOIN_COLUMNS = ["ocid", "date", "weekly_exp_gain", "activity_status"]
+
+
+def attach_cody_segment(frame, ocid_index, cody_ids, segment_codes):
+    """
+    frame 행에 공용 ocid id(ocid_id)와 코디 세그먼트(cody_segment)를 붙입니다.
+    코디 스냅샷에 없는 유저의 행은 제외합니다.
+    """
+    ids = ocid_index.encode(frame["ocid"])
+    positions = ocid_index.join_positions(ids, cody_ids)
+    matched = positions >= 0
+    return frame[matched].assign(
+        ocid_id=ids[matched],
+        cody_segment=pd.Categorical.from_codes(segment_codes[positions[matched]], SEGMENT_ORDER),
+    ).reset_index(drop=True)
+
+
+def _cody_lookup(cody, *other_ocids):
+    """(코디·다른 ocid로 만든 공용 ocid 사전, 코디 행의 id, 코디 행의 세그먼트 코드)."""
+    ocid_index = OcidIndex.build(cody["ocid"], *other_ocids)
+    segment_codes = pd.Categorical(cody["segment_simple"], categories=SEGMENT_ORDER).codes.astype(np.int8)
+    return ocid_index, ocid_index.encode(cody["ocid"]), segment_codes
+
+
+def join_cody_growth_by_week(log_path, cody):
+    """
+    스트리밍 모드: 주차를 하나씩 읽어 코디 스냅샷에 있는 유저의 행만 남기고 조인합니다.
+    주간 활동 지표는 activity_mart.append_week로 남긴 유저에 대해서만 이어서 계산하므로,
+    로그·마트 전체를 올리지 않고 유지하는 상태는 코디 유저별 직전 경험치뿐입니다.
+    """
+    from growth_stream import iter_growth_weeks
+
+    ocid_index, cody_ids, segment_codes = _cody_lookup(cody)
+    columns = list(dict.fromkeys([*GROWTH_JOIN_COLUMNS, "character_exp", "has_guild"]))
+    state = empty_state()
+    growth_parts, weekly_parts = [], []
+    for _, week_df in iter_growth_weeks(log_path, columns):
+        week_df = week_df[ocid_index.encode(week_df["ocid"]) >= 0]
+        weekly, state = append_week(state, week_df)
+        growth_parts.append(attach_cody_segment(week_df[GROWTH_JOIN_COLUMNS], ocid_index, cody_ids, segment_codes))
+        weekly_parts.append(attach_cody_segment(weekly[WEEKLY_JOIN_COLUMNS], ocid_index, cody_ids, segment_codes))
+    if not growth_parts:
+        return pd.DataFrame(columns=[*GROWTH_JOIN_COLUMNS, "ocid_id", "cody_segment"]), pd.DataFrame(columns=[*WEEKLY_JOIN_COLUMNS, "ocid_id", "cody_segment"])
+    return pd.concat(growth_parts, ignore_index=True), pd.concat(weekly_parts, ignore_index=True)
+
+
+@cached("cody_growth_join", max_entries=2, sources=lambda log_path, cody_path: [log_path, cody_path])
+@artifact("cody_growth_join", sources=lambda log_path, cody_path: [log_path, cody_path])
+def read_cody_growth_join(log_path, cody_path):
+    """코디 세그먼트를 붙인 (성장 로그 프레임, 주간 활동 마트 프레임)."""
+    cody = read_cody_dataframe(cody_path)[0]
+    if use_duckdb():
+        import sql_backend  # sql_backend가 이 모듈을 임포트하므로 호출 시점에 가져옵니다.
+
+        growth, weekly = sql_backend.cody_growth_rows(log_path, cody_path)
+        ocid_index, cody_ids, segment_codes = _cody_lookup(cody)
+    elif use_streaming(log_path):
+        return join_cody_growth_by_week(log_path, cody)
+    else:
+        growth = read_growth_log(log_path, columns=GROWTH_JOIN_COLUMNS)
+        weekly = load_activity_mart(log_path)[WEEKLY_JOIN_COLUMNS]
+        ocid_index, cody_ids, segment_codes = _cody_lookup(cody, growth["ocid"])
+    return (
+        attach_cody_segment(growth, ocid_index, cody_ids, segment_codes),
+        attach_cody_segment(weekly, ocid_index, cody_ids, segment_codes),
+    )
+
+
+def load_cody_growth_join(log_path=GROWTH_LOG_PATH):
+    """read_cody_growth_join의 페이지용 래퍼. 파일이 없으면 오류를 표시하고 빈 프레임을 반환합니다."""
+    cody_path = find_cody_path()
+    if cody_path is None:
+        st.error("코디 분석용 CSV 파일을 찾을 수 없습니다. 경로를 다시 확인해주세요.")
+        return pd.DataFrame(), pd.DataFrame()
+    try:
+        return read_cody_growth_join(log_path, cody_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{log_path}' 경로를 확인해주세요.")
+        return pd.DataFrame(), pd.DataFrame()
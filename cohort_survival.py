@@ -0,0 +1,305 @@
+# 파일 위치: cohort_survival.py
+"""
+코호트 리텐션·생존 분석 페이지용 유저 × 주차 패널.
+
+성장 로그를 ocid × 주차 행렬(기록 여부, 주간 성장 여부)로 한 번 펼쳐 두고, 유저별 이벤트 시점을 배열로 계산합니다.
+코호트(생성 주차, 직업, 길드 가입 여부, 레벨 구간)별 리텐션과 Kaplan–Meier 생존 곡선은 유저 배열에 대한
+np.bincount 몇 번으로 구하므로, 유저가 백만 명이어도 유저 단위 파이썬 반복이 없습니다.
+
+- 월드 리프: 리프한 캐릭터의 ocid는 리프 전 주차가 빈 행(user_status '월드 리프 유저')이고,
+  새 월드로 옮긴 주부터 기록이 생깁니다. 그래서 첫 기록 주차를 리프 주차로 봅니다.
+  첫 주부터 기록이 있으면 잔류 유저이고, 끝까지 기록이 없으면 기간 안에 리프가 관측되지 않은 것으로 보고 마지막 주에서 절단합니다.
+- 성장 중단: 마지막으로 성장한 다음 주부터 남은 주차가 모두 성장 없이 CHURN_WEEKS주 이상 이어지면 그 주를 이탈 시점으로 봅니다.
+  끝에서 CHURN_WEEKS주 안쪽은 판단할 수 없으므로 그 앞에서 절단합니다.
+
+성장 여부는 character_index와 같이 레벨 진행도(레벨 + 경험치 비율)의 주간 증가로 판단하며,
+직전 주와 이번 주 기록이 모두 있을 때만 '성장'·'레벨 정체'를 매깁니다. (빈 행은 레벨 정체로 세지 않습니다)
+활동 분석 페이지의 '정체'(activity_mart: 경험치 차이가 0 이하, 빈 행 포함)와 기준이 다르므로 페이지에서는
+'레벨 정체'로 구분해 표시합니다.
+코호트 속성은 유저별 첫 기록 기준입니다. 월드 리프 유저는 리프 전 기록이 없으므로 리프 후 값이고,
+같은 이유로 리프 전 레벨 정체 이력을 알 수 없어 '레벨 정체 후 이탈' 분석은 성장 중단 기준으로 계산합니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.api.types import union_categoricals
+
+from artifacts import artifact
+from cache import cached
+from character_index import level_progress
+from utils import LEVEL_BINS, LEVEL_LABELS, read_growth_log, use_streaming
+
+PANEL_COLUMNS = [
+    'ocid', 'date', 'character_name', 'character_class', 'character_level', 'character_exp_rate',
+    'has_guild', 'character_date_create',
+]
+
+EVENTS = ['월드 리프', '성장 중단']
+COHORT_DIMENSIONS = ['전체', '생성 주차', '직업', '길드 가입 여부', '레벨 구간']
+CHURN_WEEKS = 4         # 이만큼 연속으로 성장하지 않고 기간이 끝나면 성장 중단으로 봅니다.
+COHORT_LIMIT = 8        # 생성 주차·직업은 인원이 많은 순으로 이만큼만 두고 나머지는 '기타'로 묶습니다.
+MIN_COHORT_USERS = 20   # 생존 곡선에 그릴 최소 코호트 인원 (표에는 모두 표시)
+OTHER_LABEL = '기타'
+MISSING_LABEL = '기록 없음'
+
+
+def kaplan_meier(durations, happened, codes, n_groups, n_times):
+    """
+    그룹별 이산 시간 Kaplan–Meier 추정.
+    durations: 기준 시점부터 이벤트 또는 절단까지 경과 주차(0 이상), happened: 이벤트 발생 여부, codes: 그룹 번호.
+    (그룹, 경과 주차) 배열 at_risk·events·survival·se(Greenwood 표준오차)를 반환합니다.
+    """
+    shape = (n_groups, n_times)
+    flat = codes * n_times + durations
+    exits = np.bincount(flat, minlength=n_groups * n_times).reshape(shape)
+    events = np.bincount(flat[happened], minlength=n_groups * n_times).reshape(shape)
+    # t 시점 위험 집합 = 경과 주차가 t 이상인 유저
+    at_risk = exits[:, ::-1].cumsum(axis=1)[:, ::-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+        survival = np.cumprod(1 - hazard, axis=1)
+        greenwood = np.where(at_risk > events, events / (at_risk * (at_risk - events)), 0.0).cumsum(axis=1)
+    return at_risk, events, survival, survival * np.sqrt(greenwood)
+
+
+@dataclass(frozen=True)
+class CohortPanel:
+    dates: pd.DatetimeIndex     # 주차 축
+    growing: np.ndarray         # (주차 수, 유저 수) 직전 주보다 레벨 진행도가 오른 주 (bool, 주차별 집계가 연속 메모리를 읽도록 주차 우선)
+    first_seen: np.ndarray      # 유저별 첫 기록 주차 (기록이 없으면 주차 수)
+    leap_week: np.ndarray       # 유저별 월드 리프 주차 (-1: 첫 주부터 잔류, 주차 수: 기간 안에 기록 없음)
+    first_stagnant: np.ndarray  # 유저별 첫 레벨 정체 주차 (-1: 없음)
+    churn_start: np.ndarray     # 유저별 마지막 성장 다음 주 (이후 성장 없음)
+    cohorts: dict               # 코호트 기준 -> 유저별 pd.Categorical
+
+    @property
+    def n_users(self):
+        return len(self.first_seen)
+
+    def groups(self, dimension):
+        """코호트 기준 dimension의 (유저별 코호트 번호, 코호트 이름 목록)."""
+        if dimension == '전체':
+            return np.zeros(self.n_users, dtype='int64'), ['전체']
+        cohort = self.cohorts[dimension]
+        return cohort.codes.astype('int64'), list(cohort.categories)
+
+    def durations(self, event, from_stagnation=False):
+        """
+        유저별 (기준 시점부터 경과 주차, 이벤트 발생 여부).
+        기준 시점은 월드 리프는 첫 주, 성장 중단은 첫 기록 주차이며, from_stagnation이면 첫 레벨 정체 주차입니다.
+        기준 시점이 없거나 그 전에 이벤트가 난 유저는 경과 주차가 -1입니다.
+        """
+        n_weeks = len(self.dates)
+        if event == '월드 리프':
+            origin = self.first_stagnant if from_stagnation else np.zeros(self.n_users, dtype='int16')
+            happened = (self.leap_week >= 0) & (self.leap_week < n_weeks)
+            end = np.where(happened, self.leap_week, n_weeks - 1)
+        else:
+            origin = self.first_stagnant if from_stagnation else self.first_seen
+            horizon = n_weeks - CHURN_WEEKS
+            happened = self.churn_start <= horizon
+            end = np.where(happened, self.churn_start, horizon)
+        durations = end.astype('int64') - origin
+        durations[(origin < 0) | (durations < 0)] = -1
+        return durations, happened
+
+    def _estimate(self, event, dimension, from_stagnation):
+        durations, happened = self.durations(event, from_stagnation)
+        codes, labels = self.groups(dimension)
+        valid = durations >= 0
+        estimate = kaplan_meier(durations[valid], happened[valid], codes[valid], len(labels), len(self.dates))
+        return labels, estimate
+
+    def survival(self, event, dimension, from_stagnation=False, min_users=1):
+        """코호트별 생존 곡선 (long 형식). 기준 시점 인원이 min_users 미만인 코호트는 제외합니다."""
+        labels, (at_risk, events, survival, se) = self._estimate(event, dimension, from_stagnation)
+        n_groups, n_times = survival.shape
+        curves = pd.DataFrame({
+            'cohort': pd.Categorical(np.repeat(labels, n_times), categories=labels, ordered=True),
+            'week': np.tile(np.arange(n_times), n_groups),
+            'at_risk': at_risk.ravel(),
+            'events': events.ravel(),
+            'survival': survival.ravel(),
+            'lower': np.clip(survival - 1.96 * se, 0, 1).ravel(),
+            'upper': np.clip(survival + 1.96 * se, 0, 1).ravel(),
+        })
+        # 위험 집합이 빈 뒤의 구간은 그리지 않습니다.
+        keep = (at_risk[:, :1] >= min_users).repeat(n_times, axis=1) & (at_risk > 0)
+        return curves[keep.ravel()].reset_index(drop=True)
+
+    def summary(self, event, dimension, from_stagnation=False):
+        """코호트별 인원·이벤트 수·이벤트 비율(%)·중앙 생존 주차(50% 미도달이면 NaN)·마지막 생존율(%). 인원이 없는 코호트는 뺍니다."""
+        labels, (at_risk, events, survival, _) = self._estimate(event, dimension, from_stagnation)
+        below = survival <= 0.5
+        users = at_risk[:, 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = events.sum(axis=1) / users * 100
+        summary = pd.DataFrame({
+            'cohort': labels,
+            'users': users,
+            'events': events.sum(axis=1),
+            'event_rate': rate,
+            'median_weeks': np.where(below.any(axis=1), below.argmax(axis=1), np.nan),
+            'final_survival': survival[:, -1] * 100,
+        })
+        return summary[users > 0].reset_index(drop=True)
+
+    def retention(self, dimension):
+        """코호트(행) × 날짜(열)별 성장 유저 비율(%). 분모는 코호트 전체 인원이며, 비교할 직전 주가 없는 첫 주는 뺍니다."""
+        codes, labels = self.groups(dimension)
+        sizes = np.bincount(codes, minlength=len(labels))
+        counts = np.stack(
+            [np.bincount(codes, weights=self.growing[week], minlength=len(labels)) for week in range(1, len(self.dates))],
+            axis=1,
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = counts / sizes[:, None] * 100
+        return pd.DataFrame(
+            share,
+            index=pd.CategoricalIndex(labels, categories=labels, ordered=True, name='cohort'),
+            columns=pd.Index(self.dates[1:], name='date'),
+        )
+
+
+def _compact(frame):
+    # 패널에 필요한 값만 남겨 청크를 합칠 때의 메모리를 줄입니다.
+    return pd.DataFrame({
+        'ocid': frame['ocid'],
+        'date': frame['date'],
+        'observed': frame['character_name'].notna().to_numpy(),
+        'progress': level_progress(frame),
+        'character_class': frame['character_class'],
+        'character_level': frame['character_level'],
+        'has_guild': frame['has_guild'].to_numpy(),
+        'character_date_create': frame['character_date_create'],
+    })
+
+
+def _concat(frames):
+    # 청크마다 범주가 달라도 범주 컬럼은 범주 그대로(코드만) 합칩니다.
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+    columns = {}
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[name] = union_categoricals(parts)
+        else:
+            columns[name] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _top_labels(values, limit, sort=False, label=str):
+    """
+    인원이 많은 limit개 값만 남기고 나머지는 '기타', 결측은 '기록 없음'인 범주.
+    sort면 남긴 값을 값 순서로, 아니면 인원 순으로 둡니다. 이름은 남긴 값에만 label을 적용해 만듭니다.
+    """
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    kept = np.argsort(-counts, kind='stable')[:limit]
+    if sort:
+        kept = kept[np.argsort(np.asarray(uniques)[kept], kind='stable')]
+    # 코드 -> 새 코드 (마지막 칸은 결측 코드 -1)
+    lookup = np.full(len(uniques) + 1, len(kept))
+    lookup[kept] = np.arange(len(kept))
+    lookup[-1] = len(kept) + 1
+    categories = [*(label(value) for value in np.asarray(uniques)[kept]), OTHER_LABEL, MISSING_LABEL]
+    return pd.Categorical.from_codes(lookup[codes], categories=categories).remove_unused_categories()
+
+
+def _level_bands(levels):
+    # 0: 260 미만, 1~: LEVEL_LABELS 구간, 그다음: 구간 위(기타), 마지막: 기록 없음
+    codes = np.searchsorted(np.asarray(LEVEL_BINS), levels, side='right')
+    codes[np.isnan(levels)] = len(LEVEL_BINS) + 1
+    categories = [f"{LEVEL_BINS[0]} 미만", *LEVEL_LABELS, OTHER_LABEL, MISSING_LABEL]
+    return pd.Categorical.from_codes(codes, categories=categories).remove_unused_categories()
+
+
+def build_cohort_panel(frames):
+    """전처리된 성장 로그(PANEL_COLUMNS 포함) 프레임 또는 청크 목록으로 CohortPanel을 만듭니다."""
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    df = _concat(_compact(frame) for frame in frames)
+    dates = pd.DatetimeIndex(np.unique(df['date'].dropna().to_numpy()))
+    weeks = dates.get_indexer(df['date'])
+    rows = np.flatnonzero(weeks >= 0)
+    codes, ocids = pd.factorize(df['ocid'].iloc[rows])
+    weeks = weeks[rows]
+    n_users, n_weeks = len(ocids), len(dates)
+
+    # 유저 × 주차 행렬 (같은 ocid·날짜 행은 하나라고 가정합니다)
+    observed = np.zeros((n_users, n_weeks), dtype=bool)
+    observed[codes, weeks] = df['observed'].to_numpy()[rows]
+    progress = np.full((n_users, n_weeks), np.nan)
+    progress[codes, weeks] = df['progress'].to_numpy()[rows]
+    comparable = observed[:, 1:] & observed[:, :-1]
+    growing = np.zeros_like(observed)
+    growing[:, 1:] = comparable & (progress[:, 1:] > progress[:, :-1])
+    stagnant = np.zeros_like(observed)
+    stagnant[:, 1:] = comparable & ~growing[:, 1:]
+    del progress
+
+    seen = observed.any(axis=1)
+    first_seen = np.where(seen, observed.argmax(axis=1), n_weeks)
+    leap_week = np.where(observed[:, 0], -1, first_seen)
+    first_stagnant = np.where(stagnant.any(axis=1), stagnant.argmax(axis=1), -1)
+    last_growth = n_weeks - 1 - growing[:, ::-1].argmax(axis=1)
+    churn_start = np.where(growing.any(axis=1), last_growth + 1, first_seen + 1)
+
+    # 코호트 속성: 유저별 첫 기록 행의 값
+    first = observed[codes, weeks] & (weeks == first_seen[codes])
+    first_rows, owners = rows[first], codes[first]
+
+    def first_values(column):
+        # 유저 번호 순서의 값 (기록이 없는 유저는 결측)
+        values = df[column].take(first_rows)
+        values.index = owners
+        return values.reindex(np.arange(n_users))
+
+    created = first_values('character_date_create')
+    if created.dt.tz is not None:
+        created = created.dt.tz_localize(None)  # 현지 시각 기준 날짜
+    created_week = created.dt.normalize() - pd.to_timedelta(created.dt.weekday, unit='D')
+    has_guild = first_values('has_guild')
+    guild_codes = np.where(has_guild.isna(), 2, np.where(has_guild.fillna(False).astype(bool), 0, 1))
+    cohorts = {
+        '생성 주차': _top_labels(created_week, COHORT_LIMIT, sort=True, label=lambda week: f"{pd.Timestamp(week):%Y-%m-%d} 주"),
+        '직업': _top_labels(first_values('character_class'), COHORT_LIMIT),
+        '길드 가입 여부': pd.Categorical.from_codes(guild_codes, categories=['길드 가입', '길드 없음', MISSING_LABEL]).remove_unused_categories(),
+        '레벨 구간': _level_bands(first_values('character_level').astype('float64').to_numpy(na_value=np.nan)),
+    }
+    return CohortPanel(
+        dates=dates,
+        growing=np.ascontiguousarray(growing.T),
+        first_seen=first_seen.astype('int16'),
+        leap_week=leap_week.astype('int16'),
+        first_stagnant=first_stagnant.astype('int16'),
+        churn_start=churn_start.astype('int16'),
+        cohorts=cohorts,
+    )
+
+
+# 패널은 원본 지문별로 한 번만 만들고, 읽기 전용으로 모든 세션이 공유합니다.
+# precompute.py가 만든 아티팩트가 있으면 계산 없이 읽습니다.
+@cached('cohort_panel', max_entries=1, sources=lambda file_path: [file_path])
+@artifact('cohort_panel', sources=lambda file_path: [file_path])
+def read_cohort_panel(file_path):
+    if use_streaming(file_path):
+        # 스트리밍 모드에서는 필요한 컬럼만 청크로 읽어, 청크마다 패널 계산에 쓰는 값만 남깁니다.
+        from growth_stream import iter_growth_chunks
+
+        return build_cohort_panel(iter_growth_chunks(file_path, PANEL_COLUMNS))
+    return build_cohort_panel(read_growth_log(file_path, columns=PANEL_COLUMNS))
+
+
+def load_cohort_panel(file_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 None을 반환합니다."""
+    try:
+        return read_cohort_panel(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return None
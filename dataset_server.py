@@ -0,0 +1,219 @@
+# 파일 위치: dataset_server.py
+"""
+공유 메모리 데이터셋 서버.
+
+로더 프로세스가 전처리된 프레임(성장 로그, 활동 마트, 코디 스냅샷)을 한 번만 만들어
+/dev/shm(없으면 .cache/shared)에 Arrow IPC 파일로 게시하고, 대시보드 워커는 이 파일을
+메모리 매핑해 pandas 배열이 매핑된 버퍼를 그대로 가리키는 읽기 전용 프레임으로 붙습니다.
+워커가 몇 개든 데이터 본체는 운영체제 페이지 캐시에 한 벌만 있습니다.
+
+기존 Arrow 스냅샷은 to_pandas가 범주 코드·결측 마스크·비트 단위 bool을 변환하느라 거의 모든
+컬럼을 워커마다 복사합니다. 게시 파일에는 pandas 내부 배열을 그대로 기본형 컬럼으로 저장합니다.
+
+- numpy 컬럼: 값 그대로 (NaN·NaT도 값으로 저장하고 validity 비트맵은 두지 않음)
+- 범주: 코드 컬럼 + 범주 목록 파일
+- 결측 허용 정수·boolean: 값 컬럼 + uint8 마스크 컬럼
+- 문자열: Arrow string (pandas str dtype이 그대로 감쌉니다)
+
+    python dataset_server.py               # 한 번 게시
+    python dataset_server.py --watch 60    # 상주하며 원본이 바뀌면 다시 게시
+
+워커는 원본 지문이 같은 게시본이 있으면 자동으로 붙고, 없으면 기존처럼 직접 읽습니다.
+(SHARED_DATASETS=off로 끌 수 있습니다.) 프레임 버퍼는 읽기 전용이라 제자리 수정은 오류가 납니다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils import CACHE_DIR, GROWTH_LOG_PATH, source_fingerprint
+
+SHARED_DATASETS = os.environ.get('SHARED_DATASETS', 'auto')
+SHARED_ROOT = Path(os.environ.get(
+    'SHARED_DATASET_DIR',
+    '/dev/shm/maple-dashboard' if Path('/dev/shm').is_dir() else CACHE_DIR / 'shared',
+))
+FRAME_FILE = 'frame.arrow'
+META_FILE = 'meta.json'
+
+
+def _dataset_dir(name, source_path):
+    return SHARED_ROOT / f"{name}.{Path(source_path).stem}.{source_fingerprint(source_path)}"
+
+
+# --- 프레임 <-> 기본형 버퍼 ---
+
+MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _primitive(values):
+    # Arrow의 bool은 비트 단위라 numpy로 그대로 볼 수 없으므로 uint8로 저장합니다.
+    return pa.array(values.view('uint8') if values.dtype == bool else values, from_pandas=False)
+
+
+def _physical_columns(series):
+    """pandas 컬럼 → ({물리 컬럼 이름: pa.Array}, 메타, 범주 목록 또는 None)."""
+    name, dtype = series.name, series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        meta = {'kind': 'category', 'ordered': bool(dtype.ordered)}
+        codes = series.array.codes
+        return {f"{name}.codes": pa.array(codes)}, meta, pa.array(dtype.categories.to_numpy(), from_pandas=True)
+    if isinstance(series.array, MASKED_ARRAYS):
+        meta = {'kind': 'masked', 'dtype': str(dtype)}
+        mask = series.isna().to_numpy()
+        values = series.to_numpy(dtype=dtype.numpy_dtype, na_value=dtype.numpy_dtype.type(0))
+        meta['values_dtype'] = str(values.dtype)
+        return {f"{name}.values": _primitive(values), f"{name}.mask": _primitive(mask)}, meta, None
+    if isinstance(dtype, pd.StringDtype) or dtype == object:
+        meta = {'kind': 'string'}
+        values = series.astype('string').to_numpy(na_value=None)
+        return {f"{name}.values": pa.array(values, type=pa.large_string())}, meta, None
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        # UTC 기준 값으로 저장하고, 붙을 때 시간대를 다시 씌웁니다. (이 컬럼만 붙을 때 한 번 복사됩니다)
+        meta = {'kind': 'datetime', 'dtype': str(dtype.base), 'tz': str(dtype.tz)}
+        series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+    else:
+        meta = {'kind': 'numpy', 'dtype': str(dtype)}
+    values = series.to_numpy()
+    if values.dtype.kind == 'M':
+        meta.setdefault('tz', None)
+        meta['kind'], values = 'datetime', values.view('int64')
+    return {f"{name}.values": _primitive(values)}, meta, None
+
+
+def _view(table, column, dtype=None):
+    # validity 비트맵이 없는 기본형 컬럼은 매핑된 버퍼를 그대로 numpy로 봅니다.
+    # (combine_chunks는 청크가 하나여도 복사하므로, 한 배치로 게시한 파일은 첫 청크를 바로 씁니다)
+    chunked = table.column(column)
+    values = (chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()).to_numpy(zero_copy_only=True)
+    return values if dtype is None else values.view(dtype)
+
+
+def _logical_column(table, name, meta, categories):
+    kind = meta['kind']
+    if kind == 'category':
+        dtype = pd.CategoricalDtype(pd.Index(categories.to_pandas().array), ordered=meta['ordered'])
+        return pd.Categorical.from_codes(_view(table, f"{name}.codes"), dtype=dtype)
+    if kind == 'masked':
+        values, mask = _view(table, f"{name}.values", meta['values_dtype']), _view(table, f"{name}.mask", 'bool')
+        return pd.api.types.pandas_dtype(meta['dtype']).construct_array_type()(values, mask, copy=False)
+    if kind == 'string':
+        return pd.array(table.column(f"{name}.values"), dtype=pd.StringDtype('pyarrow', na_value=np.nan))
+    if kind == 'datetime':
+        values = _view(table, f"{name}.values", meta['dtype'])
+        if meta['tz'] is None:
+            return values
+        return pd.Series(values, copy=False).dt.tz_localize('UTC').dt.tz_convert(meta['tz']).array
+    return _view(table, f"{name}.values", meta['dtype'])
+
+
+def publish_frame(df, target_dir):
+    """df를 target_dir에 게시합니다. 임시 디렉터리에 쓴 뒤 원자적으로 교체합니다."""
+    tmp_dir = target_dir.with_name(f"{target_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    arrays, columns = {}, {}
+    for name in df.columns:
+        physical, meta, categories = _physical_columns(df[name])
+        arrays.update(physical)
+        columns[name] = meta
+        if categories is not None:
+            meta['categories'] = f"{len(columns) - 1}.categories.arrow"
+            with pa.OSFile(str(tmp_dir / meta['categories']), 'wb') as sink, pa.ipc.new_file(sink, pa.schema([('categories', categories.type)])) as writer:
+                writer.write_table(pa.table({'categories': categories}))
+    table = pa.table(arrays)
+    with pa.OSFile(str(tmp_dir / FRAME_FILE), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    (tmp_dir / META_FILE).write_text(json.dumps({'rows': len(df), 'columns': columns}, ensure_ascii=False), encoding='utf-8')
+    shutil.rmtree(target_dir, ignore_errors=True)
+    os.replace(tmp_dir, target_dir)
+
+
+def _read_mapped(path):
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def attach_frame(target_dir):
+    """게시된 프레임에 읽기 전용으로 붙습니다. 게시본이 없으면 None."""
+    meta_path = target_dir / META_FILE
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    table = _read_mapped(target_dir / FRAME_FILE)
+    data = {}
+    for name, column in meta['columns'].items():
+        categories = _read_mapped(target_dir / column['categories']).column(0) if 'categories' in column else None
+        data[name] = _logical_column(table, name, column, categories)
+    return pd.DataFrame(data, copy=False)
+
+
+# --- 데이터셋 ---
+
+def attach_dataset(name, source_path):
+    """source_path 현재 지문으로 게시된 데이터셋 name. 없거나 꺼져 있으면 None."""
+    if SHARED_DATASETS == 'off':
+        return None
+    try:
+        return attach_frame(_dataset_dir(name, source_path))
+    except OSError:
+        return None
+
+
+def publish_dataset(name, source_path, df):
+    target_dir = _dataset_dir(name, source_path)
+    SHARED_ROOT.mkdir(parents=True, exist_ok=True)
+    publish_frame(df, target_dir)
+    # 같은 원본의 오래된 게시본은 정리합니다. (이미 붙어 있는 워커의 매핑은 계속 유효합니다)
+    for stale in SHARED_ROOT.glob(f"{name}.{Path(source_path).stem}.*"):
+        if stale != target_dir and not stale.name.endswith('.tmp'):
+            shutil.rmtree(stale, ignore_errors=True)
+    return target_dir
+
+
+def publish(file_path=GROWTH_LOG_PATH, cody_path=None):
+    """성장 로그·활동 마트·코디 스냅샷 중 현재 지문의 게시본이 없는 것만 게시하고 {이름: 게시 디렉터리}를 반환합니다."""
+    from activity_mart import load_activity_mart
+    from cody_data import find_cody_path, parse_cody_csv
+    from utils import read_growth_log
+
+    builders = {
+        'growth_log': (file_path, lambda: read_growth_log(file_path, shared=False)),
+        'activity_mart': (file_path, lambda: load_activity_mart(file_path, shared=False)),
+    }
+    cody_path = cody_path or find_cody_path()
+    if cody_path is not None:
+        builders['cody'] = (cody_path, lambda: parse_cody_csv(cody_path))
+
+    published = {}
+    for name, (source_path, build) in builders.items():
+        target_dir = _dataset_dir(name, source_path)
+        if not (target_dir / META_FILE).exists():
+            published[name] = publish_dataset(name, source_path, build())
+    return published
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file_path', nargs='?', default=GROWTH_LOG_PATH)
+    parser.add_argument('--cody', default=None, help='코디 분석 CSV (기본: cody_data.find_cody_path)')
+    parser.add_argument('--watch', type=float, default=None, help='이 간격(초)마다 원본 지문을 확인해 다시 게시')
+    args = parser.parse_args()
+
+    print(f"게시 위치: {SHARED_ROOT}")
+    while True:
+        for name, target_dir in publish(args.file_path, args.cody).items():
+            print(f"게시: {name} -> {target_dir.name}")
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 # 파일 위치: final_dashboard.py
 
 import streamlit as st
+from prewarm import start_prewarm
+from sections import lazy_section
 
 # --- 페이지 기본 설정 ---
 # st.set_page_config()는 가장 먼저 실행되는 메인 파일에 한 번만 둡니다.
@@ -11,6 +13,9 @@ st.set_page_config(
     initial_sidebar_state="expanded" # 사이드바를 기본으로 열어둡니다.
 )
 
+# PREWARM_FIGURES=on이면 서버 프로세스당 한 번, 기본·날짜별 차트 JSON을 미리 만드는 작업(prewarm.py)을 띄웁니다.
+start_prewarm()
+
 # --- 메인 페이지 내용 ---
 st.title("🍁 챌린저스 서버 260+ 유저 성장 분석 대시보드")
 st.markdown("---")
@@ -32,7 +37,20 @@ st.markdown(
     - **2_Activity_Analysis**: 유저를 '성장'과 '정체' 그룹으로 나누어, 성장을 이끌거나 저해하는 요인을 심층적으로 분석합니다.
     - **(EDA Dashboard)**: 서버 전체의 성장 동향과 개별 캐릭터의 성장 과정을 추적합니다. (이 페이지는 아직 통합 전이라면 추가 설명)
     - **4_cody_fashion_analysis**: 10/16 스냅샷 기준 코디/뷰티 소비 유형과 라벨·믹스염색 활용도를 살펴봅니다.
+    - **5_cody_growth_cross_analysis**: 코디 소비 세그먼트를 성장 로그와 ocid로 연결해 전투력·주간 경험치 획득량을 비교합니다.
+    - **6_character_explorer**: 캐릭터 이름으로 개별 캐릭터의 16주 성장 궤적(레벨·전투력·스탯)을 조회하고, 성장 패턴이 비슷한 유저를 찾습니다.
+    - **7_cohort_survival**: 생성 주차·직업·길드·레벨 구간 코호트별로 월드 리프와 성장 중단까지의 생존 곡선(Kaplan–Meier)과 주차별 리텐션을 비교합니다.
     """
 )
 
-st.info("👈 왼쪽 사이드바에서 메뉴를 클릭하여 분석을 시작하세요.")
\ No newline at end of file
+st.info("👈 왼쪽 사이드바에서 메뉴를 클릭하여 분석을 시작하세요.")
+
+# --- 캐시 상태 ---
+# 모든 세션이 공유하는 캐시의 항목 수·메모리·적중률을 보고 컨테이너 메모리를 산정합니다.
+# 랜딩 페이지는 streamlit만 임포트하고, pandas를 쓰는 캐시 패널은 펼쳤을 때만 불러옵니다.
+def render_cache_panel():
+    from cache import render_cache_stats
+
+    render_cache_stats()
+
+lazy_section("🧮 캐시 상태", render_cache_panel, key='landing_cache_stats')
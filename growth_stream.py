@@ -0,0 +1,311 @@
+# 파일 위치: growth_stream.py
+"""
+메모리보다 큰 성장 로그를 위한 스트리밍(out-of-core) 집계.
+
+load_and_preprocess_data는 로그 전체를 하나의 프레임으로 올립니다. 스트리밍 모드에서는
+- CSV를 STREAM_CHUNK_ROWS행씩, 필요한 컬럼만 읽어 청크마다 공통 전처리를 적용하고
+- 페이지 집계(날짜·그룹별 행 수, 레벨·생성일 분포, 길드·직업 분포)를 청크별 groupby 결과의
+  합으로 계산하며
+- 주차 단위 계산(활동 상태, 날짜별 스냅샷)은 CSV를 한 번 훑어 날짜별 Arrow 파일로 나눠 둔 뒤
+  한 주차씩만 읽습니다.
+따라서 메모리 사용량은 전체 행 수가 아니라 청크 크기와 한 주차의 유저 수에 비례합니다.
+
+스트리밍 여부는 utils.use_streaming이 정합니다. (GROWTH_LOG_MODE=stream|memory|auto)
+"""
+
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from activity_mart import ACTIVITY_STATUSES, ActivityCube, append_week, build_activity_cube, empty_state
+from artifacts import artifact
+from cache import cached
+from chart_data import box_stats_from_sketch
+from segment_aggregates import SKETCH_MAX_VALUES, _round_significant
+from utils import (
+    CACHE_DIR,
+    GROWTH_LOG_DTYPES,
+    LEVEL_LABELS,
+    PREPROCESS_STEPS,
+    is_partitioned_store,
+    read_growth_log,
+    read_partition_table,
+    read_store_manifest,
+    source_fingerprint,
+)
+
+STREAM_CHUNK_ROWS = 500_000
+WEEK_SPILL_ROOT = CACHE_DIR / 'weeks'
+SAMPLE_ROWS = 1000  # 스트리밍 모드의 '데이터 원본 보기'에 보여줄 앞부분 행 수
+
+# 원본 컬럼이 아닌 전처리 결과 컬럼 -> 계산에 필요한 원본 컬럼
+_STEP_INPUTS = {'user_status': 'character_name', 'has_guild': 'character_guild_name'}
+_CATEGORY_COLUMNS = [c for c, dtype in GROWTH_LOG_DTYPES.items() if dtype == 'category'] + ['user_status']
+
+
+def preprocess_chunk(raw):
+    """일부 컬럼만 읽은 청크에 PREPROCESS_STEPS 중 입력 컬럼이 있는 단계만 적용합니다."""
+    for column, transform in PREPROCESS_STEPS:
+        if _STEP_INPUTS.get(column, column) in raw.columns:
+            raw[column] = transform(raw)
+    if 'ocid' in raw.columns:
+        raw = raw.dropna(subset=['ocid'])
+    return raw
+
+
+def iter_growth_chunks(file_path, columns, chunksize=STREAM_CHUNK_ROWS):
+    """전처리된 성장 로그를 columns만 담은 청크 단위로 돌려줍니다. 파티션 저장소는 파티션 단위입니다."""
+    if is_partitioned_store(file_path):
+        for date in sorted(read_store_manifest(file_path)['partitions']):
+            yield read_growth_log(file_path, dates=[date], columns=list(columns))
+        return
+
+    raw_columns = ['ocid', *dict.fromkeys(_STEP_INPUTS.get(c, c) for c in columns if c != 'ocid')]
+    reader = pd.read_csv(
+        file_path,
+        usecols=raw_columns,
+        dtype={c: GROWTH_LOG_DTYPES[c] for c in raw_columns},
+        chunksize=chunksize,
+    )
+    with reader:
+        for raw in reader:
+            yield preprocess_chunk(raw)[list(columns)]
+
+
+# --- 주차별 분할 (CSV -> 날짜별 Arrow) ---
+
+def _spill_dir(file_path):
+    return WEEK_SPILL_ROOT / f"{Path(file_path).stem}.{source_fingerprint(file_path)}"
+
+
+def _week_path(spill_dir, date):
+    return spill_dir / f"date={pd.Timestamp(date):%Y-%m-%d}.arrow"
+
+
+def spill_weeks(file_path, chunksize=STREAM_CHUNK_ROWS):
+    """
+    CSV를 한 번 훑어 날짜별 Arrow 파일로 나눠 씁니다. 원본 지문이 같으면 기존 결과를 재사용합니다.
+    범주 컬럼은 청크마다 사전이 달라지므로 문자열로 저장하고 읽을 때 범주로 되돌립니다.
+    """
+    spill_dir = _spill_dir(file_path)
+    if (spill_dir / '.complete').exists():
+        return spill_dir
+
+    tmp_dir = spill_dir.with_name(f"{spill_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    schema, writers = None, {}
+    try:
+        for chunk in iter_growth_chunks(file_path, [*GROWTH_LOG_DTYPES, 'user_status', 'has_guild'], chunksize):
+            chunk = chunk.astype({c: 'string' for c in _CATEGORY_COLUMNS})
+            for date, week in chunk.groupby('date', sort=False):
+                table = pa.Table.from_pandas(week, preserve_index=False)
+                if schema is None:
+                    schema = table.schema.remove_metadata()
+                if date not in writers:
+                    writers[date] = pa.ipc.new_file(str(_week_path(tmp_dir, date)), schema)
+                writers[date].write_table(table.cast(schema))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    (tmp_dir / '.complete').touch()
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    os.replace(tmp_dir, spill_dir)
+    # 같은 원본의 오래된 분할 결과는 정리합니다.
+    for stale in spill_dir.parent.glob(f"{Path(file_path).stem}.*"):
+        if stale != spill_dir and not stale.name.endswith('.tmp'):
+            shutil.rmtree(stale, ignore_errors=True)
+    return spill_dir
+
+
+def week_dates(file_path):
+    """주차 날짜 목록(오름차순 Timestamp). CSV는 날짜별 분할 결과에서 읽습니다."""
+    if is_partitioned_store(file_path):
+        return [pd.Timestamp(d) for d in sorted(read_store_manifest(file_path)['partitions'])]
+    return sorted(pd.Timestamp(p.stem.split('=', 1)[1]) for p in spill_weeks(file_path).glob('date=*.arrow'))
+
+
+def read_week(file_path, date, columns=None):
+    """한 주차의 전처리된 로그만 읽습니다."""
+    if is_partitioned_store(file_path):
+        return read_growth_log(file_path, dates=[date], columns=columns)
+    path = _week_path(spill_weeks(file_path), date)
+    if not path.exists():
+        return pd.DataFrame(columns=columns or [*GROWTH_LOG_DTYPES, 'user_status', 'has_guild'])
+    week = feather.read_table(path, columns=columns, memory_map=True).to_pandas(split_blocks=True)
+    return week.astype({c: 'category' for c in _CATEGORY_COLUMNS if c in week.columns})
+
+
+# 분할 파일은 원본 지문별 디렉터리에 한 번 쓰고 바꾸지 않으므로, 연 테이블을 경로별로 재사용합니다.
+_WEEK_TABLES = {}
+
+
+def week_table(file_path, date):
+    """한 주차의 Arrow 테이블 (메모리 매핑). read_week_rows의 행 번호는 이 테이블의 행 번호입니다."""
+    if is_partitioned_store(file_path):
+        return read_partition_table(file_path, date)
+    path = _week_path(spill_weeks(file_path), date)
+    table = _WEEK_TABLES.get(path)
+    if table is None:
+        table = _WEEK_TABLES[path] = feather.read_table(path, memory_map=True)
+    return table
+
+
+def read_week_rows(file_path, picks, columns=None):
+    """
+    picks([(날짜, week_table 행 번호 목록), ...])의 행만 읽어 한 프레임으로 돌려줍니다.
+    테이블에서 행을 고르고 합친 뒤 한 번만 바꾸므로 주차 전체를 올리지 않습니다.
+    """
+    tables = []
+    for date, rows in picks:
+        table = week_table(file_path, date)
+        if columns is not None:
+            table = table.select(columns)
+        tables.append(table.take(pa.array(rows, type=pa.int64())))
+    week = pa.concat_tables(tables).to_pandas()
+    return week.astype({c: 'category' for c in _CATEGORY_COLUMNS if c in week.columns})
+
+
+def iter_growth_weeks(file_path, columns=None, dates=None):
+    """(date, 주차 프레임)을 날짜 순으로 하나씩 돌려줍니다."""
+    for date in week_dates(file_path):
+        if dates is None or date in set(pd.DatetimeIndex(dates)):
+            yield date, read_week(file_path, date, columns)
+
+
+# --- 청크 합산 집계 ---
+
+def group_counts(chunks, groupings):
+    """
+    청크마다 groupby 행 수를 구해 더합니다. groupings는 {이름: 키 컬럼 목록}이고,
+    결과는 {이름: 행 수 Series (MultiIndex 또는 Index)}입니다. 결측 키는 세지 않습니다.
+    """
+    totals = {name: None for name in groupings}
+    for chunk in chunks:
+        for name, keys in groupings.items():
+            counts = chunk.groupby(keys, observed=True).size()
+            totals[name] = counts if totals[name] is None else totals[name].add(counts, fill_value=0)
+    return {name: (counts if counts is not None else pd.Series(dtype='int64')).astype('int64') for name, counts in totals.items()}
+
+
+@dataclass(frozen=True)
+class GrowthSummary:
+    """심플 보드 페이지용 집계. 모든 분포는 (키..., count) 형식의 작은 프레임입니다."""
+    status_by_date: pd.DataFrame      # date, user_status, count
+    level_counts: pd.DataFrame        # user_status, character_level, count
+    create_date_counts: pd.DataFrame  # user_status, character_date_create, count
+    guild_counts: pd.Series           # has_guild -> 잔류 유저 행 수
+    class_counts: pd.Series           # character_class -> 잔류 유저 행 수 (내림차순)
+    sample: pd.DataFrame              # 앞부분 SAMPLE_ROWS행
+
+    @property
+    def statuses(self):
+        return pd.unique(self.status_by_date['user_status'])
+
+    @property
+    def rows(self):
+        return int(self.status_by_date['count'].sum())
+
+
+STAYING = '챌린저스 잔류 유저'
+SUMMARY_COLUMNS = ['date', 'user_status', 'character_level', 'character_date_create', 'has_guild', 'character_class']
+
+
+def read_sample(file_path, rows=SAMPLE_ROWS):
+    """앞부분 rows행 (모든 컬럼, 전처리 적용)."""
+    if is_partitioned_store(file_path):
+        dates = sorted(read_store_manifest(file_path)['partitions'])[:1]
+        return read_growth_log(file_path, dates=dates).head(rows)
+    return preprocess_chunk(pd.read_csv(file_path, dtype=GROWTH_LOG_DTYPES, nrows=rows))
+
+
+def _staying(counts):
+    """첫 인덱스 레벨이 user_status인 개수에서 잔류 유저 행만 남깁니다."""
+    if STAYING not in counts.index.get_level_values(0):
+        return counts.iloc[:0].droplevel(0)
+    return counts.xs(STAYING, level=0)
+
+
+def build_growth_summary(file_path, chunksize=STREAM_CHUNK_ROWS):
+    counts = group_counts(iter_growth_chunks(file_path, SUMMARY_COLUMNS, chunksize), {
+        'status_by_date': ['date', 'user_status'],
+        'level': ['user_status', 'character_level'],
+        'create_date': ['user_status', 'character_date_create'],
+        'guild': ['user_status', 'has_guild'],
+        'class': ['user_status', 'character_class'],
+    })
+    return GrowthSummary(
+        status_by_date=counts['status_by_date'].rename('count').reset_index(),
+        level_counts=counts['level'].rename('count').reset_index(),
+        create_date_counts=counts['create_date'].rename('count').reset_index(),
+        guild_counts=_staying(counts['guild']).sort_values(ascending=False, kind='stable'),
+        class_counts=_staying(counts['class']).loc[lambda s: s > 0].sort_values(ascending=False, kind='stable'),
+        sample=read_sample(file_path),
+    )
+
+
+# --- 활동 분석 (주차 순회) ---
+
+def _merge_sketch(sketch, gains, groups):
+    """
+    (그룹, 값, 개수) 스케치에 이번 주 값을 더하고, 값 종류가 많으면 유효숫자 3자리로 줄입니다.
+    그룹은 주차·행 순서로 처음 나온 순서를 유지해, 메모리 모드의 chart_data.box_stats와 같은 순서가 됩니다.
+    """
+    week = pd.DataFrame({'group': groups, 'value': gains}).groupby(['group', 'value'], sort=False).size().rename('count').reset_index()
+    merged = pd.concat([sketch, week], ignore_index=True)
+    if merged['value'].nunique() > SKETCH_MAX_VALUES:
+        merged['value'] = _round_significant(merged['value'].to_numpy(dtype='float64'))
+    return merged.groupby(['group', 'value'], sort=False)['count'].sum().reset_index()
+
+
+def build_activity_aggregates(file_path):
+    """
+    주차를 하나씩 읽으며 activity_mart.append_week로 활동 상태를 계산하고
+    (ActivityCube, 길드 가입 여부별 '성장' 주차 경험치 획득량 박스 통계)를 반환합니다.
+    유지하는 상태는 ocid별 직전 경험치뿐이라 메모리는 유저 수에 비례합니다.
+    """
+    state = empty_state()
+    dates, cubes = [], []
+    sketch = pd.DataFrame({'group': pd.Series(dtype='bool'), 'value': pd.Series(dtype='float64'), 'count': pd.Series(dtype='int64')})
+    columns = ['ocid', 'date', 'character_level', 'character_exp', 'has_guild']
+    for date, week_df in iter_growth_weeks(file_path, columns):
+        week, state = append_week(state, week_df)
+        dates.append(date)
+        cube = build_activity_cube(week)
+        cubes.append(cube.counts if len(cube.dates) else np.zeros((1, len(ACTIVITY_STATUSES), len(LEVEL_LABELS) + 1), dtype='int32'))
+        growing = week['weekly_exp_gain'].to_numpy() > 0
+        sketch = _merge_sketch(sketch, week['weekly_exp_gain'].to_numpy()[growing], week['has_guild'].to_numpy()[growing])
+
+    shape = (0, len(ACTIVITY_STATUSES), len(LEVEL_LABELS) + 1)
+    cube = ActivityCube(dates=pd.DatetimeIndex(dates), counts=np.concatenate(cubes) if cubes else np.zeros(shape, dtype='int32'))
+    return cube, box_stats_from_sketch(sketch, 'weekly_exp_gain', 'has_guild')
+
+
+# --- 캐시된 로더 ---
+
+@cached('growth_summary', max_entries=2, sources=lambda file_path: [file_path])
+@artifact('growth_summary', sources=lambda file_path: [file_path])
+def read_growth_summary(file_path):
+    return build_growth_summary(file_path)
+
+
+@cached('stream_activity', max_entries=2, sources=lambda file_path: [file_path])
+def read_activity_aggregates(file_path):
+    return build_activity_aggregates(file_path)
+
+
+def load_growth_summary(file_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 None을 반환합니다."""
+    try:
+        return read_growth_summary(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return None
@@ -0,0 +1,245 @@
+# 파일 위치: ingest.py
+"""
+주간 스냅샷 증분 적재 파이프라인.
+
+새로 수집한 주차 스냅샷을 날짜별 파티션 저장소(date=YYYY-MM-DD.arrow + manifest.json)에
+추가합니다. (ocid, date) 기준으로 중복을 제거하고, 바뀐 파티션의 version만 올리며,
+활동 마트(activity_mart.py)는 새 주차만 이어 붙입니다. 대시보드는 GROWTH_LOG_PATH를
+저장소 디렉터리로 지정하면 파티션 version으로 지문을 만들어(utils.source_fingerprint), 주차 단위 캐시는
+그 주차 파티션이 바뀔 때만 새로 만듭니다.
+
+    # 기존 CSV 전체를 저장소로 옮기기 (초기 적재)
+    python ingest.py --store store/growth_log --fixture growth_log_v2_f_v2.csv
+    # 로컬 픽스처에서 특정 주차만 적재
+    python ingest.py --store store/growth_log --fixture week17.csv --date 2025-10-23
+    # 넥슨 Open API에서 직접 수집 (ocid 목록 파일: 한 줄에 하나)
+    NEXON_API_KEY=... python ingest.py --store store/growth_log --ocids ocids.txt --date 2025-10-23
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from activity_mart import update_activity_mart
+from utils import (
+    GROWTH_LOG_DTYPES,
+    STORE_MANIFEST,
+    partition_path,
+    preprocess_growth_log,
+    read_store_manifest,
+)
+
+DEFAULT_STORE = Path('store/growth_log')
+
+NEXON_API_URL = 'https://open.api.nexon.com/maplestory/v1'
+# 조회 대상 캐릭터가 없을 때(월드 리프·삭제 등) 오는 오류 코드: 유효하지 않은 식별자
+NOT_FOUND_ERRORS = {'OPENAPI00003'}
+# /character/stat 응답의 final_stat 이름 → 성장 로그 컬럼
+STAT_COLUMNS = {
+    '전투력': '전투력',
+    '보스 몬스터 데미지': '보스_데미지',
+    '방어율 무시': '방어율_무시',
+    '크리티컬 데미지': '크리티컬_데미지',
+    '아케인포스': '아케인포스',
+    '어센틱포스': '어센틱포스',
+    '스타포스': '스타포스',
+}
+
+
+# --- 스냅샷 소스 ---
+# 소스는 date(또는 None)를 받아 성장 로그 CSV와 같은 컬럼의 원시 프레임을 돌려주는 함수입니다.
+
+def fixture_source(csv_path):
+    """로컬 CSV 픽스처를 스냅샷 소스로 사용합니다. date가 없으면 파일의 모든 주차를 반환합니다."""
+    def fetch(date=None):
+        raw = pd.read_csv(csv_path, dtype=GROWTH_LOG_DTYPES)
+        if date is not None:
+            raw = raw[raw['date'] == f"{pd.Timestamp(date):%Y-%m-%d}"]
+        return raw
+    return fetch
+
+
+def _api_error_name(error):
+    """Open API 오류 응답 본문({"error": {"name": ..., "message": ...}})의 오류 코드."""
+    try:
+        return json.loads(error.read())['error']['name']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def nexon_api_source(api_key, ocids, request_interval=0.05, retries=3, retry_interval=1.0):
+    """
+    넥슨 Open API(/character/basic, /character/stat)에서 ocid별 스냅샷을 수집합니다.
+    캐릭터가 없다는 응답(404, NOT_FOUND_ERRORS)만 기존 로그와 같이 ocid·date만 있는 행으로 남깁니다.
+    연결 실패·시간 초과·호출 한도 초과(429)·서버 오류(5xx)는 retries번까지 간격을 늘려 다시 시도하고,
+    그래도 실패하거나 인증 오류(401·403) 등 그 밖의 HTTP 오류가 오면 예외를 그대로 올려
+    해당 주차가 일부 캐릭터만 빈 행으로 적재되지 않도록 합니다.
+    """
+    def get(endpoint, ocid, date):
+        """응답 JSON. 캐릭터가 없으면 None."""
+        query = urllib.parse.urlencode({'ocid': ocid, 'date': date})
+        request = urllib.request.Request(f"{NEXON_API_URL}/{endpoint}?{query}", headers={'x-nxopen-api-key': api_key})
+        for attempt in range(retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    return json.load(response)
+            except urllib.error.HTTPError as error:
+                if error.code == 404 or _api_error_name(error) in NOT_FOUND_ERRORS:
+                    return None
+                if (error.code != 429 and error.code < 500) or attempt == retries:
+                    raise
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == retries:
+                    raise
+            time.sleep(retry_interval * 2 ** attempt)
+
+    def fetch(date):
+        date = f"{pd.Timestamp(date):%Y-%m-%d}"
+        rows = []
+        for ocid in ocids:
+            row = {'ocid': ocid, 'date': date}
+            basic = get('character/basic', ocid, date)
+            stat = get('character/stat', ocid, date) if basic is not None else None
+            if basic is None or stat is None:
+                rows.append(row)
+                continue
+            row.update({column: basic.get(column) for column in GROWTH_LOG_DTYPES if column in basic and column != 'date'})
+            row['access_flag'] = {'true': True, 'false': False}.get(str(basic.get('access_flag')).lower())
+            row['liberation_quest_clear'] = basic.get('liberation_quest_clear_flag') == 'true'
+            for item in stat.get('final_stat', []):
+                if item.get('stat_name') in STAT_COLUMNS:
+                    row[STAT_COLUMNS[item['stat_name']]] = item.get('stat_value')
+            rows.append(row)
+            time.sleep(request_interval)  # API 호출 한도를 넘지 않도록 간격을 둡니다.
+        raw = pd.DataFrame(rows).reindex(columns=list(GROWTH_LOG_DTYPES))
+        numeric = [c for c, dtype in GROWTH_LOG_DTYPES.items() if dtype.startswith(('float', 'Int', 'UInt'))]
+        raw[numeric] = raw[numeric].apply(pd.to_numeric, errors='coerce')
+        return raw.astype(GROWTH_LOG_DTYPES)
+    return fetch
+
+
+# --- 적재 ---
+
+def normalize_snapshot(raw):
+    """원시 스냅샷에 공통 전처리를 적용하고 (ocid, date) 중복을 제거합니다. 나중 행이 우선합니다."""
+    df = preprocess_growth_log(raw.reindex(columns=list(GROWTH_LOG_DTYPES)).astype(GROWTH_LOG_DTYPES))
+    return df.drop_duplicates(subset=['ocid', 'date'], keep='last')
+
+
+def _categorize(df):
+    # 파티션을 합칠 때 object로 풀린 범주 컬럼을 다시 categorical로 맞춥니다.
+    for column, dtype in GROWTH_LOG_DTYPES.items():
+        if dtype == 'category':
+            df[column] = df[column].astype('category')
+    df['user_status'] = df['user_status'].astype('category')
+    return df
+
+
+def _to_arrow(df):
+    """파티션 간 스키마가 같도록 범주는 dictionary<int32, string>, 문자열은 string으로 고정합니다."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_large_string(field.type) or pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _digest(df):
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def _atomic_write(path, write):
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def ingest_snapshot(raw, store_dir=DEFAULT_STORE, update_marts=True):
+    """
+    스냅샷을 저장소에 적재하고, 내용이 실제로 바뀐 파티션 날짜('YYYY-MM-DD') 목록을 반환합니다.
+    기존 파티션과 겹치는 (ocid, date)는 새 값으로 대체합니다.
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_store_manifest(store_dir)
+    partitions = manifest.setdefault('partitions', {})
+
+    changed = []
+    for date, part in normalize_snapshot(raw).groupby('date', sort=True):
+        key = f"{pd.Timestamp(date):%Y-%m-%d}"
+        path = partition_path(store_dir, date)
+        if key in partitions and path.exists():
+            existing = feather.read_table(path).to_pandas()
+            part = pd.concat([existing, part], ignore_index=True).drop_duplicates(subset=['ocid', 'date'], keep='last')
+        part = _categorize(part.sort_values('ocid', kind='stable').reset_index(drop=True))
+
+        digest = _digest(part)
+        if partitions.get(key, {}).get('digest') == digest:
+            continue  # 같은 스냅샷을 다시 적재한 경우 캐시를 건드리지 않습니다.
+
+        _atomic_write(path, lambda tmp: feather.write_feather(_to_arrow(part), tmp, compression='uncompressed'))
+        partitions[key] = {
+            'rows': len(part),
+            'version': partitions.get(key, {}).get('version', 0) + 1,
+            'digest': digest,
+        }
+        changed.append(key)
+
+    if changed:
+        manifest['partitions'] = dict(sorted(partitions.items()))
+        _atomic_write(
+            store_dir / STORE_MANIFEST,
+            lambda tmp: tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8'),
+        )
+        if update_marts:
+            # 새 주차만 늘었으면 마트는 해당 주차만 추가하고, 과거 주차가 바뀌었으면 다시 빌드합니다.
+            update_activity_mart(store_dir)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default=str(DEFAULT_STORE), help='파티션 저장소 디렉터리')
+    parser.add_argument('--date', help='적재할 주차 (YYYY-MM-DD). 픽스처에서 생략하면 모든 주차')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--fixture', help='성장 로그와 같은 형식의 로컬 CSV')
+    source.add_argument('--ocids', help='넥슨 Open API로 수집할 ocid 목록 파일 (NEXON_API_KEY 필요)')
+    args = parser.parse_args()
+
+    if args.fixture:
+        fetch = fixture_source(args.fixture)
+        raw = fetch(args.date)
+    else:
+        if not args.date:
+            parser.error('--ocids 사용 시 --date가 필요합니다.')
+        api_key = os.environ.get('NEXON_API_KEY')
+        if not api_key:
+            parser.error('NEXON_API_KEY 환경 변수를 설정해주세요.')
+        ocids = [line.strip() for line in Path(args.ocids).read_text(encoding='utf-8').splitlines() if line.strip()]
+        try:
+            raw = nexon_api_source(api_key, ocids)(args.date)
+        except (urllib.error.URLError, TimeoutError) as e:
+            print(f"{args.date} 수집 실패 ({e}). 이 주차는 적재하지 않고 건너뜁니다.", file=sys.stderr)
+            return 1
+
+    changed = ingest_snapshot(raw, args.store)
+    print(f"{len(raw):,} rows -> {args.store}: changed partitions {changed or '없음'}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
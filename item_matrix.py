@@ -0,0 +1,112 @@
+# 파일 위치: item_matrix.py
+"""
+쉼표로 이어 붙인 아이템 목록 컬럼을 위한 유저 × 아이템 희소 행렬.
+
+'하이퍼 버닝 크라운, 투명 안경, ...' 같은 문자열을 로드할 때 한 번만 잘라
+아이템 이름 사전(vocabulary)과 CSR 형식 발생 행렬(indptr, indices)로 바꿔 둡니다.
+인기도·동시 착용·그룹별 착용 집계는 모두 np.bincount 기반 벡터 연산으로 처리하므로
+페이지에서 행마다 문자열을 다시 자를 필요가 없습니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ranking import top_k_indices
+
+ITEM_SEPARATOR = ', '
+
+
+@dataclass(frozen=True)
+class ItemMatrix:
+    vocabulary: pd.Index     # 아이템 코드 -> 이름 (가나다순)
+    indptr: np.ndarray       # 행 i의 아이템은 indices[indptr[i]:indptr[i + 1]] (int64, 길이 n_rows + 1)
+    indices: np.ndarray      # 아이템 코드 (int32, 행 안에서 오름차순·중복 없음)
+
+    @classmethod
+    def from_strings(cls, values, sep=ITEM_SEPARATOR):
+        """문자열 목록 컬럼에서 행렬을 만듭니다. 결측·빈 문자열 행은 아이템이 없는 행이 됩니다."""
+        values = pd.Series(values).reset_index(drop=True)
+        tokens = values.str.split(sep).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        codes, vocabulary = pd.factorize(tokens, sort=True)
+        n_items = max(len(vocabulary), 1)
+        # (행, 아이템) 쌍을 하나의 정수 키로 묶어 정렬·중복 제거를 한 번에 처리합니다.
+        keys = np.unique(tokens.index.to_numpy(dtype='int64') * n_items + codes)
+        rows, codes = np.divmod(keys, n_items)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(values)))]).astype('int64')
+        return cls(vocabulary=pd.Index(vocabulary), indptr=indptr, indices=codes.astype('int32'))
+
+    @property
+    def n_rows(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_items(self):
+        return len(self.vocabulary)
+
+    @property
+    def nbytes(self):
+        return int(self.indptr.nbytes + self.indices.nbytes + self.vocabulary.memory_usage(deep=True))
+
+    def _entry_rows(self):
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    def _row_mask(self, rows=None):
+        """rows(None, 불리언 마스크, 행 위치 배열)를 길이 n_rows의 불리언 마스크로 바꿉니다."""
+        if rows is None:
+            return np.ones(self.n_rows, dtype=bool)
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            return rows
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def item_code(self, item):
+        """아이템 이름의 코드. 사전에 없으면 -1."""
+        return int(self.vocabulary.get_loc(item)) if item in self.vocabulary else -1
+
+    def item_counts(self, rows=None):
+        """아이템별 착용 행 수 (길이 n_items)."""
+        entries = self._row_mask(rows)[self._entry_rows()]
+        return np.bincount(self.indices[entries], minlength=self.n_items)
+
+    def rows_with(self, item):
+        """item을 가진 행의 불리언 마스크."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        code = self.item_code(item)
+        if code >= 0:
+            mask[self._entry_rows()[self.indices == code]] = True
+        return mask
+
+    def counts_by_group(self, group_codes, n_groups):
+        """행별 그룹 코드(음수는 제외)에 대한 (그룹 × 아이템) 착용 행 수 행렬."""
+        entry_groups = np.asarray(group_codes)[self._entry_rows()]
+        keep = entry_groups >= 0
+        flat = entry_groups[keep].astype('int64') * self.n_items + self.indices[keep]
+        return np.bincount(flat, minlength=n_groups * self.n_items).reshape(n_groups, self.n_items)
+
+    def popularity(self, rows=None, top_n=20):
+        """착용 행 수 상위 아이템 (item, user_count, share[%]). share는 대상 행 수 대비 비율입니다."""
+        mask = self._row_mask(rows)
+        counts = self.item_counts(mask)
+        return self._top_frame(counts, mask.sum(), top_n)
+
+    def cooccurrence(self, item, rows=None, top_n=20):
+        """item과 함께 착용된 아이템 상위 목록. share는 item 착용 행 중 비율(%)입니다."""
+        mask = self._row_mask(rows) & self.rows_with(item)
+        counts = self.item_counts(mask)
+        code = self.item_code(item)
+        if code >= 0:
+            counts[code] = 0
+        return self._top_frame(counts, mask.sum(), top_n)
+
+    def _top_frame(self, counts, n_rows, top_n):
+        top = top_k_indices(np.where(counts > 0, counts, np.nan), top_n)
+        return pd.DataFrame({
+            'item': self.vocabulary[top],
+            'user_count': counts[top],
+            'share': counts[top] / n_rows * 100 if n_rows else np.zeros(len(top)),
+        })
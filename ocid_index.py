@@ -0,0 +1,57 @@
+# 파일 위치: ocid_index.py
+"""
+데이터셋 간 공용 ocid 키 사전.
+
+ocid(32자리 16진수 문자열)마다 int32 대리 키(id)를 한 번만 부여하고, 해시 인덱스
+(pd.Index.get_indexer)로 문자열 → id를 벡터 단위로 찾습니다. 성장 로그와 코디 스냅샷을
+같은 사전으로 인코딩하면 조인은 문자열 비교 없이 정수 배열 조회(O(행 수))가 됩니다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class OcidIndex:
+    keys: pd.Index   # 위치 = id, 값 = ocid (중복 없음)
+
+    @classmethod
+    def build(cls, *ocid_columns):
+        """여러 컬럼의 ocid를 처음 등장한 순서대로 모아 id를 부여합니다."""
+        index = cls(keys=pd.Index([], dtype='string', name='ocid'))
+        for ocids in ocid_columns:
+            index = index.extend(ocids)
+        return index
+
+    def extend(self, ocids):
+        """새 ocid만 뒤에 붙인 사전을 반환합니다. 기존 id는 바뀌지 않습니다."""
+        ocids = pd.Index(pd.unique(pd.Series(ocids, dtype='string').dropna()), dtype='string')
+        new_keys = ocids[self.keys.get_indexer(ocids) < 0]
+        if len(new_keys) == 0:
+            return self
+        return OcidIndex(keys=self.keys.append(new_keys).rename('ocid'))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def encode(self, ocids):
+        """ocid 배열 → int32 id 배열. 사전에 없거나 결측이면 -1."""
+        return self.keys.get_indexer(pd.Index(ocids, dtype='string')).astype('int32')
+
+    def decode(self, ids):
+        """int32 id 배열 → ocid 배열. 음수 id는 결측."""
+        ids = np.asarray(ids)
+        return pd.array(np.where(ids >= 0, self.keys.to_numpy()[np.clip(ids, 0, None)], None), dtype='string')
+
+    def join_positions(self, target_ids, source_ids):
+        """
+        target 행마다 같은 id를 가진 source 행의 위치를 돌려줍니다. (없으면 -1)
+        source의 id가 중복되면 마지막 행이 우선합니다.
+        """
+        target_ids, source_ids = np.asarray(target_ids), np.asarray(source_ids)
+        lookup = np.full(len(self) + 1, -1, dtype='int64')  # 마지막 칸은 -1 id용
+        valid = source_ids >= 0
+        lookup[source_ids[valid]] = np.flatnonzero(valid)
+        return lookup[np.where(target_ids >= 0, target_ids, len(self))]
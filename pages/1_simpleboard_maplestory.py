@@ -3,43 +3,66 @@
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from utils import load_and_preprocess_data # 1. 공통 도우미 임포트
-
-# --- 데이터 불러오기 ---
-# 모든 전처리는 utils.py가 책임집니다.
-df = load_and_preprocess_data('growth_log_v2_f_v2.csv')
+from chart_data import histogram_figure
+from growth_stream import load_growth_summary
+import sql_backend
+from sections import chart_section, lazy_section
+from utils import GROWTH_LOG_PATH, count_level_band, load_and_preprocess_data, load_candidate_level_histogram, use_duckdb, use_streaming # 1. 공통 도우미 임포트
 
 # --- 대시보드 UI 구성 ---
+# 제목을 먼저 그려, 데이터를 읽는 동안에도 페이지가 바로 보이도록 합니다.
 st.title("🍁 챌린저스 서버 260+ 유저 기본 분석")
 st.markdown("---")
 
+# --- 데이터 불러오기 ---
+# 모든 전처리는 utils.py가 책임집니다.
+# 로그가 메모리보다 크면(스트리밍 모드) 전체 프레임 대신 growth_stream.py가 청크별로 합산한 분포만 씁니다.
+# DuckDB 백엔드도 같은 형식의 집계(GrowthSummary)를 SQL로 만들어 씁니다.
+streaming = use_duckdb() or use_streaming(GROWTH_LOG_PATH)
+if streaming:
+    summary = sql_backend.load_growth_summary(GROWTH_LOG_PATH) if use_duckdb() else load_growth_summary(GROWTH_LOG_PATH)
+    if summary is None:
+        st.stop()
+    status_options = summary.statuses
+else:
+    df = load_and_preprocess_data(GROWTH_LOG_PATH)
+    status_options = df['user_status'].unique()
+
 # 사이드바 (필터)
 st.sidebar.header("🔎 필터")
 status_filter = st.sidebar.multiselect(
     "유저 그룹 선택:",
-    options=df['user_status'].unique(),
-    default=df['user_status'].unique(),
+    options=status_options,
+    default=status_options,
     key='simpleboard_status_filter' 
 )
 
 # 필터링된 데이터
-filtered_df = df[df['user_status'].isin(status_filter)]
+if streaming:
+    filtered_rows = summary.status_by_date.loc[summary.status_by_date['user_status'].isin(status_filter), 'count'].sum()
+else:
+    filtered_df = df[df['user_status'].isin(status_filter)]
+    filtered_rows = len(filtered_df)
+# 차트는 필터 상태별로 캐시하므로, 같은 필터로 돌아오면 figure를 다시 만들지 않습니다.
+status_key = tuple(sorted(status_filter))
 
-if filtered_df.empty:
+if filtered_rows == 0:
     st.warning("선택된 필터에 해당하는 데이터가 없습니다.")
     st.stop()
 
 # --- 4. 핵심 지표 (KPI) 표시 ---
-# 기존의 load_and_preprocess_data()는 growth_log용이므로 직접 로드
-user_df = pd.read_csv('candidates_챌린저스_lv260_and_above.csv')
-
-# level 컬럼 처리
-user_df['level'] = user_df['level'].astype(int)
+# 후보 유저 파일은 레벨별 인원수 배열로만 캐싱하며, 파일이 바뀔 때만 다시 읽습니다.
+# DuckDB 백엔드에서는 적재한 candidates 테이블을 레벨별로 GROUP BY해 같은 배열을 만듭니다.
+candidates_path = 'candidates_챌린저스_lv260_and_above.csv'
+level_hist = sql_backend.load_candidate_level_histogram(candidates_path) if use_duckdb() else load_candidate_level_histogram(candidates_path)
 
 # 유저 수 계산
-total_users = len(user_df)
-users_270_279 = len(user_df[(user_df['level'] >= 270) & (user_df['level'] <= 279)])
-users_280_plus = len(user_df[user_df['level'] >= 280])
+total_users = count_level_band(level_hist)
+users_270_279 = count_level_band(level_hist, 270, 279)
+users_280_plus = count_level_band(level_hist, 280)
+
+if total_users == 0:
+    st.stop()
 
 # KPI 표시
 st.subheader("📈 챌린저스 1 서버 유저 현황 (2025-07-03)")
@@ -50,37 +73,43 @@ col3.metric("280+ 레벨 유저", f"{users_280_plus:,} 명", f"{users_280_plus/t
 st.markdown("---")
 
 # --- 5. 시각화 (기존 코드 전체 포함) ---
-col_left, col_right = st.columns(2)
+# 스트리밍 모드에서는 (값, count) 집계표를 가중치로 넘겨 같은 차트를 그립니다.
+weights = 'count' if streaming else None
 
-with col_left:
-    # 1. 레벨 분포 (히스토그램)
-    st.subheader("📊 레벨 분포")
-    fig_level = px.histogram(
-        filtered_df, 
-        x='character_level', 
+def level_figure(statuses):
+    # 구간 집계는 서버에서 하고 막대만 전송합니다. (레벨은 1레벨 단위 구간)
+    source = summary.level_counts if streaming else df
+    return histogram_figure(
+        source[source['user_status'].isin(statuses)],
+        x='character_level',
+        bin_width=1,
         color='user_status',
         title="유저 그룹별 레벨 분포",
-        labels={'character_level': '캐릭터 레벨'}
+        labels={'character_level': '캐릭터 레벨'},
+        weights=weights,
     )
-    st.plotly_chart(fig_level, use_container_width=True)
 
-    # 2. 길드 가입률 (파이 차트)
-    st.subheader("🤝 길드 가입률")
-    guild_data = filtered_df[filtered_df['user_status'] == '챌린저스 잔류 유저']['has_guild'].value_counts()
-    fig_guild = px.pie(
+def staying_counts(statuses, column):
+    # 잔류 유저 행의 column 값별 인원수 (잔류 유저가 선택되지 않았으면 빈 Series)
+    if streaming:
+        counts = summary.guild_counts if column == 'has_guild' else summary.class_counts
+        return counts if '챌린저스 잔류 유저' in statuses else counts.iloc[:0]
+    selected = df[df['user_status'].isin(statuses)]
+    return selected[selected['user_status'] == '챌린저스 잔류 유저'][column].value_counts()
+
+def guild_figure(statuses):
+    guild_data = staying_counts(statuses, 'has_guild')
+    return px.pie(
         guild_data, 
         values=guild_data.values, 
         names=guild_data.index.map({True: '길드 가입', False: '길드 미가입'}),
         title="챌린저스 잔류 유저 길드 가입 현황",
         hole=0.3
     )
-    st.plotly_chart(fig_guild, use_container_width=True)
 
-with col_right:
-    # 3. 직업 분포 (막대 그래프)
-    st.subheader("⚔️ 직업 분포")
-    class_data = filtered_df[filtered_df['user_status'] == '챌린저스 잔류 유저']['character_class'].value_counts().nlargest(15)
-    fig_class = px.bar(
+def class_figure(statuses):
+    class_data = staying_counts(statuses, 'character_class').nlargest(15)
+    return px.bar(
         class_data,
         x=class_data.index,
         y=class_data.values,
@@ -88,20 +117,46 @@ with col_right:
         labels={'x': '직업', 'y': '유저 수'},
         color=class_data.index
     )
-    st.plotly_chart(fig_class, use_container_width=True)
-    
-    # 4. 캐릭터 생성일 분포
-    st.subheader("📅 캐릭터 생성일 분포")
-    create_date_data = filtered_df.dropna(subset=['character_date_create'])
-    fig_date = px.histogram(
-        create_date_data,
+
+def create_date_figure(statuses):
+    source = summary.create_date_counts if streaming else df
+    selected = source[source['user_status'].isin(statuses)]
+    return histogram_figure(
+        selected.dropna(subset=['character_date_create']),
         x='character_date_create',
+        nbins=60,
         color='user_status',
         title="유저 그룹별 캐릭터 생성일 분포",
-        labels={'character_date_create': '생성일'}
+        labels={'character_date_create': '생성일'},
+        weights=weights,
     )
-    st.plotly_chart(fig_date, use_container_width=True)
 
-# 원본 데이터 테이블 표시 (옵션)
-if st.checkbox("데이터 원본 보기"):
-    st.dataframe(filtered_df)
\ No newline at end of file
+col_left, col_right = st.columns(2)
+
+with col_left:
+    # 1. 레벨 분포 (히스토그램)
+    st.subheader("📊 레벨 분포")
+    chart_section('simpleboard_level', level_figure, status_key, sources=[GROWTH_LOG_PATH])
+
+    # 2. 길드 가입률 (파이 차트)
+    st.subheader("🤝 길드 가입률")
+    chart_section('simpleboard_guild', guild_figure, status_key, sources=[GROWTH_LOG_PATH])
+
+with col_right:
+    # 3. 직업 분포 (막대 그래프)
+    st.subheader("⚔️ 직업 분포")
+    chart_section('simpleboard_class', class_figure, status_key, sources=[GROWTH_LOG_PATH])
+    
+    # 4. 캐릭터 생성일 분포
+    st.subheader("📅 캐릭터 생성일 분포")
+    chart_section('simpleboard_create_date', create_date_figure, status_key, sources=[GROWTH_LOG_PATH])
+
+# 원본 데이터 테이블 표시 (옵션): 펼쳤을 때만 표를 만들어 전송합니다.
+def render_raw_table():
+    if streaming:
+        st.caption(f"집계 모드(스트리밍·DuckDB)에서는 전체 {summary.rows:,}행 중 앞부분 {len(summary.sample):,}행만 표시합니다.")
+        st.dataframe(summary.sample[summary.sample['user_status'].isin(status_filter)])
+    else:
+        st.dataframe(filtered_df)
+
+lazy_section("데이터 원본 보기", render_raw_table, key='simpleboard_raw_table')
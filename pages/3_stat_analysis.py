@@ -3,27 +3,56 @@
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from utils import load_and_preprocess_data # 1. 우리의 '공통 도우미'를 불러옵니다.
-
-# --- 데이터 불러오기 ---
-# 모든 전처리는 utils.py가 책임집니다.
-df = load_and_preprocess_data('growth_log_v2_f_v2.csv')
+from cache import cached
+from chart_data import box_figure, decimate_points, histogram_figure
+from ranking import RANKED_STATS
+from sections import chart_section, lazy_section
+from growth_stream import read_week, week_dates
+from snapshot_index import build_snapshot_index, load_snapshot_index
+import sql_backend
+from utils import GROWTH_LOG_PATH, LEVEL_LABELS, use_duckdb, use_streaming, week_source # 1. 우리의 '공통 도우미'를 불러옵니다.
 
 # --- 대시보드 UI 구성 ---
+# 제목을 먼저 그려, 인덱스를 만드는 동안에도 페이지가 바로 보이도록 합니다.
 st.title("⚔️ 챌린저스 서버 전투력 심층 분석")
 st.markdown("---")
 
+# --- 데이터 불러오기 ---
+# 모든 전처리는 utils.py가 책임집니다.
+# 날짜별 행 범위와 KPI·랭킹은 snapshot_index.py가 한 번만 계산해 두고, 읽기 전용으로 모든 세션이 공유합니다.
+# 스트리밍 모드에서는 선택한 날짜 한 주차만 읽어 그 날짜의 인덱스를 만듭니다.
+# DuckDB 백엔드도 전체 인덱스를 만들지 않고, 선택한 주차만 SQL로 읽습니다.
+# 주차 인덱스와 날짜별 figure는 그 주차의 원본(week_source)만으로 키를 잡아, 저장소에 새 주차를 적재해도 그대로 씁니다.
+sql_mode = use_duckdb()
+
+@cached('week_snapshot_index', max_entries=4, sources=lambda file_path, date: [week_source(file_path, date)])
+def load_week_snapshot_index(file_path, date):
+    week = sql_backend.read_week(file_path, date) if sql_mode else read_week(file_path, date)
+    return build_snapshot_index(week)
+
+streaming = sql_mode or use_streaming(GROWTH_LOG_PATH)
+if streaming:
+    dates = sql_backend.week_dates(GROWTH_LOG_PATH) if sql_mode else week_dates(GROWTH_LOG_PATH)
+    date_options = [f"{d:%Y-%m-%d}" for d in reversed(dates)]
+else:
+    snapshots = load_snapshot_index(GROWTH_LOG_PATH)
+    if snapshots is None:
+        st.stop()
+    date_options = snapshots.dates
+
 # --- 사이드바 (필터) ---
 st.sidebar.header("🗓️ 기준 시점 선택")
 # 날짜 목록을 내림차순으로 정렬하여 최신 날짜가 맨 위에 오도록 합니다.
-date_options = sorted(df['date'].dt.strftime('%Y-%m-%d').unique(), reverse=True)
 selected_date = st.sidebar.selectbox(
     "분석할 기준 날짜를 선택하세요:",
-    options=date_options
+    options=date_options,
+    key='stat_selected_date',
 )
+if streaming:
+    snapshots = load_week_snapshot_index(GROWTH_LOG_PATH, selected_date)
 
-# 선택된 날짜에 해당하는 데이터만 필터링합니다. (스냅샷 분석)
-df_snapshot = df[df['date'] == selected_date].copy()
+# 선택된 날짜의 연속 구간만 가져옵니다. (스냅샷 분석)
+df_snapshot = snapshots.snapshot(selected_date)
 
 if df_snapshot.empty:
     st.warning("선택된 날짜에 해당하는 데이터가 없습니다.")
@@ -31,9 +60,11 @@ if df_snapshot.empty:
 
 # --- 1. 핵심 지표 (KPI) ---
 st.subheader(f"📈 {selected_date} 기준 핵심 지표")
-avg_power = df_snapshot['전투력'].mean()
-max_power = df_snapshot['전투력'].max()
-top_1_percent_power = df_snapshot['전투력'].quantile(0.99) # 상위 1% 전투력
+# DuckDB 백엔드에서는 KPI·직업 분포를 SQL 집계로 계산합니다.
+kpi = sql_backend.power_kpis(GROWTH_LOG_PATH, selected_date) if sql_mode else snapshots.kpis.loc[selected_date]
+avg_power = kpi['avg_power']
+max_power = kpi['max_power']
+top_1_percent_power = kpi['p99_power'] # 상위 1% 전투력
 
 col1, col2, col3 = st.columns(3)
 col1.metric("평균 전투력", f"{avg_power:,.0f}")
@@ -43,46 +74,43 @@ st.markdown("---")
 
 
 # --- 2. 시각화 (2x2 그리드 레이아웃) ---
-col_left, col_right = st.columns(2)
+# 날짜별 figure는 한 번 만들면 캐시되므로, 랭킹 위젯만 바꾼 재실행에서는 다시 만들지 않습니다.
+def date_class_counts(date):
+    """date의 직업별 인원수 (내림차순)."""
+    return sql_backend.class_counts(GROWTH_LOG_PATH, date) if sql_mode else snapshots.class_counts[date]
 
-with col_left:
-    # --- 시각화 1: 전투력 분포 히스토그램 ---
-    st.subheader("① 전투력 분포 현황")
-    fig_hist = px.histogram(
-        df_snapshot.dropna(subset=['전투력']),
+def power_histogram_figure(date):
+    fig_hist = histogram_figure(
+        snapshots.snapshot(date),
         x='전투력',
         nbins=50,
-        title=f"{selected_date} 기준 전투력 분포",
+        title=f"{date} 기준 전투력 분포",
         labels={'전투력': '전투력'}
     )
     fig_hist.update_layout(bargap=0.1)
-    st.plotly_chart(fig_hist, use_container_width=True)
+    return fig_hist
 
-    # --- 시각화 2: 직업별 전투력 분포 (상위 10개 직업) ---
-    st.subheader("③ 직업별 전투력 분포 (상위 10개 직업)")
-    
+def class_power_box_figure(date):
     # 데이터가 많은 상위 10개 직업만 필터링하여 시각화의 가독성을 높입니다.
-    top_10_classes = df_snapshot['character_class'].value_counts().nlargest(10).index
+    df_snapshot = snapshots.snapshot(date)
+    top_10_classes = date_class_counts(date).nlargest(10).index
     df_top_classes = df_snapshot[df_snapshot['character_class'].isin(top_10_classes)]
 
-    fig_box = px.box(
+    # 사분위수·수염은 서버에서 계산하고, 이상치 점은 보내지 않습니다.
+    return box_figure(
         df_top_classes,
         x='character_class',
         y='전투력',
-        color='character_class',
         title="직업별 전투력 중앙값 및 분포 비교",
         labels={'character_class': '직업', '전투력': '전투력'},
-        points=False # 이상치(outlier) 점들을 숨겨서 깔끔하게 보여줍니다.
+        category_order=top_10_classes, # X축 직업 이름을 인원수 순서대로 보여줍니다.
     )
-    # X축 직업 이름을 정렬하지 않고 데이터 순서대로 보여줍니다.
-    fig_box.update_xaxes(categoryorder='array', categoryarray=top_10_classes)
-    st.plotly_chart(fig_box, use_container_width=True)
 
-with col_right:
-    # --- 시각화 3: 레벨과 전투력의 관계 (산점도) ---
-    st.subheader("② 레벨과 전투력의 상관관계")
-    fig_scatter = px.scatter(
-        df_snapshot,
+def level_power_scatter_figure(date):
+    # 점이 많으면 밀도를 유지하면서 MAX_SCATTER_POINTS개까지만 남깁니다.
+    df_scatter = decimate_points(snapshots.snapshot(date), 'character_level', '전투력')
+    return px.scatter(
+        df_scatter,
         x='character_level',
         y='전투력',
         hover_name='character_name', # 점 위에 마우스를 올리면 캐릭터 이름이 보입니다.
@@ -90,14 +118,57 @@ with col_right:
         labels={'character_level': '레벨', '전투력': '전투력'},
         opacity=0.6
     )
-    st.plotly_chart(fig_scatter, use_container_width=True)
-
-    # --- 시각화 4: 전투력 TOP 20 랭킹 ---
-    st.subheader("④ 전투력 랭킹 TOP 20")
-    df_ranking = df_snapshot[['character_name', 'character_class', 'character_level', '전투력']] \
-        .sort_values(by='전투력', ascending=False) \
-        .head(20)
-    
-    # 인덱스를 1부터 시작하도록 설정하여 순위를 보여줍니다.
-    df_ranking.index = range(1, len(df_ranking) + 1)
-    st.dataframe(df_ranking)
\ No newline at end of file
+
+sources = [week_source(GROWTH_LOG_PATH, selected_date)]
+col_left, col_right = st.columns(2)
+
+with col_left:
+    # --- 시각화 1: 전투력 분포 히스토그램 ---
+    st.subheader("① 전투력 분포 현황")
+    chart_section('stat_power_histogram', power_histogram_figure, selected_date, sources=sources)
+
+    # --- 시각화 2: 직업별 전투력 분포 (상위 10개 직업) ---
+    st.subheader("③ 직업별 전투력 분포 (상위 10개 직업)")
+    chart_section('stat_class_power_box', class_power_box_figure, selected_date, sources=sources)
+
+with col_right:
+    # --- 시각화 3: 레벨과 전투력의 관계 (산점도) ---
+    st.subheader("② 레벨과 전투력의 상관관계")
+    shown_points = chart_section('stat_level_power_scatter', level_power_scatter_figure, selected_date, sources=sources).points
+    if shown_points < len(df_snapshot):
+        st.caption(f"전체 {len(df_snapshot):,}명 중 {shown_points:,}명을 표본으로 표시합니다.")
+
+    # --- 시각화 4: 스탯 TOP 20 랭킹 ---
+    st.subheader("④ 스탯 랭킹 TOP 20")
+    rank_col1, rank_col2, rank_col3 = st.columns(3)
+    rank_stat = rank_col1.selectbox("랭킹 스탯", options=RANKED_STATS, key='stat_ranking_stat')
+    rank_class = rank_col2.selectbox(
+        "직업",
+        options=['전체 직업'] + list(date_class_counts(selected_date).index),
+        key='stat_ranking_class',
+    )
+    rank_level = rank_col3.selectbox("레벨 구간", options=['전체 레벨'] + LEVEL_LABELS, key='stat_ranking_level')
+
+    # 날짜별 리더보드는 미리 정렬되어 있으며, 인덱스는 1부터 시작하는 순위입니다.
+    df_ranking = snapshots.ranking(
+        selected_date,
+        rank_stat,
+        character_class=None if rank_class == '전체 직업' else rank_class,
+        level_range=None if rank_level == '전체 레벨' else rank_level,
+    )
+    st.dataframe(df_ranking)
+
+    lazy_section(
+        f"직업별 {rank_stat} 1위 보기",
+        lambda: st.dataframe(snapshots.leaders_by_class(selected_date, rank_stat), hide_index=True),
+        key='stat_ranking_leaders',
+    )
+
+    search_name = st.text_input("캐릭터 순위 조회", placeholder="캐릭터 이름을 입력하세요", key='stat_ranking_search')
+    if search_name:
+        rank, value = snapshots.character_rank(selected_date, search_name.strip(), rank_stat)
+        if rank is None:
+            st.info(f"{selected_date} 기준 '{search_name}'의 {rank_stat} 기록이 없습니다.")
+        else:
+            total = len(snapshots.leaderboards[selected_date][rank_stat])
+            st.success(f"'{search_name}'의 {rank_stat}: {value:,.0f} → {rank:,}위 / {total:,}명 (상위 {rank / total:.1%})")
@@ -3,7 +3,10 @@
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from pathlib import Path
+from chart_data import histogram_figure
+from cody_data import ITEM_COLUMNS, find_cody_path, load_cody_dataframe
+from sections import chart_section
+from utils import format_percent
 
 st.title("🧥 10/16 코디 아이템 집중 분석")
 st.markdown(
@@ -13,67 +16,7 @@ st.markdown(
     """
 )
 
-DATA_CANDIDATES = [
-    Path("코디_분석_결과.csv"),
-    Path(r"C:\Users\MSG\Desktop\DAB6기\윤석진_데이터톤파일 정리\7팀_데이터톤_사용데이터프레임\코디_분석_결과.csv"),
-]
-
-COLUMN_MAP = {
-    "유료아이템착용 개수": "paid_item_count",
-    "총 코디금액(원)": "total_cody_amount",
-    "착용코디금액(원)": "equipped_cody_amount",
-    "스페셜라벨 개수": "special_label_cnt",
-    "레드라벨 개수": "red_label_cnt",
-    "마스터라벨 개수": "master_label_cnt",
-    "일루전 링 개수": "illusion_ring_cnt",
-    "비싼 헤어(부티크, 마스터라벨) 유무": "premium_hair_flag",
-    "헤어 믹스염색 여부": "mix_hair_flag",
-    "헤어 믹스염색 비율": "mix_hair_ratio",
-    "성형 믹스염색 여부": "mix_face_flag",
-    "성형 믹스염색 비율": "mix_face_ratio",
-    "착용 아이템 리스트": "equipped_items",
-    "착용 헤어,성형,피부": "equipped_beauty",
-    "세분화 유저 그룹": "user_segment",
-}
-
-SEGMENT_ALIAS = {
-    "1. 유료 유저 (아이템 구매 지출)": "코디 유저",
-    "2. 무료/이벤트 유저 (뷰티 컨텐츠 지출)": "헤어/성형 유저",
-    "3. 순수 무료 유저 (지출 0원)": "무과금 유저",
-}
-
-
-@st.cache_data
-def load_cody_dataframe():
-    for path in DATA_CANDIDATES:
-        if path.exists():
-            df = pd.read_csv(path, encoding="utf-8").rename(columns=COLUMN_MAP)
-            df["user_segment"] = df["user_segment"].astype(str).str.strip()
-            df["segment_simple"] = df["user_segment"].map(SEGMENT_ALIAS).fillna("기타")
-
-            numeric_cols = [
-                "paid_item_count",
-                "total_cody_amount",
-                "equipped_cody_amount",
-                "special_label_cnt",
-                "red_label_cnt",
-                "master_label_cnt",
-                "illusion_ring_cnt",
-                "premium_hair_flag",
-                "mix_hair_flag",
-                "mix_hair_ratio",
-                "mix_face_flag",
-                "mix_face_ratio",
-            ]
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-            return df
-    st.error("코디 분석용 CSV 파일을 찾을 수 없습니다. 경로를 다시 확인해주세요.")
-    return pd.DataFrame()
-
-
-df = load_cody_dataframe()
+df, item_matrices, aggregates = load_cody_dataframe()
 
 if df.empty:
     st.stop()
@@ -82,22 +25,31 @@ if df.empty:
 st.sidebar.header("🎛️ 뷰티 소비 필터")
 segment_filter = st.sidebar.multiselect(
     "유저 타입",
-    options=df["segment_simple"].unique(),
-    default=df["segment_simple"].unique(),
+    options=aggregates.segments,
+    default=aggregates.segments,
     key="cody_segment_filter",
 )
 
-filtered_df = df[df["segment_simple"].isin(segment_filter)].copy()
+filtered_df = df[df["segment_simple"].isin(segment_filter)]
 
 if filtered_df.empty:
     st.warning("선택된 조건에 해당하는 유저가 없습니다.")
     st.stop()
 
+# 차트는 (세그먼트 조합, 선택한 지표·아이템, 원본 지문)별로 캐시하므로,
+# 같은 필터 상태로 돌아오면 figure를 다시 만들거나 직렬화하지 않습니다.
+segment_key = tuple(sorted(segment_filter))
+sources = [find_cody_path()]
+
+
+def segment_rows(segments):
+    # segments에 속한 행 (인덱스가 곧 아이템 행렬의 행 번호)
+    return df[df["segment_simple"].isin(segments)]
+
 st.markdown("---")
 st.subheader("1️⃣ 코디·뷰티 소비 타입 분포 (10/16)")
 segment_summary = (
-    filtered_df["segment_simple"]
-    .value_counts()
+    aggregates.segment_counts(segment_filter)
     .rename_axis("세그먼트")
     .reset_index(name="user_count")
 )
@@ -105,19 +57,24 @@ segment_summary["비중(%)"] = (
     segment_summary["user_count"] / segment_summary["user_count"].sum() * 100
 )
 
-col_a, col_b = st.columns([2, 1])
-with col_a:
+
+def segment_figure(segments):
     fig_segment = px.bar(
         segment_summary,
         x="세그먼트",
         y="user_count",
         color="세그먼트",
-        text=segment_summary["비중(%)"].apply(lambda v: f"{v:.1f}%"),
+        text=format_percent(segment_summary["비중(%)"]),
         title="코디 유저 vs 헤어/성형 유저 vs 무과금 유저 분포",
         labels={"user_count": "유저 수"},
     )
     fig_segment.update_traces(textposition="outside")
-    st.plotly_chart(fig_segment, use_container_width=True)
+    return fig_segment
+
+
+col_a, col_b = st.columns([2, 1])
+with col_a:
+    chart_section("cody_segment", segment_figure, segment_key, sources=sources)
 with col_b:
     st.dataframe(segment_summary, hide_index=True)
 
@@ -133,77 +90,81 @@ amount_col = (
     "total_cody_amount" if amount_metric == "총 코디 금액" else "equipped_cody_amount"
 )
 
-fig_amount = px.histogram(
-    filtered_df,
-    x=amount_col,
-    nbins=40,
-    color="segment_simple",
-    title=f"{amount_metric} 분포",
-    labels={amount_col: f"{amount_metric} (원)", "segment_simple": "세그먼트"},
-)
-fig_amount.update_layout(bargap=0.05)
-st.plotly_chart(fig_amount, use_container_width=True)
 
-amount_stats = filtered_df[amount_col].agg(
-    평균="mean", 중앙값="median", 최대="max", 상위10퍼센타일=lambda s: s.quantile(0.9)
-)
+
+def amount_figure(segments, amount_col, amount_metric):
+    fig_amount = histogram_figure(
+        segment_rows(segments),
+        x=amount_col,
+        nbins=40,
+        color="segment_simple",
+        title=f"{amount_metric} 분포",
+        labels={amount_col: f"{amount_metric} (원)", "segment_simple": "세그먼트"},
+    )
+    fig_amount.update_layout(bargap=0.05)
+    return fig_amount
+
+
+chart_section("cody_amount", amount_figure, segment_key, amount_col, amount_metric, sources=sources)
+
+amount_stats = aggregates.value_stats(amount_col, segment_filter).rename(
+    {"mean": "평균", 0.5: "중앙값", "max": "최대", 0.9: "상위10퍼센타일"}
+)[["평균", "중앙값", "최대", "상위10퍼센타일"]]
 st.caption("요약 통계 (원)")
 st.write(amount_stats.to_frame(name=amount_metric).style.format("{:,.0f}"))
 
 st.markdown("---")
 st.subheader("3️⃣ 코디 유저 라벨 아이템 착용 비율")
-cody_users = filtered_df[filtered_df["segment_simple"] == "코디 유저"]
-if cody_users.empty:
+if "코디 유저" not in segment_filter:
     st.info("선택한 조건에 코디 유저가 없습니다.")
 else:
-    label_metrics = pd.DataFrame(
-        {
-            "라벨 유형": [
-                "마스터라벨",
-                "레드+블랙라벨",
-                "스페셜라벨",
-            ],
-            "착용 비율(%)": [
-                (cody_users["master_label_cnt"] > 0).mean() * 100,
-                (cody_users["red_label_cnt"] > 0).mean() * 100,
-                (cody_users["special_label_cnt"] > 0).mean() * 100,
-            ],
-        }
-    )
-    fig_labels = px.bar(
-        label_metrics,
-        x="라벨 유형",
-        y="착용 비율(%)",
-        text=label_metrics["착용 비율(%)"].map(lambda v: f"{v:.1f}%"),
-        color="라벨 유형",
-        range_y=[0, 100],
-        title="코디 유저 착용 라벨 비율",
-    )
-    fig_labels.update_traces(textposition="outside")
-    st.plotly_chart(fig_labels, use_container_width=True)
+
+    def labels_figure():
+        cody_segment = ["코디 유저"]
+        label_metrics = pd.DataFrame(
+            {
+                "라벨 유형": [
+                    "마스터라벨",
+                    "레드+블랙라벨",
+                    "스페셜라벨",
+                ],
+                "착용 비율(%)": [
+                    aggregates.flag_ratio("master_label_users", segments=cody_segment),
+                    aggregates.flag_ratio("red_label_users", segments=cody_segment),
+                    aggregates.flag_ratio("special_label_users", segments=cody_segment),
+                ],
+            }
+        )
+        fig_labels = px.bar(
+            label_metrics,
+            x="라벨 유형",
+            y="착용 비율(%)",
+            text=format_percent(label_metrics["착용 비율(%)"]),
+            color="라벨 유형",
+            range_y=[0, 100],
+            title="코디 유저 착용 라벨 비율",
+        )
+        fig_labels.update_traces(textposition="outside")
+        return fig_labels
+
+    # 코디 유저만 집계하므로 세그먼트 필터와 관계없이 한 번만 만듭니다.
+    chart_section("cody_labels", labels_figure, sources=sources)
     st.caption("※ 블랙라벨 컬럼이 분리되어 있지 않아 레드라벨 수치를 대표값으로 사용했습니다.")
 
 st.markdown("---")
 st.subheader("4️⃣ 믹스 염색 · 렌즈 활용 및 커스텀 비율")
 
 # 믹스 사용 유저와 커스텀(50:50이 아닌 비율) 유저 비율 계산
-hair_mix_users = filtered_df[filtered_df["mix_hair_flag"] > 0]
-face_mix_users = filtered_df[filtered_df["mix_face_flag"] > 0]
-
 mix_stats = {
     # 전체 유저 기준 믹스 사용률
-    "헤어 믹스염색 사용률": (filtered_df["mix_hair_flag"] > 0).mean() * 100,
-    "성형 믹스렌즈 사용률": (filtered_df["mix_face_flag"] > 0).mean() * 100,
+    "헤어 믹스염색 사용률": aggregates.flag_ratio("hair_mix_users", segments=segment_filter),
+    "성형 믹스렌즈 사용률": aggregates.flag_ratio("face_mix_users", segments=segment_filter),
     # 믹스 사용자 중 50:50이 아닌 커스텀 비율 선택 유저 비중
-    "헤어 커스텀 믹스 비율": (
-        (hair_mix_users["mix_hair_ratio"] != 50).mean() * 100
-        if not hair_mix_users.empty
-        else 0
+    "헤어 커스텀 믹스 비율": aggregates.flag_ratio(
+        "hair_custom_mix_users", base="hair_mix_users", segments=segment_filter
     ),
-    "성형 커스텀 믹스 비율": (
-        (face_mix_users["mix_face_ratio"] != 50).mean() * 100
-        if not face_mix_users.empty
-        else 0
+    "성형 커스텀 믹스 비율": aggregates.flag_ratio(
+        "face_custom_mix_users", base="face_mix_users", segments=segment_filter
     ),
 }
 
@@ -236,3 +197,82 @@ st.markdown(
     """
 )
 
+if item_matrices:
+    st.markdown("---")
+    st.subheader("5️⃣ 착용 아이템 인기도 · 조합 분석")
+    item_kind = st.radio(
+        "아이템 종류",
+        options=list(item_matrices),
+        format_func=ITEM_COLUMNS.get,
+        horizontal=True,
+        key="cody_item_kind",
+    )
+    items = item_matrices[item_kind]
+    # filtered_df의 인덱스가 곧 행렬의 행 번호입니다.
+    selected_rows = filtered_df.index.to_numpy()
+
+    popular_items = items.popularity(selected_rows, top_n=20)
+
+    def popular_figure(segments, item_kind):
+        fig_popular = px.bar(
+            popular_items.iloc[::-1],
+            x="share",
+            y="item",
+            orientation="h",
+            text=format_percent(popular_items["share"].iloc[::-1]),
+            title=f"{ITEM_COLUMNS[item_kind]} 착용률 TOP 20",
+            labels={"share": "착용 유저 비율(%)", "item": "아이템"},
+        )
+        return fig_popular
+
+    chart_section("cody_popular", popular_figure, segment_key, item_kind, sources=sources)
+
+    anchor_item = st.selectbox(
+        "함께 착용한 아이템을 볼 기준 아이템",
+        options=popular_items["item"],
+        key="cody_item_anchor",
+    )
+    if anchor_item is not None:
+        worn_with = items.cooccurrence(anchor_item, selected_rows, top_n=15)
+        col_c, col_d = st.columns([2, 1])
+
+        def worn_with_figure(segments, item_kind, anchor_item):
+            return px.bar(
+                worn_with.iloc[::-1],
+                x="share",
+                y="item",
+                orientation="h",
+                text=format_percent(worn_with["share"].iloc[::-1]),
+                title=f"'{anchor_item}' 착용 유저가 함께 착용한 아이템",
+                labels={"share": "동시 착용 비율(%)", "item": "아이템"},
+            )
+
+        with col_c:
+            chart_section("cody_worn_with", worn_with_figure, segment_key, item_kind, anchor_item, sources=sources)
+        with col_d:
+            st.dataframe(worn_with.round(1), hide_index=True)
+
+    def segment_items_figure(segment_key, item_kind):
+        # 세그먼트 × 아이템 착용률: 상위 아이템만 잘라 세그먼트별 인원수로 나눕니다.
+        selected = segment_rows(segment_key)
+        segments = pd.Categorical(selected["segment_simple"])
+        segment_codes = pd.Series(-1, index=df.index)
+        segment_codes[selected.index] = segments.codes
+        by_segment = items.counts_by_group(segment_codes.to_numpy(), len(segments.categories))
+        top_codes = items.vocabulary.get_indexer(popular_items["item"])
+        segment_sizes = pd.Series(segments).value_counts().reindex(segments.categories).to_numpy()
+        segment_share = pd.DataFrame(
+            by_segment[:, top_codes] / segment_sizes[:, None] * 100,
+            index=segments.categories,
+            columns=popular_items["item"],
+        )
+        return px.imshow(
+            segment_share,
+            text_auto=".0f",
+            aspect="auto",
+            color_continuous_scale="Blues",
+            title="세그먼트별 상위 아이템 착용률(%)",
+            labels={"x": "아이템", "y": "세그먼트", "color": "착용률(%)"},
+        )
+
+    chart_section("cody_segment_items", segment_items_figure, segment_key, item_kind, sources=sources)
@@ -0,0 +1,104 @@
+# 파일 위치: pages/5_cody_growth_cross_analysis.py
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from chart_data import box_figure
+from cody_data import SEGMENT_ORDER, find_cody_path, load_cody_growth_join
+import sql_backend
+from utils import GROWTH_LOG_PATH, use_duckdb
+
+st.title("🔗 코디 소비 × 성장 교차 분석")
+st.markdown(
+    """
+    10/16 코디 스냅샷의 소비 세그먼트를 성장 로그와 ocid로 연결해
+    코디·뷰티 지출이 전투력과 주간 경험치 획득량과 어떤 관계가 있는지 살펴봅니다.
+    """
+)
+st.markdown("---")
+
+# --- 데이터 불러오기 ---
+# 두 데이터셋은 공용 ocid 사전(ocid_index.py)의 정수 id로 조인되어 캐시에 들어 있습니다.
+growth_df, weekly_df = load_cody_growth_join()
+
+if growth_df.empty:
+    st.stop()
+
+# --- 사이드바 (필터) ---
+st.sidebar.header("🗓️ 기준 시점 선택")
+available_dates = sorted(growth_df['date'].dropna().dt.strftime('%Y-%m-%d').unique(), reverse=True)
+selected_date = st.sidebar.selectbox(
+    "전투력 비교 기준 날짜:",
+    options=available_dates,
+    key='cross_power_date',
+)
+segments_present = [s for s in SEGMENT_ORDER if (growth_df['cody_segment'] == s).any()]
+
+# --- KPI ---
+snapshot_df = growth_df[growth_df['date'] == pd.Timestamp(selected_date)]
+col1, col2, col3 = st.columns(3)
+col1.metric("연결된 유저 수", f"{growth_df['ocid_id'].nunique():,} 명")
+col2.metric(f"{selected_date} 전투력 보유 유저", f"{snapshot_df['전투력'].notna().sum():,} 명")
+col3.metric("연결된 주간 기록", f"{len(weekly_df):,} 건")
+
+# Row 1: 세그먼트별 전투력 분포
+st.subheader(f"① 코디 소비 세그먼트별 전투력 분포 ({selected_date})")
+fig1 = box_figure(
+    snapshot_df.dropna(subset=['전투력']),
+    x='cody_segment',
+    y='전투력',
+    title='코디 소비 세그먼트별 전투력 분포',
+    labels={'cody_segment': '코디 세그먼트', '전투력': '전투력'},
+    category_order=segments_present,
+)
+st.plotly_chart(fig1, width='stretch')
+
+# Row 2: 세그먼트별 주간 경험치 획득량
+st.subheader("② 코디 소비 세그먼트별 주간 경험치 획득량")
+active_weeks = weekly_df[weekly_df['activity_status'] != '첫 주']
+weekly_gain_trend = (
+    active_weeks.groupby(['date', 'cody_segment'], observed=True)['weekly_exp_gain']
+    .mean()
+    .reset_index()
+)
+col_a, col_b = st.columns(2)
+with col_a:
+    fig2 = px.line(
+        weekly_gain_trend,
+        x='date',
+        y='weekly_exp_gain',
+        color='cody_segment',
+        markers=True,
+        category_orders={'cody_segment': segments_present},
+        title='세그먼트별 평균 주간 경험치 획득량 추이',
+        labels={'date': '날짜', 'weekly_exp_gain': '평균 주간 경험치 획득량', 'cody_segment': '코디 세그먼트'},
+    )
+    st.plotly_chart(fig2, width='stretch')
+with col_b:
+    fig3 = box_figure(
+        active_weeks[active_weeks['weekly_exp_gain'] > 0],
+        x='cody_segment',
+        y='weekly_exp_gain',
+        title='성장 주차의 주간 경험치 획득량 분포',
+        labels={'cody_segment': '코디 세그먼트', 'weekly_exp_gain': '주간 경험치 획득량'},
+        category_order=segments_present,
+    )
+    st.plotly_chart(fig3, width='stretch')
+
+# Row 3: 세그먼트 요약표
+st.subheader("③ 세그먼트 요약")
+if use_duckdb():
+    # DuckDB 백엔드에서는 성장 로그·활동 지표·코디 세그먼트를 SQL로 조인해 요약합니다.
+    segment_summary = sql_backend.segment_summary(GROWTH_LOG_PATH, find_cody_path(), selected_date).set_axis(
+        ['유저 수', '평균 전투력', '전투력 중앙값', '평균 주간 경험치', '성장 주차 비율(%)'], axis=1
+    ).reindex(segments_present).rename_axis('코디 세그먼트')
+else:
+    segment_summary = pd.DataFrame({
+        '유저 수': snapshot_df.groupby('cody_segment', observed=True)['ocid_id'].nunique(),
+        '평균 전투력': snapshot_df.groupby('cody_segment', observed=True)['전투력'].mean(),
+        '전투력 중앙값': snapshot_df.groupby('cody_segment', observed=True)['전투력'].median(),
+        '평균 주간 경험치': active_weeks.groupby('cody_segment', observed=True)['weekly_exp_gain'].mean(),
+        '성장 주차 비율(%)': active_weeks['activity_status'].eq('성장')
+            .groupby(active_weeks['cody_segment'], observed=True).mean() * 100,
+    }).reindex(segments_present).rename_axis('코디 세그먼트')
+st.dataframe(segment_summary.style.format('{:,.1f}'))
@@ -0,0 +1,108 @@
+# 파일 위치: pages/6_character_explorer.py
+
+import plotly.express as px
+import streamlit as st
+from character_index import load_character_index
+from sections import chart_section, lazy_section
+from utils import GROWTH_LOG_PATH
+
+# --- 대시보드 UI 구성 ---
+st.title("🔍 캐릭터 성장 궤적 탐색")
+st.markdown("---")
+
+# --- 데이터 불러오기 ---
+# 캐릭터 인덱스(character_index.py)는 한 번 만들어 모든 세션이 공유합니다.
+# 검색·궤적 조회는 인덱스에서 행 범위만 잘라 쓰므로 로그 전체를 다시 훑지 않습니다.
+index = load_character_index(GROWTH_LOG_PATH)
+if index is None:
+    st.stop()
+
+# --- 사이드바 (검색) ---
+st.sidebar.header("🔎 캐릭터 검색")
+query = st.sidebar.text_input("캐릭터 이름 (앞부분이나 일부만 입력해도 됩니다):", key='explorer_query')
+matches = index.search(query)
+if matches.empty:
+    st.info("검색 결과가 없습니다." if query.strip() else "👈 왼쪽 사이드바에서 캐릭터 이름을 검색하세요.")
+    st.stop()
+
+labels = {
+    row.ocid: f"{row.character_name} ({row.character_class}, Lv.{row.character_level:.0f})"
+    for row in matches.itertuples()
+}
+selected = st.sidebar.selectbox("검색 결과:", options=list(labels), format_func=labels.get, key='explorer_ocid')
+trajectory = index.trajectory(selected)
+profile = index.profiles.iloc[index.lookup(selected)]
+observed = trajectory.dropna(subset=['character_level'])
+
+# --- 1. 핵심 지표 (KPI) ---
+st.subheader(f"📈 {profile['character_name']} 성장 요약")
+col1, col2, col3 = st.columns(3)
+col1.metric("최근 레벨", f"{profile['character_level']:.0f}", f"+{profile['level_gain']:.2f} 레벨 (전체 기간)")
+if not observed.empty:
+    power = observed['전투력'].dropna()
+    if not power.empty:
+        col2.metric("최근 전투력", f"{power.iloc[-1]:,.0f}", f"{power.iloc[-1] - power.iloc[0]:+,.0f}")
+growing_weeks = (index.weekly_gains([selected])[selected] > 0).sum()
+col3.metric("성장 주차", f"{growing_weeks} / {len(index.dates) - 1} 주")
+st.markdown("---")
+
+# --- 2. 성장 궤적 ---
+# 캐릭터별 figure는 (ocid, 원본 지문)으로 캐시되어, 같은 캐릭터로 돌아오면 다시 만들지 않습니다.
+sources = [GROWTH_LOG_PATH]
+
+def progress_figure(ocid):
+    return px.line(
+        index.trajectory(ocid), x='date', y='progress', markers=True,
+        title='주차별 레벨 진행도 (레벨 + 경험치 비율)',
+        labels={'date': '날짜', 'progress': '레벨 진행도'},
+    )
+
+def power_figure(ocid):
+    return px.line(
+        index.trajectory(ocid), x='date', y='전투력', markers=True,
+        title='주차별 전투력 변화', labels={'date': '날짜', '전투력': '전투력'},
+    )
+
+col_left, col_right = st.columns(2)
+with col_left:
+    chart_section('explorer_progress', progress_figure, selected, sources=sources)
+with col_right:
+    chart_section('explorer_power', power_figure, selected, sources=sources)
+
+def render_trajectory_table():
+    st.dataframe(trajectory.drop(columns=['ocid']), hide_index=True)
+
+lazy_section("주차별 상세 기록 보기 (레벨·경험치·전투력·스탯)", render_trajectory_table, key='explorer_trajectory_table')
+st.markdown("---")
+
+# --- 3. 비슷한 성장 유저 ---
+# 주간 성장량 벡터의 코사인 유사도로 성장 패턴(언제 얼마나 비중 있게 성장했는지)이 비슷한 유저를 찾습니다.
+st.subheader("👥 성장 패턴이 비슷한 유저")
+k = st.slider("표시할 유저 수:", min_value=3, max_value=20, value=5, key='explorer_similar_k')
+similar = index.similar(selected, k)
+if similar.empty:
+    st.info("선택한 캐릭터는 기간 중 성장 기록이 없어 비교할 수 없습니다.")
+    st.stop()
+
+def similar_figure(ocid, k):
+    peers = index.similar(ocid, k)
+    cumulative = index.weekly_gains([ocid, *peers['ocid']]).cumsum()
+    names = dict(zip(index.profiles['ocid'], index.profiles['character_name']))
+    cumulative.columns = [f"{names[o]} (선택)" if o == ocid else names[o] for o in cumulative.columns]
+    long = cumulative.rename_axis('date').reset_index().melt(id_vars='date', var_name='캐릭터', value_name='누적 성장량')
+    return px.line(
+        long, x='date', y='누적 성장량', color='캐릭터', markers=True,
+        title='누적 레벨 상승폭 비교', labels={'date': '날짜', '누적 성장량': '누적 레벨 상승폭'},
+    )
+
+col3, col4 = st.columns([2, 3])
+with col3:
+    st.dataframe(
+        similar[['character_name', 'character_class', 'character_level', 'level_gain', 'similarity']].rename(columns={
+            'character_name': '캐릭터', 'character_class': '직업', 'character_level': '레벨',
+            'level_gain': '레벨 상승폭', 'similarity': '유사도',
+        }),
+        hide_index=True,
+    )
+with col4:
+    chart_section('explorer_similar', similar_figure, selected, k, sources=sources)
@@ -0,0 +1,96 @@
+# 파일 위치: pages/7_cohort_survival.py
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from cohort_survival import CHURN_WEEKS, COHORT_DIMENSIONS, EVENTS, MIN_COHORT_USERS, load_cohort_panel
+from sections import chart_section, lazy_section
+from utils import GROWTH_LOG_PATH
+
+# --- 대시보드 UI 구성 ---
+st.title("📉 코호트 리텐션 · 월드 리프 생존 분석")
+st.markdown("---")
+
+# --- 데이터 불러오기 ---
+# 유저 × 주차 패널(cohort_survival.py)은 한 번 만들어 모든 세션이 공유합니다.
+# 생존 곡선·리텐션은 패널의 유저 배열을 코호트 번호로 집계하므로, 기준을 바꿔도 로그를 다시 훑지 않습니다.
+panel = load_cohort_panel(GROWTH_LOG_PATH)
+if panel is None:
+    st.stop()
+
+# --- 사이드바 (분석 기준) ---
+st.sidebar.header("⚙️ 분석 기준")
+event = st.sidebar.radio(
+    "이탈 기준:", EVENTS, key='cohort_event',
+    help="월드 리프: 빈 행 뒤 처음 기록이 생긴 주(새 월드로 옮긴 주)를 이탈로 봅니다. "
+         f"성장 중단: 마지막 성장 이후 {CHURN_WEEKS}주 이상 성장 없이 기간이 끝나면 이탈로 봅니다.",
+)
+dimension = st.sidebar.selectbox("코호트 기준:", COHORT_DIMENSIONS, key='cohort_dimension')
+
+SUMMARY_COLUMNS = {
+    'cohort': '코호트', 'users': '유저 수', 'events': '이탈 유저 수', 'event_rate': '이탈 비율 (%)',
+    'median_weeks': '중앙 생존 주차', 'final_survival': '마지막 주 생존율 (%)',
+}
+
+# --- 1. 핵심 지표 (KPI) ---
+overall = panel.summary(event, '전체').iloc[0]
+st.subheader(f"📌 {event} 기준 요약")
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("분석 대상 유저", f"{overall['users']:,}명")
+col2.metric("이탈 유저", f"{overall['events']:,}명", f"{overall['event_rate']:.1f}%", delta_color='off')
+col3.metric("중앙 생존 주차", "50% 미도달" if pd.isna(overall['median_weeks']) else f"{overall['median_weeks']:.0f}주")
+col4.metric("마지막 주 생존율", f"{overall['final_survival']:.1f}%")
+st.markdown("---")
+
+# --- 2. 코호트별 생존 곡선 ---
+# figure는 (이탈 기준, 코호트 기준, 원본 지문)별로 캐시됩니다.
+sources = [GROWTH_LOG_PATH]
+
+def survival_figure(event, dimension, from_stagnation, title, x_label):
+    curves = panel.survival(event, dimension, from_stagnation, min_users=MIN_COHORT_USERS)
+    return px.line(
+        curves, x='week', y='survival', color='cohort', line_shape='hv', markers=True,
+        title=title, range_y=[0, 1.02], hover_data=['at_risk', 'events', 'lower', 'upper'],
+        labels={'week': x_label, 'survival': '생존율', 'cohort': '코호트', 'at_risk': '위험 집합', 'events': '이탈', 'lower': '95% 하한', 'upper': '95% 상한'},
+    )
+
+def retention_figure(dimension):
+    return px.imshow(
+        panel.retention(dimension), labels=dict(x="날짜", y="코호트", color="성장 유저 비율 (%)"),
+        title='코호트별 주차별 성장 유저 비율 (분모: 코호트 전체 인원)', aspect="auto",
+    )
+
+def render_summary(summary):
+    st.dataframe(summary.rename(columns=SUMMARY_COLUMNS).round(1), hide_index=True)
+
+x_label = '첫 주 이후 경과 주차' if event == '월드 리프' else '첫 기록 이후 경과 주차'
+st.subheader(f"① 코호트별 생존 곡선 (Kaplan–Meier, {event})")
+chart_section('cohort_survival', survival_figure, event, dimension, False, f'{dimension}별 {event} 생존 곡선', x_label, sources=sources)
+st.caption(f"유저가 {MIN_COHORT_USERS}명 미만인 코호트는 곡선에서 제외합니다. 중앙 생존 주차가 비어 있으면 기간 안에 생존율이 50% 아래로 내려가지 않은 것입니다.")
+render_summary(panel.summary(event, dimension))
+st.markdown("---")
+
+# --- 3. 코호트 리텐션 ---
+st.subheader("② 코호트 리텐션 (주차별 성장 유저 비율)")
+chart_section('cohort_retention', retention_figure, dimension, sources=sources)
+st.markdown("---")
+
+# --- 4. 레벨 정체 유저의 이탈 ---
+# 레벨 진행도 기준이라 활동 분석 페이지의 '정체'(주간 경험치 획득량 기준)와 구분해 '레벨 정체'로 표시합니다.
+# 월드 리프 유저는 리프 전 기록이 비어 있어 레벨 정체 이력을 알 수 없으므로, 성장 중단 기준으로만 계산합니다.
+st.subheader("③ 레벨 정체를 겪은 유저는 얼마나 버티다 떠나는가")
+st.caption(
+    f"처음 '레벨 정체'(직전 주와 이번 주 기록이 모두 있는데 레벨 진행도가 오르지 않음)를 겪은 주부터, "
+    f"다시 성장하지 않고 {CHURN_WEEKS}주 이상 이어지는 성장 중단까지의 생존 곡선입니다. "
+    "0주차의 하락은 첫 레벨 정체 이후 한 번도 다시 성장하지 않은 유저입니다. "
+    "활동 분석 페이지의 '정체'(주간 경험치 획득량이 0 이하)와는 기준이 다릅니다. "
+    "월드 리프 유저는 리프 전 기록이 없어 레벨 정체 이력을 알 수 없으므로 성장 중단 기준만 사용합니다."
+)
+chart_section(
+    'cohort_stagnation_survival', survival_figure, '성장 중단', dimension, True,
+    f'{dimension}별 첫 레벨 정체 이후 생존 곡선', '첫 레벨 정체 이후 경과 주차', sources=sources,
+)
+lazy_section(
+    "코호트별 레벨 정체 후 생존 요약 보기", lambda: render_summary(panel.summary('성장 중단', dimension, True)),
+    key='cohort_stagnation_table',
+)
@@ -0,0 +1,119 @@
+# 파일 위치: precompute.py
+"""
+대시보드 파생 데이터 일괄 사전 계산.
+
+페이지가 첫 요청 때 계산하던 파생 데이터(활동 큐브·길드 박스 통계, 날짜별 스냅샷 인덱스,
+코디 집계·성장 로그 조인, 캐릭터 인덱스, 코호트 패널, 스트리밍 모드의 성장 요약)를 프로세스 풀에서 병렬로 만들어
+버전별 아티팩트 디렉터리(artifacts.ARTIFACT_DIR)에 저장하고, 작업별 소요 시간을 출력합니다.
+페이지의 캐시된 로더(@artifact)는 아티팩트가 있으면 읽고, 없으면 기존처럼 직접 계산합니다.
+
+같은 입력을 쓰는 로더는 한 작업으로 묶어 같은 프로세스에서 실행하므로 중간 결과(마트, 스트리밍 집계)를 다시 만들지 않습니다.
+작업 전에 성장 로그 Arrow 스냅샷과 활동 마트를 한 번 갱신해, 워커들이 같은 파일을 동시에 쓰지 않게 합니다.
+
+    python precompute.py                  # 원본 지문이 같은 아티팩트가 있으면 건너뜁니다
+    python precompute.py --force --workers 4
+"""
+
+import argparse
+import importlib
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from artifacts import ARTIFACT_DIR
+from utils import GROWTH_LOG_PATH, read_growth_log, use_streaming
+
+
+def plan(file_path, cody_path):
+    """{작업 이름: [(아티팩트 로더 'module:function', 인자), ...]}. 현재 모드에서 페이지가 쓰는 것만 담습니다."""
+    streaming = use_streaming(file_path)
+    tasks = {
+        'activity': [
+            ('activity_mart:read_activity_cube', (file_path,)),
+            ('activity_mart:read_guild_gain_box_stats', (file_path,)),
+        ],
+        'character_index': [('character_index:read_character_index', (file_path,))],
+        'cohort_panel': [('cohort_survival:read_cohort_panel', (file_path,))],
+    }
+    if streaming:
+        tasks['growth_summary'] = [('growth_stream:read_growth_summary', (file_path,))]
+    else:
+        # 스트리밍 모드의 전투력 페이지는 선택한 주차만 읽어 인덱스를 만듭니다.
+        tasks['snapshot_index'] = [('snapshot_index:read_snapshot_layout', (file_path,))]
+    if cody_path is not None:
+        tasks['cody'] = [
+            ('cody_data:read_cody_derived', (cody_path,)),
+            ('cody_data:read_cody_growth_join', (file_path, cody_path)),
+        ]
+    return tasks
+
+
+def _loader(target):
+    module_name, attr = target.split(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_task(steps, force=False):
+    """steps의 아티팩트를 차례로 만들고 [(아티팩트 이름, 초, 바이트 또는 None(건너뜀))]를 반환합니다."""
+    results = []
+    for target, args in steps:
+        loader = _loader(target)
+        if not force and loader.artifact_path(*args).exists():
+            results.append((loader.artifact_name, 0.0, None))
+            continue
+        start = time.perf_counter()
+        path = loader.precompute(*args)
+        results.append((loader.artifact_name, time.perf_counter() - start, path.stat().st_size))
+    return results
+
+
+def prepare(file_path):
+    """워커들이 공유하는 디스크 캐시(성장 로그 스냅샷, 활동 마트)를 먼저 갱신합니다."""
+    from activity_mart import update_activity_mart
+
+    if not use_streaming(file_path):
+        read_growth_log(file_path, shared=False)
+    update_activity_mart(file_path)
+
+
+def precompute(file_path=GROWTH_LOG_PATH, cody_path=None, workers=None, force=False):
+    """모든 작업을 병렬로 실행하고 {작업 이름: [(아티팩트 이름, 초, 바이트)]}를 반환합니다."""
+    from cody_data import find_cody_path
+
+    tasks = plan(file_path, cody_path or find_cody_path())
+    prepare(file_path)
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn')) as pool:
+        futures = {pool.submit(run_task, steps, force): name for name, steps in tasks.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file_path', nargs='?', default=GROWTH_LOG_PATH)
+    parser.add_argument('--cody', default=None, help='코디 분석 CSV (기본: cody_data.find_cody_path)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: 작업 수와 CPU 수 중 작은 값)')
+    parser.add_argument('--force', action='store_true', help='아티팩트가 있어도 다시 만듭니다')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = precompute(args.file_path, args.cody, workers=args.workers, force=args.force)
+    wall = time.perf_counter() - start
+
+    print(f"아티팩트 위치: {ARTIFACT_DIR}")
+    print(f"{'작업':<16} {'아티팩트':<22} {'초':>8} {'MB':>9}")
+    total = 0.0
+    for name, steps in sorted(results.items()):
+        for artifact_name, seconds, nbytes in steps:
+            total += seconds
+            size = '건너뜀' if nbytes is None else f"{nbytes / 1024 ** 2:,.1f}"
+            print(f"{name:<16} {artifact_name:<22} {seconds:>8.2f} {size:>9}")
+    print(f"작업 시간 합계 {total:.2f}s, 전체 경과 {wall:.2f}s (준비 단계 포함)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# 파일 위치: prewarm.py
+"""
+차트 JSON 미리 만들기.
+
+페이지 1~4를 헤드리스(AppTest)로 기본 필터 상태와 날짜별 상태로 한 번씩 실행해
+chart_section이 만든 FigureSpec(직렬화된 plotly JSON)을 저장소(sections.FIGURE_STORE)에 게시합니다.
+서버 워커는 메모리 캐시에 없는 차트를 이 저장소에서 읽으므로, 자주 쓰는 상태는 첫 요청부터
+pandas·plotly 작업 없이 그려집니다. 저장소 파일 이름은 (차트 키, 필터 상태, 계산 방식, 원본 지문)의 해시라
+원본이나 로딩 모드·집계 엔진이 바뀌면 자연히 쓰이지 않고, 다음 게시 때 통째로 교체됩니다.
+
+    python prewarm.py              # 원본 지문이 바뀌었을 때만 다시 만듭니다
+    python prewarm.py --force
+
+PREWARM_FIGURES=on이면 서버 프로세스가 랜딩 페이지를 처음 실행할 때 이 작업을 백그라운드 프로세스로 한 번 띄웁니다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from sections import FIGURE_CACHE, FIGURE_STORE, store_path
+
+ROOT = Path(__file__).resolve().parent
+PREWARM_FIGURES = os.environ.get('PREWARM_FIGURES', 'off')
+MANIFEST_FILE = 'manifest.json'
+
+# 페이지 -> 미리 만들 상태
+# expand: 펼쳐 둘 지연 섹션 키, per_date: 선택지마다 한 번씩 실행할 날짜 선택 상자 키
+PAGES = {
+    'pages/1_simpleboard_maplestory.py': {},
+    'pages/2_activity_analysis.py': {'expand': ['activity_level_animation']},
+    'pages/3_stat_analysis.py': {'per_date': 'stat_selected_date'},
+    'pages/4_cody_fashion_analysis.py': {},
+}
+
+_STARTED = False
+_START_LOCK = threading.Lock()
+
+
+def source_fingerprints():
+    """저장소가 기준으로 삼는 원본 파일 지문 {경로: 지문}과 계산 방식('variant': [로딩 모드, 집계 엔진, 스키마 버전])."""
+    from cody_data import find_cody_path
+    from utils import GROWTH_LOG_PATH, derivation_variant, source_fingerprint
+
+    paths = [GROWTH_LOG_PATH, find_cody_path()]
+    fingerprints = {path: source_fingerprint(path) for path in paths if path is not None}
+    fingerprints['variant'] = list(derivation_variant(GROWTH_LOG_PATH))
+    return fingerprints
+
+
+def is_current(store=FIGURE_STORE):
+    try:
+        manifest = json.loads((store / MANIFEST_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return False
+    return manifest == source_fingerprints()
+
+
+def run_page(page, expand=(), per_date=None):
+    """page를 기본 상태로 (per_date가 있으면 날짜 선택지마다) 실행합니다. 실행된 상태 수를 반환합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / page), default_timeout=600)
+    for key in expand:
+        app.session_state[key] = True
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].value}")
+    if per_date is None:
+        return 1
+    dates = app.selectbox(key=per_date)
+    for index in range(1, len(dates.options)):
+        app.selectbox(key=per_date).select_index(index)
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"{page} ({dates.options[index]}): {app.exception[0].value}")
+    return len(dates.options)
+
+
+def prewarm(store=FIGURE_STORE):
+    """PAGES의 모든 상태를 실행하고, 만들어진 FigureSpec을 store에 게시합니다. 게시한 차트 수를 반환합니다."""
+    from cache import get_cache
+
+    # 실행 중 만든 차트가 축출되지 않도록 이 프로세스의 캐시는 넉넉히 잡습니다.
+    cache = get_cache(FIGURE_CACHE, max_entries=100_000)
+    fingerprints = source_fingerprints()
+    for page, states in PAGES.items():
+        print(f"{page}: 상태 {run_page(page, **states)}개")
+
+    tmp_dir = store.with_name(f"{store.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    specs = cache.items()
+    for cache_key, spec in specs:
+        store_path(cache_key, tmp_dir).write_text(spec.dumps(), encoding='utf-8')
+    (tmp_dir / MANIFEST_FILE).write_text(json.dumps(fingerprints, ensure_ascii=False), encoding='utf-8')
+    shutil.rmtree(store, ignore_errors=True)
+    os.replace(tmp_dir, store)
+    return len(specs)
+
+
+def start_prewarm():
+    """PREWARM_FIGURES=on이면 프로세스당 한 번 prewarm.py를 백그라운드 프로세스로 띄웁니다."""
+    global _STARTED
+    if PREWARM_FIGURES != 'on':
+        return
+    with _START_LOCK:
+        if _STARTED:
+            return
+        _STARTED = True
+    subprocess.Popen(
+        [sys.executable, str(ROOT / 'prewarm.py')],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--force', action='store_true', help='원본 지문이 같아도 다시 만듭니다')
+    args = parser.parse_args()
+
+    if not args.force and is_current():
+        print(f"최신 상태입니다: {FIGURE_STORE}")
+        return
+    print(f"게시: {prewarm()}개 차트 -> {FIGURE_STORE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# 파일 위치: ranking.py
+"""
+스탯별 리더보드(TOP K)와 순위 조회 도구.
+
+- top_k_indices: 일회성 TOP K는 전체 정렬 없이 np.partition으로 K개만 골라 정렬합니다.
+- Leaderboard: 만들 때는 top_k_indices로 상위 TOP_K개 위치만 구해 두고,
+  그룹별(직업, 레벨 구간 등) TOP K는 해당 그룹의 행만 정렬해 뽑습니다.
+  "이 값이면 몇 위인가"를 묻는 첫 조회 때에만 값 전체를 정렬해 두고 이진 탐색으로 답합니다.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+RANKED_STATS = ['전투력', '보스_데미지', '방어율_무시', '아케인포스', '스타포스']
+# Leaderboard가 미리 구해 두는 상위 위치 개수 (이보다 큰 K는 호출 때 다시 고릅니다)
+TOP_K = 100
+
+
+def top_k_indices(values, k):
+    """values에서 큰 값 K개의 위치를 내림차순으로 반환합니다. NaN은 제외합니다."""
+    values = np.asarray(values, dtype='float64')
+    candidates = np.flatnonzero(~np.isnan(values))
+    if k <= 0:
+        return candidates[:0]
+    if len(candidates) > k:
+        # 부분 선택: K번째로 큰 값만 선형 시간에 찾고, 그보다 큰 값과 (동점은 앞선 위치부터) 남은 자리만 고릅니다.
+        # 동점 처리가 전체 안정 정렬과 같으므로 결과도 전체 정렬의 앞 K개와 같습니다.
+        picked = values[candidates]
+        kth = -np.partition(-picked, k - 1)[k - 1]
+        above = candidates[picked > kth]
+        candidates = np.concatenate([above, candidates[picked == kth][:k - len(above)]])
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+
+@dataclass(frozen=True)
+class Leaderboard:
+    values: np.ndarray | None  # 원본 행 순서의 스탯 값 (float64, 결측은 NaN). 아티팩트에서는 None
+    leaders: np.ndarray        # 상위 TOP_K개 행의 위치 (내림차순, 동점은 앞선 위치부터)
+
+    @classmethod
+    def build(cls, values, k=TOP_K):
+        values = np.asarray(values, dtype='float64')
+        return cls(values=values, leaders=top_k_indices(values, k))
+
+    def top(self, k):
+        if k <= len(self.leaders) or len(self.leaders) == len(self):
+            return self.leaders[:k]
+        return top_k_indices(self.values, k)
+
+    def top_by_group(self, codes, k):
+        """
+        그룹 코드(codes, 원본 행 순서, 음수는 제외)별 TOP K 위치를 한 번에 구합니다.
+        반환값은 전체 내림차순(동점은 앞선 위치부터)이므로 그룹별로 잘라도 순위 순서 그대로입니다.
+        """
+        codes = np.asarray(codes)
+        candidates = np.flatnonzero((codes >= 0) & ~np.isnan(self.values))
+        # 고른 행만 (그룹, 값 내림차순, 위치) 순으로 정렬하고 그룹마다 앞의 K개를 남깁니다.
+        ordered = candidates[np.lexsort((-self.values[candidates], codes[candidates]))]
+        ordered_codes = codes[ordered]
+        group_starts = np.flatnonzero(np.r_[True, ordered_codes[1:] != ordered_codes[:-1]])
+        position_in_group = np.arange(len(ordered)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(ordered)]))
+        kept = np.sort(ordered[position_in_group < k])
+        return kept[np.argsort(-self.values[kept], kind='stable')]
+
+    @cached_property
+    def _negated_sorted(self):
+        # 순위 조회가 처음 요청될 때 한 번만 정렬합니다. (-값 오름차순 = 값 내림차순)
+        return np.sort(-self.values[~np.isnan(self.values)])
+
+    def rank(self, value):
+        """value보다 큰 값의 개수 + 1 (동점은 같은 순위). 값이 없으면 None."""
+        if value is None or np.isnan(value):
+            return None
+        return int(np.searchsorted(self._negated_sorted, -value, side='left')) + 1
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.values)))
+
+
+def stat_values(frame, stat):
+    """frame의 stat 컬럼을 float64 배열로 (결측은 NaN)."""
+    return frame[stat].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def build_leaderboards(frame, stats=RANKED_STATS):
+    """frame의 각 스탯 컬럼에 대한 Leaderboard를 만듭니다."""
+    return {stat: Leaderboard.build(stat_values(frame, stat)) for stat in stats}
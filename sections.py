@@ -0,0 +1,106 @@
+# 파일 위치: sections.py
+"""
+페이지 섹션 지연 실행 도구.
+
+- chart_section: 차트 생성 함수 결과를 브라우저로 보내는 plotly JSON(FigureSpec)으로 직렬화해
+  (차트 키, 필터 상태, 계산 방식, 원본 파일 지문) 단위로 공용 LRU 캐시에 저장해 두고 그립니다.
+  같은 필터 상태의 재실행에서는 pandas·plotly 작업 없이 저장된 JSON을 그대로 보냅니다.
+  메모리 캐시에 없으면 prewarm.py가 미리 만들어 둔 저장소(.cache/figures)를 확인합니다.
+- lazy_section: expander가 펼쳐져 있을 때만 render()를 실행합니다. 접힌 섹션은 계산도,
+  브라우저 전송도 하지 않습니다.
+
+차트 키는 페이지 접두어로 시작하므로(simpleboard_, activity_, stat_ ...) 페이지 간에 겹치지 않습니다.
+랜딩 페이지에서도 쓰이므로 pandas·plotly 같은 무거운 모듈은 이 파일에서 임포트하지 않습니다.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+# 차트 JSON 캐시 (필터 조합별로 쌓이므로 항목 수로 제한합니다)
+FIGURE_CACHE = 'figure_specs'
+FIGURE_CACHE_ENTRIES = 256
+# prewarm.py가 게시하는 미리 만든 차트 JSON 저장소
+FIGURE_STORE = Path('.cache') / 'figures'
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    json: str           # 브라우저로 보내는 plotly figure JSON
+    digest: str         # json의 해시 (차트 요소 ID 계산용)
+    height: int | None  # layout.height (없으면 None)
+    points: int         # 첫 trace의 점 개수 (표본 안내 문구용)
+
+    @classmethod
+    def from_figure(cls, fig):
+        import plotly.io
+
+        spec = plotly.io.to_json(fig, validate=False)
+        x = getattr(fig.data[0], 'x', None) if fig.data else None
+        points = 0 if x is None else len(x)
+        return cls(spec, hashlib.md5(spec.encode('utf-8')).hexdigest(), fig.layout.height, points)
+
+    def dumps(self):
+        """저장소 파일 형식: 첫 줄은 메타 JSON, 나머지는 figure JSON."""
+        return json.dumps({'digest': self.digest, 'height': self.height, 'points': self.points}) + '\n' + self.json
+
+    @classmethod
+    def loads(cls, text):
+        header, spec = text.split('\n', 1)
+        return cls(json=spec, **json.loads(header))
+
+
+def store_path(cache_key, store=FIGURE_STORE):
+    """(차트 키, 필터 상태, 계산 방식, 원본 지문들) 캐시 키에 대응하는 저장소 파일 경로."""
+    return store / f"{hashlib.sha1(repr(cache_key).encode('utf-8')).hexdigest()}.spec"
+
+
+def _stored_spec(cache_key):
+    try:
+        return FigureSpec.loads(store_path(cache_key).read_text(encoding='utf-8'))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def section_spec(key, build, *deps, sources=()):
+    """build(*deps)로 만든 figure의 FigureSpec을 (key, deps, 원본 지문)별로 캐시해 반환합니다. deps는 해시 가능해야 합니다."""
+    from cache import memoize
+    from utils import derivation_variant, source_fingerprint  # utils는 pandas를 임포트하므로 호출 시점에 가져옵니다.
+
+    # 계산 방식(로딩 모드·집계 엔진)이 다른 프로세스가 게시한 차트를 쓰지 않도록 키에 넣습니다.
+    memo_key = (key, deps, derivation_variant())
+
+    def compute():
+        cache_key = (memo_key, tuple(source_fingerprint(path) for path in sources))
+        return _stored_spec(cache_key) or FigureSpec.from_figure(build(*deps))
+
+    return memoize(FIGURE_CACHE, memo_key, compute, sources=sources, max_entries=FIGURE_CACHE_ENTRIES)
+
+
+def render_spec(spec):
+    """
+    FigureSpec을 st.plotly_chart(width='stretch')로 그립니다.
+    figure 객체 대신 저장된 JSON을 푼 dict를 넘기므로, 캐시 적중 시 plotly figure를 만들거나
+    검증하는 비용 없이 공개 API만으로 그립니다.
+    """
+    st.plotly_chart(json.loads(spec.json), width='stretch')
+
+
+def chart_section(key, build, *deps, sources=()):
+    """section_spec 결과를 그리고 FigureSpec을 반환합니다."""
+    spec = section_spec(key, build, *deps, sources=sources)
+    render_spec(spec)
+    return spec
+
+
+def lazy_section(label, render, key, expanded=False):
+    """
+    펼쳤을 때만 render()를 실행하는 expander. 펼침 상태는 st.session_state[key]에 남습니다.
+    """
+    with st.expander(label, expanded=expanded, key=key, on_change='rerun') as container:
+        if container.open:
+            render()
+    return container
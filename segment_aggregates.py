@@ -0,0 +1,103 @@
+# 파일 위치: segment_aggregates.py
+"""
+세그먼트별 부분 집계 엔진.
+
+로드 시점에 한 번의 groupby 패스로 세그먼트별 인원수, 조건(플래그) 만족 인원수,
+수치 컬럼의 합·최댓값·값 분포 스케치를 만들어 둡니다. 세그먼트를 어떻게 골라도
+선택된 세그먼트의 부분 집계만 합쳐서 답하므로 행을 다시 훑지 않습니다.
+
+값 분포 스케치는 (값, 개수) 표입니다. 코디 금액처럼 값 종류가 적은 컬럼은 정확한
+분위수를 그대로 재현하고, 값 종류가 SKETCH_MAX_VALUES를 넘으면 유효숫자 3자리로
+반올림해 크기를 제한합니다. (상대 오차 0.5% 이내)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SKETCH_MAX_VALUES = 4096
+
+
+def _round_significant(values, digits=3):
+    magnitude = np.floor(np.log10(np.abs(np.where(values == 0, 1, values))))
+    scale = 10.0 ** (digits - 1 - magnitude)
+    return np.round(values * scale) / scale
+
+
+def weighted_quantile(values, counts, q):
+    """정렬된 고유값과 개수로 pandas 기본(선형 보간) 분위수를 계산합니다."""
+    n = counts.sum()
+    if n == 0:
+        return np.nan
+    position = (n - 1) * q
+    cumulative = np.cumsum(counts)
+    low = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+    high = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+    return low + (high - low) * (position - np.floor(position))
+
+
+@dataclass(frozen=True)
+class SegmentAggregates:
+    counts: pd.DataFrame     # index: 세그먼트, columns: 'users' + 플래그별 인원수
+    sums: pd.DataFrame       # index: 세그먼트, columns: 수치 컬럼 합계
+    maxima: pd.DataFrame     # index: 세그먼트, columns: 수치 컬럼 최댓값
+    sketches: dict           # 수치 컬럼 -> DataFrame(segment, value, count)
+
+    @property
+    def segments(self):
+        return self.counts.index
+
+    def _selected(self, segments):
+        return self.segments if segments is None else self.segments.intersection(pd.Index(segments), sort=False)
+
+    def segment_counts(self, segments=None):
+        """선택된 세그먼트별 인원수 (내림차순)."""
+        return self.counts.loc[self._selected(segments), 'users'].sort_values(ascending=False, kind='stable')
+
+    def flag_counts(self, segments=None):
+        """선택된 세그먼트를 합친 users·플래그 인원수 Series."""
+        return self.counts.loc[self._selected(segments)].sum()
+
+    def flag_ratio(self, flag, base='users', segments=None):
+        """플래그 인원수 / base 인원수 × 100. base가 0명이면 0입니다."""
+        merged = self.flag_counts(segments)
+        return merged[flag] / merged[base] * 100 if merged[base] else 0
+
+    def value_stats(self, column, segments=None, quantiles=(0.5, 0.9)):
+        """선택된 세그먼트를 합친 수치 컬럼의 평균, 분위수, 최댓값."""
+        selected = self._selected(segments)
+        sketch = self.sketches[column]
+        merged = sketch[sketch['segment'].isin(selected)].groupby('value', sort=True)['count'].sum()
+        values, counts = merged.index.to_numpy(dtype='float64'), merged.to_numpy()
+        n = counts.sum()  # 결측을 뺀 행 수
+        stats = {'mean': self.sums.loc[selected, column].sum() / n if n else np.nan}
+        stats.update({q: weighted_quantile(values, counts, q) for q in quantiles})
+        stats['max'] = self.maxima.loc[selected, column].max()
+        return pd.Series(stats)
+
+
+def build_segment_aggregates(df, by, flags=None, value_columns=()):
+    """
+    df를 by 컬럼 기준으로 한 번만 그룹화해 부분 집계를 만듭니다.
+    flags는 {이름: df -> 불리언 Series} 형태로, 조건을 만족하는 인원수를 셉니다.
+    """
+    indicators = pd.DataFrame({'users': np.ones(len(df), dtype='int64')}, index=df.index)
+    for name, predicate in (flags or {}).items():
+        indicators[name] = predicate(df).to_numpy().astype('int64')
+    indicators[list(value_columns)] = df[list(value_columns)]
+
+    grouped = indicators.groupby(df[by], sort=False)
+    counts = grouped[['users', *(flags or {})]].sum()
+    sums = grouped[list(value_columns)].sum()
+    maxima = grouped[list(value_columns)].max()
+
+    sketches = {}
+    for column in value_columns:
+        values = df[column].to_numpy(dtype='float64')
+        if pd.unique(values).size > SKETCH_MAX_VALUES:
+            values = _round_significant(values)
+        sketch = pd.DataFrame({'segment': df[by].to_numpy(), 'value': values}).dropna(subset=['value'])
+        sketches[column] = sketch.groupby(['segment', 'value'], sort=True).size().rename('count').reset_index()
+
+    return SegmentAggregates(counts=counts, sums=sums, maxima=maxima, sketches=sketches)
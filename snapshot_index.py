@@ -0,0 +1,185 @@
+# 파일 위치: snapshot_index.py
+"""
+전투력 분석 페이지용 날짜별 스냅샷 인덱스.
+
+성장 로그를 날짜 순으로 한 번 정렬해 두고 날짜 → 행 범위(start, stop)를 기록하며,
+날짜별 KPI(평균/최고/상위 1% 전투력), 직업 분포, 스탯별 리더보드(ranking.py)를 미리 계산합니다.
+날짜를 바꿀 때는 조회만 하면 되므로 전체 로그를 다시 훑지 않습니다.
+
+아티팩트에는 프레임과 리더보드의 스탯 값을 뺀 인덱스(정렬 위치, 날짜별 행 범위, 집계, 상위 위치)만 저장하고,
+읽을 때 메모리 매핑된 성장 로그 스냅샷에 다시 붙입니다. (detach_frame / attach_frame)
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from artifacts import artifact
+from cache import cached
+from ranking import RANKED_STATS, build_leaderboards, stat_values
+from utils import LEVEL_BINS, LEVEL_LABELS, read_growth_log
+
+RANKING_COLUMNS = ['character_name', 'character_class', 'character_level']
+TOP_N = 20
+
+
+@dataclass(frozen=True)
+class SnapshotIndex:
+    frame: pd.DataFrame | None   # 날짜 순으로 정렬된 성장 로그 (같은 날짜 안에서는 원본 순서 유지). 아티팩트에서는 None
+    order: np.ndarray | None     # frame 행별 원본 로그의 행 위치 (원본이 이미 날짜 순이면 None)
+    ranges: dict                 # 'YYYY-MM-DD' -> (start, stop)
+    kpis: pd.DataFrame           # index: 'YYYY-MM-DD', columns: avg_power, max_power, p99_power
+    class_counts: dict           # 'YYYY-MM-DD' -> 직업별 인원수 (내림차순 Series)
+    leaderboards: dict           # 'YYYY-MM-DD' -> {스탯: Leaderboard} (위치는 해당 날짜 구간 기준)
+    class_codes: np.ndarray      # frame 행별 직업 코드 (결측은 -1)
+    level_codes: np.ndarray      # frame 행별 레벨 구간 코드 (LEVEL_LABELS 기준, 결측은 -1)
+
+    @property
+    def dates(self):
+        """최신 날짜가 먼저 오도록 정렬된 날짜 목록."""
+        return sorted(self.ranges, reverse=True)
+
+    def snapshot(self, date):
+        """해당 날짜의 행들을 복사 없이 연속 구간으로 반환합니다. 없는 날짜면 빈 프레임입니다."""
+        start, stop = self.ranges.get(date, (0, 0))
+        return self.frame.iloc[start:stop]
+
+    def _group_codes(self, date, character_class=None, level_range=None):
+        start, stop = self.ranges[date]
+        match = np.ones(stop - start, dtype=bool)
+        if character_class is not None:
+            categories = self.frame['character_class'].cat.categories
+            code = categories.get_loc(character_class) if character_class in categories else -2
+            match &= self.class_codes[start:stop] == code
+        if level_range is not None:
+            match &= self.level_codes[start:stop] == LEVEL_LABELS.index(level_range)
+        return np.where(match, 0, -1)
+
+    def ranking(self, date, stat='전투력', top_n=TOP_N, character_class=None, level_range=None):
+        """해당 날짜의 stat TOP N 프레임 (인덱스는 1부터 시작하는 순위). 직업·레벨 구간으로 좁힐 수 있습니다."""
+        board = self.leaderboards[date][stat]
+        if character_class is None and level_range is None:
+            positions = board.top(top_n)
+        else:
+            positions = board.top_by_group(self._group_codes(date, character_class, level_range), top_n)
+        columns = RANKING_COLUMNS + [stat]
+        ranking = self.snapshot(date)[columns].iloc[positions]
+        ranking.index = range(1, len(ranking) + 1)
+        return ranking
+
+    def leaders_by_class(self, date, stat='전투력'):
+        """직업별 1위를 한 번의 패스로 구해 stat 내림차순으로 반환합니다."""
+        start, stop = self.ranges[date]
+        positions = self.leaderboards[date][stat].top_by_group(self.class_codes[start:stop], 1)
+        leaders = self.snapshot(date)[['character_class', 'character_name', 'character_level', stat]].iloc[positions]
+        return leaders.reset_index(drop=True)
+
+    def character_rank(self, date, character_name, stat='전투력'):
+        """캐릭터 이름으로 해당 날짜의 stat 순위와 값을 찾습니다. 없으면 (None, None)."""
+        snapshot = self.snapshot(date)
+        matches = np.flatnonzero((snapshot['character_name'] == character_name).fillna(False).to_numpy())
+        if len(matches) == 0:
+            return None, None
+        board = self.leaderboards[date][stat]
+        value = board.values[matches[0]]
+        return board.rank(value), value
+
+
+def _date_order(df):
+    """날짜 순(결측은 맨 뒤, 같은 날짜 안에서는 원본 순서)으로 정렬하는 행 위치. 이미 정렬돼 있으면 None."""
+    codes = pd.factorize(df['date'], sort=True)[0]
+    codes = np.where(codes < 0, codes.max(initial=-1) + 1, codes)
+    if (np.diff(codes) >= 0).all():
+        return None
+    return np.argsort(codes, kind='stable')
+
+
+def detach_frame(index):
+    """아티팩트용: 프레임과, 프레임에서 다시 읽을 수 있는 리더보드 스탯 값을 뺀 SnapshotIndex."""
+    leaderboards = {
+        date: {stat: replace(board, values=None) for stat, board in boards.items()}
+        for date, boards in index.leaderboards.items()
+    }
+    return replace(index, frame=None, leaderboards=leaderboards)
+
+
+def attach_frame(index, df):
+    """detach_frame한 SnapshotIndex에 원본 로그 df를 정렬 위치대로 붙입니다. 이미 날짜 순이면 프레임을 복사하지 않습니다."""
+    frame = (df if index.order is None else df.take(index.order)).reset_index(drop=True)
+    leaderboards = {
+        date: {
+            stat: replace(board, values=stat_values(frame.iloc[start:stop], stat))
+            for stat, board in index.leaderboards[date].items()
+        }
+        for date, (start, stop) in index.ranges.items()
+    }
+    return replace(index, frame=frame, leaderboards=leaderboards)
+
+
+def build_snapshot_index(df):
+    order = _date_order(df)
+    frame = (df if order is None else df.take(order)).reset_index(drop=True)
+    date_keys = frame['date'].dt.strftime('%Y-%m-%d')
+
+    # 정렬된 날짜 키에서 값이 바뀌는 경계만 찾으면 날짜별 행 범위가 됩니다.
+    keys = date_keys.to_numpy()
+    valid = date_keys.notna().to_numpy()
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate([[0], boundaries])
+    stops = np.concatenate([boundaries, [len(frame)]])
+    ranges = {keys[s]: (int(s), int(e)) for s, e in zip(starts, stops) if len(frame) and valid[s]}
+
+    grouped = frame.groupby(date_keys, sort=True)['전투력']
+    kpis = pd.DataFrame({
+        'avg_power': grouped.mean(),
+        'max_power': grouped.max(),
+        'p99_power': grouped.quantile(0.99),
+    })
+
+    class_counts = {
+        date: frame['character_class'].iloc[start:stop].value_counts().loc[lambda s: s > 0]
+        for date, (start, stop) in ranges.items()
+    }
+
+    leaderboards = {
+        date: build_leaderboards(frame.iloc[start:stop], RANKED_STATS)
+        for date, (start, stop) in ranges.items()
+    }
+    class_codes = frame['character_class'].cat.codes.to_numpy()
+    level_codes = pd.cut(frame['character_level'], bins=LEVEL_BINS, labels=False, right=False)
+    level_codes = np.nan_to_num(level_codes.to_numpy(dtype='float64'), nan=-1).astype('int8')
+
+    return SnapshotIndex(
+        frame=frame,
+        order=order,
+        ranges=ranges,
+        kpis=kpis,
+        class_counts=class_counts,
+        leaderboards=leaderboards,
+        class_codes=class_codes,
+        level_codes=level_codes,
+    )
+
+
+# 날짜별 행 범위와 KPI·랭킹은 한 번만 계산해 두고, 읽기 전용으로 모든 세션이 공유합니다.
+# precompute.py가 만든 아티팩트가 있으면 계산 없이 읽고, 프레임은 성장 로그 스냅샷에서 붙입니다.
+@artifact('snapshot_index', sources=lambda file_path: [file_path])
+def read_snapshot_layout(file_path):
+    """프레임을 뺀 SnapshotIndex (아티팩트에 저장하는 부분)."""
+    return detach_frame(build_snapshot_index(read_growth_log(file_path)))
+
+
+@cached('snapshot_index', max_entries=1, sources=lambda file_path: [file_path])
+def read_snapshot_index(file_path):
+    return attach_frame(read_snapshot_layout(file_path), read_growth_log(file_path))
+
+
+def load_snapshot_index(file_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 None을 반환합니다."""
+    try:
+        return read_snapshot_index(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return None
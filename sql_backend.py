@@ -0,0 +1,418 @@
+# 파일 위치: sql_backend.py
+"""
+임베디드 DuckDB 질의 백엔드.
+
+성장 로그·코디 스냅샷·후보 유저 CSV를 파일 기반 DuckDB(.cache/dashboard.duckdb, 서버 없음)에
+적재하고, 페이지 집계(활동 추이 큐브, 정체 구간, 날짜별 전투력 KPI·주차 스냅샷, 직업 분포,
+후보 유저 레벨 분포, 세그먼트 요약)를 매개변수화된 SQL로 제공합니다. 질의는 DuckDB가 여러 스레드로
+컬럼 단위 실행하며, 데이터는 한 프로세스의 모든 Streamlit 세션이 같은 데이터베이스를 공유하므로
+세션·캐시마다 프레임을 복제하지 않습니다.
+
+- 성장 로그는 growth_stream.iter_growth_chunks로 청크씩 읽어 넣으므로 전처리 결과가 pandas
+  경로와 같고, 적재 중에도 메모리는 청크 크기로 제한됩니다.
+- 원본 파일 지문을 _sources 테이블에 기록해 두고, 지문이 바뀐 원본만 다시 적재합니다.
+- 페이지 질의는 DuckDB 파일을 읽기 전용으로 열고, ConnectionPool이 스레드(세션)마다 커서를 빌려줍니다.
+  읽기 전용 연결은 여러 프로세스가 동시에 열 수 있으므로, 여러 워커 프로세스가 같은 DUCKDB_PATH를 공유합니다.
+- 적재(쓰기)는 ensure_loaded만 하며, 파일 잠금(DUCKDB_PATH.lock) 아래에서 현재 파일의 사본에 적재한 뒤
+  원자적으로 교체합니다. 워커들이 동시에 같은 원본을 요청해도 적재는 한 번만 일어나고,
+  읽던 세션은 교체 전 파일을 끝까지 읽은 다음 질의부터 새 파일을 엽니다. (잠금은 POSIX fcntl을 쓰며,
+  fcntl이 없는 플랫폼에서는 프로세스 안에서만 직렬화됩니다.)
+
+QUERY_BACKEND=duckdb로 켜며, duckdb 패키지가 필요합니다.
+"""
+
+import os
+import queue
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from activity_mart import ACTIVITY_STATUSES, ActivityCube
+from cache import cached
+from growth_stream import GrowthSummary, SAMPLE_ROWS, iter_growth_chunks
+from utils import CACHE_DIR, GROWTH_LOG_DTYPES, LEVEL_LABELS, USER_STATUS_LABELS, source_fingerprint
+
+DUCKDB_PATH = Path(os.environ.get('DUCKDB_PATH', CACHE_DIR / 'dashboard.duckdb'))
+POOL_SIZE = int(os.environ.get('DUCKDB_POOL_SIZE', 4))
+LOCK_PATH = DUCKDB_PATH.with_name(f"{DUCKDB_PATH.name}.lock")
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+GROWTH_COLUMNS = [*GROWTH_LOG_DTYPES, 'user_status', 'has_guild']
+# 테이블에는 문자열로 저장하고, 주차 프레임으로 돌려줄 때 범주로 되돌리는 컬럼
+CATEGORY_COLUMNS = [c for c, dtype in GROWTH_LOG_DTYPES.items() if dtype == 'category'] + ['user_status']
+
+
+class ConnectionPool:
+    """
+    DuckDB 파일을 읽기 전용으로 연 커서를 최대 size개까지 만들어 돌려 씁니다.
+    ensure_loaded가 파일을 교체하면(inode·수정 시각이 바뀌면) 다음 대여부터 새 파일을 엽니다.
+    """
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = Path(path)
+        self.size = size
+        self._root = None
+        self._identity = None
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _file_identity(self):
+        stat = self.path.stat()
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _open_cursor(self, identity):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            if self._identity != identity:
+                import duckdb
+
+                # 경로로 바로 연결하면 DuckDB가 같은 경로에 열려 있는 (교체 전) 인스턴스를 재사용하므로,
+                # 새 인메모리 인스턴스에 파일을 읽기 전용으로 붙입니다.
+                self._root = duckdb.connect()
+                self._root.execute(f"ATTACH '{str(self.path).replace(chr(39), chr(39) * 2)}' AS dashboard (READ_ONLY)")
+                self._identity = identity
+            self._created += 1
+            cursor = self._root.cursor()
+        cursor.execute("USE dashboard")
+        return identity, cursor
+
+    @contextmanager
+    def connection(self):
+        """커서를 빌려 쓰고 돌려놓습니다. 모두 사용 중이면 반납될 때까지 기다립니다."""
+        identity = self._file_identity()
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                entry = self._open_cursor(identity) or self._idle.get()
+            if entry[0] == identity:
+                break
+            entry[1].close()  # 교체 전 파일을 보던 커서
+            with self._lock:
+                self._created -= 1
+        try:
+            yield entry[1]
+        finally:
+            self._idle.put(entry)
+
+
+_POOL = ConnectionPool(DUCKDB_PATH)
+_LOAD_LOCK = threading.Lock()
+
+
+def query(sql, params=()):
+    """매개변수화된 SQL을 실행해 DataFrame으로 반환합니다."""
+    with _POOL.connection() as con:
+        return con.execute(sql, list(params)).df()
+
+
+# --- 적재 ---
+
+def _loaded_fingerprints():
+    """적재된 원본 이름 → 지문. 파일이 아직 없으면 빈 dict."""
+    if not DUCKDB_PATH.exists():
+        return {}
+    with _POOL.connection() as con:
+        return dict(con.execute("SELECT name, fingerprint FROM _sources").fetchall())
+
+
+@contextmanager
+def _file_lock(path):
+    """프로세스 사이의 배타 잠금. fcntl이 없으면 아무것도 하지 않습니다. (호출하는 쪽이 _LOAD_LOCK을 잡습니다)"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _load_growth_log(con, file_path):
+    """성장 로그 → growth_log(원본 행 순서 row_id 포함), 주간 활동 지표 → activity."""
+    con.execute("DROP TABLE IF EXISTS growth_log")
+    offset = 0
+    for chunk in iter_growth_chunks(file_path, GROWTH_COLUMNS):
+        chunk = chunk.astype({c: 'string' for c in chunk.columns if isinstance(chunk[c].dtype, pd.CategoricalDtype)})
+        # 생성일은 원본 시간대의 벽시계 시각으로 저장합니다. (차트 구간이 pandas 경로와 같도록)
+        chunk['character_date_create'] = chunk['character_date_create'].dt.tz_localize(None)
+        chunk.insert(0, 'row_id', np.arange(offset, offset + len(chunk), dtype='int64'))
+        offset += len(chunk)
+        con.register('chunk', chunk)
+        if offset == len(chunk):
+            con.execute("CREATE TABLE growth_log AS SELECT * FROM chunk")
+        else:
+            con.execute("INSERT INTO growth_log SELECT * FROM chunk")
+        con.unregister('chunk')
+
+    # activity_mart.append_week와 같은 규칙: 직전 관측 행과의 경험치 차이(없으면 0), 첫 관측은 '첫 주'.
+    con.execute(f"""
+        CREATE OR REPLACE TABLE activity AS
+        WITH w AS (
+            SELECT
+                ocid, date, row_id, character_level, has_guild,
+                coalesce(CAST(character_exp AS DOUBLE) - lag(CAST(character_exp AS DOUBLE)) OVER o, 0) AS weekly_exp_gain,
+                row_number() OVER o = 1 AS first_week
+            FROM growth_log
+            WINDOW o AS (PARTITION BY ocid ORDER BY date)
+        )
+        SELECT
+            ocid, date, character_level, has_guild, weekly_exp_gain,
+            CASE WHEN first_week THEN '{ACTIVITY_STATUSES[0]}'
+                 WHEN weekly_exp_gain > 0 THEN '{ACTIVITY_STATUSES[1]}'
+                 ELSE '{ACTIVITY_STATUSES[2]}' END AS activity_status,
+            CASE WHEN character_level >= 260 AND character_level < 300
+                 THEN CAST(260 + 5 * floor((character_level - 260) / 5) AS INTEGER) END AS level_start,
+            row_number() OVER (ORDER BY date, row_id) AS seq
+        FROM w
+    """)
+
+
+def _load_cody(con, cody_path):
+    from cody_data import read_cody_dataframe
+
+    cody = read_cody_dataframe(cody_path)[0]
+    con.register('cody_frame', cody)
+    con.execute("CREATE OR REPLACE TABLE cody AS SELECT * FROM cody_frame")
+    con.unregister('cody_frame')
+
+
+def _load_candidates(con, candidates_path):
+    con.execute("CREATE OR REPLACE TABLE candidates AS SELECT level FROM read_csv(?, header = true)", [str(candidates_path)])
+
+
+LOADERS = {'growth_log': _load_growth_log, 'cody': _load_cody, 'candidates': _load_candidates}
+
+
+def ensure_loaded(**sources):
+    """
+    sources({'growth_log': 경로, ...}) 중 지문이 바뀐 원본만 다시 적재합니다.
+    파일 잠금 아래에서 현재 파일의 사본에 적재하고 os.replace로 교체하므로, 읽는 쪽은 적재 중에도
+    교체 전 파일을 그대로 읽습니다.
+    """
+    fingerprints = {name: source_fingerprint(path) for name, path in sources.items()}
+
+    def stale():
+        loaded = _loaded_fingerprints()
+        return [name for name, fingerprint in fingerprints.items() if loaded.get(name) != fingerprint]
+
+    if not stale():
+        return
+    with _LOAD_LOCK, _file_lock(LOCK_PATH):
+        names = stale()  # 잠금을 기다리는 동안 다른 워커가 이미 적재했을 수 있습니다.
+        if not names:
+            return
+        import duckdb
+
+        tmp_path = DUCKDB_PATH.with_name(f"{DUCKDB_PATH.name}.{os.getpid()}.tmp")
+        if DUCKDB_PATH.exists():
+            shutil.copyfile(DUCKDB_PATH, tmp_path)
+        else:
+            tmp_path.unlink(missing_ok=True)
+        try:
+            con = duckdb.connect(str(tmp_path))
+            try:
+                con.execute("CREATE TABLE IF NOT EXISTS _sources (name VARCHAR PRIMARY KEY, fingerprint VARCHAR)")
+                for name in names:
+                    LOADERS[name](con, sources[name])
+                    con.execute("INSERT OR REPLACE INTO _sources VALUES (?, ?)", [name, fingerprints[name]])
+            finally:
+                con.close()
+            os.replace(tmp_path, DUCKDB_PATH)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+
+# --- 페이지 질의 ---
+
+def activity_cube(file_path):
+    """날짜 × 활동 상태 × 레벨 구간 행 수를 GROUP BY로 세어 ActivityCube로 돌려줍니다."""
+    ensure_loaded(growth_log=file_path)
+    counts = query("""
+        SELECT date, activity_status, level_start, count(*) AS n
+        FROM activity
+        WHERE date IS NOT NULL
+        GROUP BY ALL
+    """)
+    dates = pd.DatetimeIndex(np.sort(counts['date'].unique()))
+    cube = np.zeros((len(dates), len(ACTIVITY_STATUSES), len(LEVEL_LABELS) + 1), dtype='int32')
+    level_codes = ((counts['level_start'].fillna(300).to_numpy() - 260) // 5).astype('int64')
+    np.add.at(cube, (
+        dates.get_indexer(counts['date']),
+        counts['activity_status'].map(ACTIVITY_STATUSES.index).to_numpy(),
+        level_codes,
+    ), counts['n'].to_numpy())
+    return ActivityCube(dates=dates, counts=cube)
+
+
+def guild_gain_box_stats(file_path):
+    """'성장' 주차의 경험치 획득량 박스 통계 (chart_data.box_stats와 같은 형식)."""
+    ensure_loaded(growth_log=file_path)
+    stats = query("""
+        WITH g AS (
+            SELECT has_guild, weekly_exp_gain AS v, seq FROM activity WHERE weekly_exp_gain > 0
+        ), s AS (
+            SELECT has_guild,
+                   quantile_cont(v, 0.25) AS q1, median(v) AS median, quantile_cont(v, 0.75) AS q3,
+                   avg(v) AS mean, count(*) AS n, min(seq) AS first_seq
+            FROM g GROUP BY has_guild
+        )
+        SELECT s.has_guild, any_value(q1) AS q1, any_value(median) AS median, any_value(q3) AS q3,
+               any_value(mean) AS mean, any_value(n) AS n,
+               min(v) FILTER (WHERE v >= q1 - 1.5 * (q3 - q1)) AS lowerfence,
+               max(v) FILTER (WHERE v <= q3 + 1.5 * (q3 - q1)) AS upperfence
+        FROM s JOIN g USING (has_guild)
+        GROUP BY s.has_guild
+        ORDER BY any_value(first_seq)
+    """)
+    stats['notchspan'] = 1.57 * (stats['q3'] - stats['q1']) / np.sqrt(stats['n'])
+    return stats
+
+
+@cached('sql_growth_summary', max_entries=2, sources=lambda file_path: [file_path])
+def growth_summary(file_path):
+    """심플 보드 페이지용 GrowthSummary. 형식·정렬은 growth_stream.build_growth_summary와 같습니다."""
+    ensure_loaded(growth_log=file_path)
+
+    def counts(keys, where='TRUE'):
+        frame = query(f"""
+            SELECT {', '.join(keys)}, count(*) AS count FROM growth_log
+            WHERE {where} AND {' AND '.join(f'{k} IS NOT NULL' for k in keys)}
+            GROUP BY ALL
+        """)
+        if 'user_status' in keys:
+            frame['user_status'] = pd.Categorical(frame['user_status'], categories=USER_STATUS_LABELS)
+        return frame.sort_values(keys, ignore_index=True)
+
+    def staying(column):
+        frame = counts([column], f"user_status = '{USER_STATUS_LABELS[0]}'")
+        return frame.set_index(column)['count'].sort_values(ascending=False, kind='stable')
+
+    sample = query("SELECT * EXCLUDE (row_id) FROM growth_log ORDER BY row_id LIMIT ?", [SAMPLE_ROWS])
+    return GrowthSummary(
+        status_by_date=counts(['date', 'user_status']),
+        level_counts=counts(['user_status', 'character_level']),
+        create_date_counts=counts(['user_status', 'character_date_create']),
+        guild_counts=staying('has_guild'),
+        class_counts=staying('character_class'),
+        sample=sample,
+    )
+
+
+def load_growth_summary(file_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 None을 반환합니다."""
+    try:
+        return growth_summary(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return None
+
+
+def power_kpis(file_path, date):
+    """date의 평균·최고·상위 1%(선형 보간) 전투력."""
+    ensure_loaded(growth_log=file_path)
+    return query("""
+        SELECT avg(전투력) AS avg_power, max(전투력) AS max_power, quantile_cont(전투력, 0.99) AS p99_power
+        FROM growth_log WHERE date = CAST(? AS DATE)
+    """, [date]).iloc[0]
+
+
+def week_dates(file_path):
+    """주차 날짜 목록 (오름차순 Timestamp, growth_stream.week_dates와 같은 형식)."""
+    ensure_loaded(growth_log=file_path)
+    return list(query("SELECT DISTINCT date FROM growth_log WHERE date IS NOT NULL ORDER BY date")['date'])
+
+
+def read_week(file_path, date):
+    """
+    date 한 주차의 성장 로그를 원본 행 순서대로 읽습니다.
+    범주 컬럼은 범주로 되돌리고, 생성일은 테이블에 저장된 벽시계 시각(시간대 없음) 그대로입니다.
+    """
+    ensure_loaded(growth_log=file_path)
+    week = query("SELECT * EXCLUDE (row_id) FROM growth_log WHERE date = CAST(? AS DATE) ORDER BY row_id", [date])
+    return week.astype({c: 'category' for c in CATEGORY_COLUMNS})
+
+
+def class_counts(file_path, date):
+    """date의 직업별 인원수 (내림차순, 동률이면 직업 이름 순). snapshot_index의 class_counts와 같은 순서입니다."""
+    ensure_loaded(growth_log=file_path)
+    frame = query("""
+        SELECT character_class, count(*) AS count FROM growth_log
+        WHERE date = CAST(? AS DATE) AND character_class IS NOT NULL
+        GROUP BY ALL ORDER BY count DESC, character_class
+    """, [date])
+    return frame.set_index('character_class')['count']
+
+
+@cached('sql_candidate_levels', max_entries=2, sources=lambda candidates_path: [candidates_path])
+def candidate_level_histogram(candidates_path):
+    """후보 유저 파일의 레벨별 인원수 배열 (utils.load_candidate_level_histogram과 같은 형식)."""
+    ensure_loaded(candidates=candidates_path)
+    counts = query("SELECT level, count(*) AS n FROM candidates WHERE level IS NOT NULL GROUP BY level")
+    histogram = np.zeros(int(counts['level'].max()) + 1 if len(counts) else 0, dtype='int64')
+    histogram[counts['level'].to_numpy(dtype='int64')] = counts['n'].to_numpy()
+    return histogram
+
+
+def load_candidate_level_histogram(candidates_path):
+    """페이지용 래퍼. 파일이 없으면 오류를 표시하고 빈 배열을 반환합니다."""
+    try:
+        return candidate_level_histogram(candidates_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{candidates_path}' 경로를 확인해주세요.")
+        return np.zeros(0, dtype='int64')
+
+
+def cody_growth_rows(file_path, cody_path):
+    """
+    코디 스냅샷에 있는 유저의 (성장 로그 행, 주간 활동 행)을 원본 순서대로 돌려줍니다.
+    세그먼트·공용 ocid id는 cody_data.read_cody_growth_join이 pandas 경로와 같은 방식으로 붙입니다.
+    """
+    ensure_loaded(growth_log=file_path, cody=cody_path)
+    growth = query("""
+        SELECT ocid, date, character_level, 전투력 FROM growth_log
+        SEMI JOIN cody USING (ocid) ORDER BY row_id
+    """)
+    weekly = query("""
+        SELECT ocid, date, weekly_exp_gain, activity_status FROM activity
+        SEMI JOIN cody USING (ocid) ORDER BY seq
+    """)
+    weekly['activity_status'] = pd.Categorical(weekly['activity_status'], categories=ACTIVITY_STATUSES)
+    return growth, weekly
+
+
+def segment_summary(file_path, cody_path, date):
+    """코디 세그먼트별 유저 수·전투력(평균·중앙값)·주간 경험치·성장 주차 비율. 전투력은 date 기준입니다."""
+    ensure_loaded(growth_log=file_path, cody=cody_path)
+    return query(f"""
+        WITH snapshot AS (
+            SELECT c.segment_simple AS segment,
+                   count(DISTINCT g.ocid) AS users, avg(g.전투력) AS avg_power, median(g.전투력) AS median_power
+            FROM growth_log g JOIN cody c USING (ocid)
+            WHERE g.date = CAST(? AS DATE)
+            GROUP BY ALL
+        ), weeks AS (
+            SELECT c.segment_simple AS segment,
+                   avg(a.weekly_exp_gain) AS avg_gain,
+                   avg(CASE WHEN a.activity_status = '{ACTIVITY_STATUSES[1]}' THEN 1.0 ELSE 0.0 END) * 100 AS growth_ratio
+            FROM activity a JOIN cody c USING (ocid)
+            WHERE a.activity_status <> '{ACTIVITY_STATUSES[0]}'
+            GROUP BY ALL
+        )
+        SELECT * FROM snapshot FULL JOIN weeks USING (segment)
+    """, [date]).set_index('segment')
@@ -0,0 +1,42 @@
+# 파일 위치: tests/conftest.py
+"""
+테스트 공용 픽스처.
+
+모듈은 저장소 루트의 평평한 파일이므로 루트와 benchmarks/(합성 데이터 생성기)를 임포트 경로에 넣습니다.
+캐시·마트·스냅샷 경로(.cache/...)는 작업 디렉터리 기준이라 테스트마다 임시 디렉터리로 옮겨 서로 섞이지 않게 합니다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / 'benchmarks')]
+
+import dataset_server  # noqa: E402
+import synth_data  # noqa: E402
+
+SYNTH_USERS = 300
+SYNTH_WEEKS = 6
+
+
+@pytest.fixture(autouse=True)
+def isolated_workdir(tmp_path, monkeypatch):
+    """작업 디렉터리와 공유 데이터셋 디렉터리를 테스트별 임시 디렉터리로 바꿉니다."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(dataset_server, 'SHARED_ROOT', tmp_path / 'shared')
+    return tmp_path
+
+
+@pytest.fixture(scope='session')
+def synthetic_dir(tmp_path_factory):
+    """SYNTH_USERS명 × SYNTH_WEEKS주 합성 성장 로그·코디 스냅샷이 들어 있는 디렉터리. (세션당 한 번 생성)"""
+    out_dir = tmp_path_factory.mktemp('synth')
+    synth_data.generate(out_dir, SYNTH_USERS, weeks=SYNTH_WEEKS)
+    return out_dir
+
+
+@pytest.fixture(scope='session')
+def growth_csv(synthetic_dir):
+    return synthetic_dir / synth_data.GROWTH_LOG_FILE
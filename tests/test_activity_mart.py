@@ -0,0 +1,78 @@
+# 파일 위치: tests/test_activity_mart.py
+"""activity_mart.py: 새 주차 증분 추가와 전체 재빌드가 같은 마트를 만드는지, 과거 주차가 바뀌면 다시 빌드하는지."""
+
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from activity_mart import MART_COLUMNS, read_activity_mart, update_activity_mart
+
+
+@pytest.fixture(scope='module')
+def raw_log(growth_csv):
+    # 원문 그대로 다시 쓸 수 있도록 모든 값을 문자열로 읽습니다.
+    return pd.read_csv(growth_csv, dtype=str, keep_default_na=False)
+
+
+def _write(raw, path):
+    raw.to_csv(path, index=False)
+    return path
+
+
+def _sorted(mart):
+    return mart[MART_COLUMNS].sort_values(['date', 'ocid'], kind='stable').reset_index(drop=True)
+
+
+def _partition_ids(mart_dir):
+    return {path.name: (path.stat().st_ino, path.stat().st_mtime_ns) for path in mart_dir.glob('date=*.arrow')}
+
+
+def test_append_matches_full_rebuild(raw_log, tmp_path):
+    dates = sorted(raw_log['date'].unique())
+    incremental = tmp_path / 'growth_incremental.csv'
+    mart_dir = update_activity_mart(_write(raw_log[raw_log['date'].isin(dates[:4])], incremental))
+    before = _partition_ids(mart_dir)
+    assert len(before) == 4
+
+    assert update_activity_mart(_write(raw_log, incremental)) == mart_dir
+    after = _partition_ids(mart_dir)
+    assert len(after) == len(dates)
+    assert {name: after[name] for name in before} == before  # 기존 주차 파일은 다시 쓰지 않습니다.
+
+    full_dir = update_activity_mart(_write(raw_log, tmp_path / 'growth_full.csv'))
+    tm.assert_frame_equal(_sorted(read_activity_mart(mart_dir)), _sorted(read_activity_mart(full_dir)))
+
+
+def test_statuses_follow_exp_gain(raw_log, tmp_path):
+    mart = _sorted(read_activity_mart(update_activity_mart(_write(raw_log, tmp_path / 'growth.csv'))))
+    first_week = mart.groupby('ocid', sort=False).cumcount() == 0
+    assert (mart.loc[first_week, 'activity_status'] == '첫 주').all()
+    later = mart[~first_week]
+    assert (later['activity_status'] == later['weekly_exp_gain'].gt(0).map({True: '성장', False: '정체'})).all()
+
+
+def test_past_week_change_rebuilds(raw_log, tmp_path):
+    path = tmp_path / 'growth_edit.csv'
+    mart_dir = update_activity_mart(_write(raw_log, path))
+    before = _partition_ids(mart_dir)
+
+    edited = raw_log.copy()
+    dates = sorted(edited['date'].unique())
+    row = edited.index[(edited['date'] == dates[1]) & (edited['character_exp'] != '')][0]
+    edited.loc[row, 'character_exp'] = str(int(float(edited.loc[row, 'character_exp'])) + 123_456_789)
+    update_activity_mart(_write(edited, path))
+
+    after = _partition_ids(mart_dir)
+    assert after.keys() == before.keys()
+    assert all(after[name] != before[name] for name in before)  # 전체를 다시 빌드했습니다.
+
+    full_dir = update_activity_mart(_write(edited, tmp_path / 'growth_edit_full.csv'))
+    tm.assert_frame_equal(_sorted(read_activity_mart(mart_dir)), _sorted(read_activity_mart(full_dir)))
+
+
+def test_unchanged_source_is_noop(raw_log, tmp_path):
+    path = _write(raw_log, tmp_path / 'growth_same.csv')
+    mart_dir = update_activity_mart(path)
+    before = _partition_ids(mart_dir)
+    update_activity_mart(path)
+    assert _partition_ids(mart_dir) == before
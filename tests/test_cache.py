@@ -0,0 +1,149 @@
+# 파일 위치: tests/test_cache.py
+"""cache.py: LRU·바이트·TTL 축출, 키별 계산 잠금(동시 미스), 원본 지문 키."""
+
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+import cache
+from cache import BoundedCache, cached, estimate_bytes, memoize
+
+
+@pytest.fixture
+def cache_name():
+    # 캐시 레지스트리는 프로세스 전역이므로 테스트마다 새 이름을 씁니다.
+    return f"test-{uuid.uuid4().hex}"
+
+
+def test_lru_evicts_least_recently_used():
+    lru = BoundedCache('lru', max_entries=2)
+    lru.put('a', 1)
+    lru.put('b', 2)
+    assert lru.get('a') == (True, 1)  # a가 가장 최근에 쓴 항목이 됩니다.
+    lru.put('c', 3)
+    assert lru.get('b') == (False, None)
+    assert lru.get('a') == (True, 1)
+    assert lru.get('c') == (True, 3)
+    assert lru.stats()['evictions'] == 1
+    assert (lru.hits, lru.misses) == (3, 1)
+
+
+def test_byte_limit_evicts_oldest_but_keeps_newest():
+    block = np.zeros(100)  # 800바이트
+    sized = BoundedCache('bytes', max_entries=10, max_bytes=2000)
+    for key in 'abc':
+        sized.put(key, block.copy())
+    assert [key for key, _ in sized.items()] == ['b', 'c']
+    assert sized.total_bytes == 1600
+
+    # 한도보다 큰 항목도 방금 넣은 것이면 남깁니다.
+    sized.put('big', np.zeros(1000))
+    assert [key for key, _ in sized.items()] == ['big']
+    assert sized.evictions == 3
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    expiring = BoundedCache('ttl', ttl=10)
+    expiring.put('a', 1)
+    now[0] = 10.0
+    assert expiring.get('a') == (True, 1)
+    now[0] = 10.5
+    assert expiring.get('a') == (False, None)
+    assert expiring.expirations == 1
+    assert expiring.stats()['entries'] == 0
+
+
+def test_get_without_count_leaves_stats():
+    quiet = BoundedCache('quiet')
+    quiet.get('a', count=False)
+    quiet.put('a', 1)
+    quiet.get('a', count=False)
+    assert (quiet.hits, quiet.misses) == (0, 0)
+
+
+def test_memoize_concurrent_miss_computes_once(cache_name):
+    calls = []
+    start = threading.Barrier(8)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)  # 다른 스레드가 모두 같은 키를 기다리도록 계산을 늦춥니다.
+        return object()
+
+    def worker():
+        start.wait()
+        results.append(memoize(cache_name, 'key', compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    stats = cache.get_cache(cache_name).stats()
+    assert stats['misses'] + stats['hits'] == 8
+    assert not [key for key in cache._COMPUTE_LOCKS if key[0] == cache_name]  # 다 쓴 잠금은 지웁니다.
+
+
+def test_memoize_other_keys_do_not_wait(cache_name):
+    other_done = threading.Event()
+    results = {}
+
+    def slow():
+        # 다른 키의 계산이 이 계산을 기다린다면 제한 시간까지 이벤트가 오지 않습니다.
+        return other_done.wait(timeout=5)
+
+    thread = threading.Thread(target=lambda: results.update(slow=memoize(cache_name, 'slow', slow)))
+    thread.start()
+    time.sleep(0.05)
+    assert memoize(cache_name, 'fast', lambda: 'fast') == 'fast'
+    other_done.set()
+    thread.join()
+    assert results['slow'] is True
+
+
+def test_memoize_exception_releases_lock(cache_name):
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        memoize(cache_name, 'key', fail)
+    assert memoize(cache_name, 'key', lambda: 1) == 1
+
+
+def test_cached_rekeys_when_source_changes(cache_name, tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('a')
+    calls = []
+
+    @cached(cache_name, sources=lambda path: [path])
+    def load(path):
+        calls.append(path)
+        return path.read_text()
+
+    assert load(source) == 'a'
+    assert load(source) == 'a'
+    source.write_text('bb')
+    assert load(source) == 'bb'
+    assert len(calls) == 2
+
+
+def test_estimate_bytes_figure_counts_trace_arrays(monkeypatch):
+    monkeypatch.setattr(go.Figure, 'to_json', lambda self, *args, **kwargs: pytest.fail('to_json 호출'))
+    small = go.Figure(go.Scatter(x=np.arange(10.0), y=np.arange(10.0)))
+    large = go.Figure(
+        go.Scatter(x=np.arange(10_000.0), y=np.arange(10_000.0)),
+        frames=[go.Frame(data=[go.Scatter(x=np.arange(10_000.0), y=np.arange(10_000.0))])],
+    )
+    assert estimate_bytes(large) >= 4 * 80_000
+    assert estimate_bytes(small) < 80_000
@@ -0,0 +1,100 @@
+# 파일 위치: tests/test_chart_data.py
+"""chart_data.py: 서버에서 계산한 박스 통계·히스토그램·산점도 점 추출."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from chart_data import box_stats, box_stats_from_sketch, decimate_points, histogram_counts
+
+
+def _box_frame(seed=0, n=500):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(10, 1, n)
+    values[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({'group': rng.choice(['c', 'a', 'b'], n), 'value': values})
+
+
+def test_box_stats_matches_numpy_quantiles():
+    df = _box_frame()
+    stats = box_stats(df, 'value', 'group').set_index('group')
+    for name, part in df.dropna(subset=['value']).groupby('group'):
+        values = part['value'].to_numpy()
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        row = stats.loc[name]
+        np.testing.assert_allclose([row['q1'], row['median'], row['q3'], row['mean']], [q1, median, q3, values.mean()])
+        assert row['n'] == len(values)
+        iqr = q3 - q1
+        assert row['lowerfence'] == values[values >= q1 - 1.5 * iqr].min()
+        assert row['upperfence'] == values[values <= q3 + 1.5 * iqr].max()
+        np.testing.assert_allclose(row['notchspan'], 1.57 * iqr / np.sqrt(len(values)))
+
+
+def test_box_stats_keeps_first_seen_group_order():
+    df = pd.DataFrame({'group': [True, False, True, False], 'value': [1.0, 2.0, 3.0, 4.0]})
+    assert box_stats(df, 'value', 'group')['group'].tolist() == [True, False]
+    assert box_stats(_box_frame(), 'value', 'group')['group'].tolist() == list(pd.unique(_box_frame()['group']))
+
+
+def test_box_stats_from_sketch_matches_rows():
+    df = _box_frame(seed=1).dropna(subset=['value'])
+    df['value'] = df['value'].round(-3)  # 값이 겹치도록 반올림해 (값, 개수) 스케치를 만듭니다.
+    sketch = df.groupby(['group', 'value'], sort=False).size().rename('count').reset_index()
+    expected = box_stats(df, 'value', 'group')
+    result = box_stats_from_sketch(sketch, 'value', 'group')
+    tm.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_histogram_counts_by_color():
+    df = pd.DataFrame({'x': [0.0, 1.0, 1.5, 2.5, np.nan, 9.9], 'color': ['a', 'a', 'b', 'b', 'a', 'a']})
+    counts = histogram_counts(df, 'x', bin_width=1.0, color='color')
+    assert counts['color'].unique().tolist() == ['a', 'b']
+    assert counts['count'].sum() == 5
+    a = counts[counts['color'] == 'a'].set_index('bin_start')['count']
+    assert (a[0.0], a[1.0], a[9.0]) == (1, 1, 1)
+
+
+def _scatter_frame(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'x': rng.normal(size=n), 'y': rng.normal(size=n)})
+
+
+def test_decimate_points_small_frame_unchanged():
+    df = _scatter_frame(100)
+    assert decimate_points(df, 'x', 'y', max_points=100) is df
+
+
+def test_decimate_points_caps_rows_and_covers_cells():
+    df = _scatter_frame()
+    kept = decimate_points(df, 'x', 'y', max_points=2000, grid_size=16)
+    assert len(kept) == 2000
+    assert kept.index.is_monotonic_increasing and kept.index.is_unique
+
+    def cells(frame):
+        x = np.minimum(((frame['x'] - df['x'].min()) / (df['x'].max() - df['x'].min()) * 16).astype(int), 15)
+        y = np.minimum(((frame['y'] - df['y'].min()) / (df['y'].max() - df['y'].min()) * 16).astype(int), 15)
+        return set(zip(x, y))
+
+    assert cells(kept) == cells(df)  # 점이 있는 칸은 모두 남습니다. (외곽값 보존)
+    tm.assert_frame_equal(kept, decimate_points(df, 'x', 'y', max_points=2000, grid_size=16))  # 같은 seed면 같은 결과
+
+
+def test_decimate_points_skips_nan_rows():
+    df = _scatter_frame(10_000)
+    df.loc[df.index[::3], 'x'] = np.nan
+    df.loc[df.index[1::7], 'y'] = np.nan
+    kept = decimate_points(df, 'x', 'y', max_points=1000)
+    assert len(kept) == 1000
+    assert kept[['x', 'y']].notna().all().all()
+
+    # 그릴 수 있는 점이 예산보다 적으면 그 점만 남깁니다.
+    sparse = df.assign(x=np.where(np.arange(len(df)) < 500, df['x'].fillna(0.0), np.nan))
+    kept = decimate_points(sparse, 'x', 'y', max_points=1000)
+    assert len(kept) == sparse[['x', 'y']].notna().all(axis=1).sum()
+
+
+def test_decimate_points_all_nan_returns_empty():
+    df = _scatter_frame(10_000).assign(y=np.nan)
+    kept = decimate_points(df, 'x', 'y', max_points=100)
+    assert kept.empty
+    assert list(kept.columns) == ['x', 'y']
@@ -0,0 +1,93 @@
+# 파일 위치: tests/test_cohort_survival.py
+"""cohort_survival.py: Kaplan–Meier 추정과 유저 × 주차 패널의 이벤트 시점."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from cohort_survival import CHURN_WEEKS, build_cohort_panel, kaplan_meier
+
+
+def test_kaplan_meier_hand_computed():
+    # 그룹 0: 0주 이벤트, 1주 이벤트·절단, 2주 이벤트, 3주 절단 / 그룹 1: 2주에 둘 다 절단
+    durations = np.array([0, 1, 1, 2, 3, 2, 2])
+    happened = np.array([True, True, False, True, False, False, False])
+    codes = np.array([0, 0, 0, 0, 0, 1, 1])
+    at_risk, events, survival, se = kaplan_meier(durations, happened, codes, n_groups=2, n_times=4)
+
+    np.testing.assert_array_equal(at_risk, [[5, 4, 2, 1], [2, 2, 2, 0]])
+    np.testing.assert_array_equal(events, [[1, 1, 1, 0], [0, 0, 0, 0]])
+    np.testing.assert_allclose(survival, [[0.8, 0.6, 0.3, 0.3], [1, 1, 1, 1]])
+    greenwood = np.cumsum([1 / (5 * 4), 1 / (4 * 3), 1 / (2 * 1), 0])
+    np.testing.assert_allclose(se[0], survival[0] * np.sqrt(greenwood))
+    np.testing.assert_allclose(se[1], 0)
+
+
+def test_kaplan_meier_without_censoring_is_empirical_survival():
+    rng = np.random.default_rng(0)
+    durations = rng.integers(0, 10, 200)
+    _, _, survival, _ = kaplan_meier(durations, np.ones(200, dtype=bool), np.zeros(200, dtype='int64'), 1, 10)
+    np.testing.assert_allclose(survival[0], [(durations > t).mean() for t in range(10)])
+
+
+N_WEEKS = CHURN_WEEKS + 3
+
+
+@pytest.fixture
+def panel_frame():
+    """
+    keep: 매주 성장 / leap: 2주차부터 기록(월드 리프) / stall: 1주차만 성장하고 멈춤 / gone: 기록 없음
+    """
+    dates = pd.date_range('2025-07-03', periods=N_WEEKS, freq='7D')
+    progress = {
+        'keep': [260 + week for week in range(N_WEEKS)],
+        'leap': [None, None, *(270 + week for week in range(N_WEEKS - 2))],
+        'stall': [265, 266, *([266] * (N_WEEKS - 2))],
+        'gone': [None] * N_WEEKS,
+    }
+    rows = [
+        {
+            'ocid': ocid,
+            'date': date,
+            'character_name': None if level is None else ocid,
+            'character_class': None if level is None else '아크메이지(불,독)',
+            'character_level': level,
+            'character_exp_rate': None if level is None else 10.0,
+            'has_guild': ocid == 'keep',
+            'character_date_create': pd.Timestamp('2025-06-01') if level is not None else pd.NaT,
+        }
+        for ocid, levels in progress.items() for date, level in zip(dates, levels)
+    ]
+    frame = pd.DataFrame(rows)
+    frame['character_level'] = frame['character_level'].astype('Int16')
+    return frame
+
+
+def test_panel_event_weeks(panel_frame):
+    panel = build_cohort_panel(panel_frame)
+    order = {ocid: i for i, ocid in enumerate(pd.unique(panel_frame['ocid']))}
+    keep, leap, stall, gone = (order[name] for name in ('keep', 'leap', 'stall', 'gone'))
+
+    assert panel.first_seen.tolist() == [0, 2, 0, N_WEEKS]
+    assert panel.leap_week[[keep, leap, stall, gone]].tolist() == [-1, 2, -1, N_WEEKS]
+    assert panel.first_stagnant[[keep, leap, stall]].tolist() == [-1, -1, 2]
+    assert panel.growing[1:, keep].all() and not panel.growing[0].any()
+
+    durations, happened = panel.durations('월드 리프')
+    assert happened.tolist() == [False, True, False, False]
+    assert durations.tolist() == [N_WEEKS - 1, 2, N_WEEKS - 1, N_WEEKS - 1]
+
+    durations, happened = panel.durations('성장 중단')
+    horizon = N_WEEKS - CHURN_WEEKS
+    assert happened[stall] and not happened[keep] and not happened[leap]
+    assert durations[stall] == 2 and durations[keep] == horizon
+    assert durations[gone] == -1  # 기록이 없으면 기준 시점이 없습니다.
+
+
+def test_panel_from_chunks_matches_frame(panel_frame):
+    whole = build_cohort_panel(panel_frame)
+    chunked = build_cohort_panel([panel_frame.iloc[:9], panel_frame.iloc[9:]])
+    for field in ('growing', 'first_seen', 'leap_week', 'first_stagnant', 'churn_start'):
+        np.testing.assert_array_equal(getattr(chunked, field), getattr(whole, field))
+    tm.assert_frame_equal(chunked.summary('월드 리프', '전체'), whole.summary('월드 리프', '전체'))
@@ -0,0 +1,82 @@
+# 파일 위치: tests/test_dataset_server.py
+"""dataset_server.py: 게시한 프레임에 붙었을 때 dtype·값·결측이 그대로이고 버퍼가 읽기 전용인지."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+import dataset_server
+import synth_data
+from dataset_server import attach_dataset, attach_frame, publish, publish_dataset, publish_frame
+from utils import read_growth_log
+
+
+@pytest.fixture
+def mixed_frame():
+    return pd.DataFrame({
+        'float': [1.5, np.nan, 3.0, 4.0],
+        'int': np.array([1, 2, 3, 4], dtype='int32'),
+        'flag': [True, False, True, True],
+        'category': pd.Categorical(['a', None, 'b', 'a'], categories=['b', 'a']),
+        'ordered': pd.Categorical(['low', 'high', 'low', 'high'], categories=['low', 'high'], ordered=True),
+        'nullable_int': pd.array([1, None, 3, 70000], dtype='Int64'),
+        'small_int': pd.array([1, 2, None, 4], dtype='UInt8'),
+        'nullable_float': pd.array([0.5, None, 2.5, 3.5], dtype='Float32'),
+        'boolean': pd.array([True, None, False, True], dtype='boolean'),
+        'string': pd.array(['가', None, 'ocid', ''], dtype='string'),
+        'datetime': pd.to_datetime(['2025-07-03', None, '2025-07-10', '2025-07-17']),
+        'aware': pd.to_datetime(['2025-07-03 09:00', None, '2025-07-10 09:00', '2025-07-17 09:00']).tz_localize('Asia/Seoul'),
+    })
+
+
+def test_publish_attach_round_trip(mixed_frame, tmp_path):
+    publish_frame(mixed_frame, tmp_path / 'frame')
+    attached = attach_frame(tmp_path / 'frame')
+    # 문자열은 Arrow 기반 str dtype으로 붙으므로 값만 비교합니다.
+    tm.assert_frame_equal(attached.drop(columns='string'), mixed_frame.drop(columns='string'))
+    assert attached['string'].isna().tolist() == [False, True, False, False]
+    assert attached['string'].dropna().tolist() == ['가', 'ocid', '']
+
+
+def test_attached_buffers_are_read_only(mixed_frame, tmp_path):
+    publish_frame(mixed_frame, tmp_path / 'frame')
+    attached = attach_frame(tmp_path / 'frame')
+    assert not attached['float'].to_numpy().flags.writeable
+    assert not attached['category'].array.codes.flags.writeable
+    assert not attached['nullable_int'].array._data.flags.writeable
+    with pytest.raises(ValueError):
+        attached['float'].to_numpy()[0] = 0.0
+
+
+def test_attach_missing_returns_none(tmp_path):
+    assert attach_frame(tmp_path / 'missing') is None
+
+
+def test_dataset_follows_source_fingerprint(mixed_frame, tmp_path, monkeypatch):
+    source = tmp_path / 'source.csv'
+    source.write_text('v1')
+    first_dir = publish_dataset('mixed', source, mixed_frame)
+    tm.assert_frame_equal(attach_dataset('mixed', source)[['float', 'int']], mixed_frame[['float', 'int']])
+
+    # 원본이 바뀌면 옛 게시본에는 붙지 않고, 다시 게시하면 옛 게시본을 지웁니다.
+    source.write_text('version 2')
+    assert attach_dataset('mixed', source) is None
+    second_dir = publish_dataset('mixed', source, mixed_frame.iloc[:2])
+    assert second_dir != first_dir and not first_dir.exists()
+    assert len(attach_dataset('mixed', source)) == 2
+
+    monkeypatch.setattr(dataset_server, 'SHARED_DATASETS', 'off')
+    assert attach_dataset('mixed', source) is None
+
+
+def test_loaders_attach_published_growth_log(synthetic_dir):
+    growth_csv = synthetic_dir / synth_data.GROWTH_LOG_FILE
+    published = publish(growth_csv, synthetic_dir / synth_data.CODY_FILE)
+    assert set(published) == {'growth_log', 'activity_mart', 'cody'}
+    assert publish(growth_csv, synthetic_dir / synth_data.CODY_FILE) == {}  # 이미 게시돼 있으면 건너뜁니다.
+
+    shared = read_growth_log(growth_csv)
+    direct = read_growth_log(growth_csv, shared=False)
+    assert not shared['전투력'].to_numpy().flags.writeable
+    tm.assert_frame_equal(shared, direct)
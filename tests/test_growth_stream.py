@@ -0,0 +1,39 @@
+# 파일 위치: tests/test_growth_stream.py
+"""growth_stream.py: 주차 순회 집계가 메모리 모드와 같은 결과(그룹 순서 포함)를 내는지."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from activity_mart import build_activity_cube, read_activity_mart, update_activity_mart
+from chart_data import box_stats, box_stats_from_sketch
+from growth_stream import _merge_sketch, build_activity_aggregates
+
+
+def _empty_sketch():
+    return pd.DataFrame({'group': pd.Series(dtype='bool'), 'value': pd.Series(dtype='float64'), 'count': pd.Series(dtype='int64')})
+
+
+def test_merge_sketch_keeps_first_seen_group_order():
+    # 정렬하면 False가 앞에 오지만, 행 순서로 처음 나온 True가 앞에 있어야 합니다.
+    sketch = _merge_sketch(_empty_sketch(), np.array([5.0, 1.0, 5.0]), np.array([True, False, True]))
+    sketch = _merge_sketch(sketch, np.array([2.0, 5.0]), np.array([False, True]))
+    assert sketch['group'].drop_duplicates().tolist() == [True, False]
+    counts = sketch.set_index(['group', 'value'])['count']
+    assert (counts[(True, 5.0)], counts[(False, 1.0)], counts[(False, 2.0)]) == (3, 1, 1)
+
+    stats = box_stats_from_sketch(sketch, 'gain', 'has_guild')
+    assert stats['has_guild'].tolist() == [True, False]
+
+
+def test_streamed_activity_matches_memory(growth_csv):
+    cube, streamed_box = build_activity_aggregates(growth_csv)
+
+    mart = read_activity_mart(update_activity_mart(growth_csv))
+    memory_cube = build_activity_cube(mart)
+    tm.assert_index_equal(cube.dates, memory_cube.dates)
+    np.testing.assert_array_equal(cube.counts, memory_cube.counts)
+
+    # 합성 로그는 값 종류가 SKETCH_MAX_VALUES보다 적어 반올림 없이 같은 통계가 나옵니다.
+    memory_box = box_stats(mart[mart['weekly_exp_gain'] > 0], 'weekly_exp_gain', 'has_guild')
+    tm.assert_frame_equal(streamed_box, memory_box, check_dtype=False)
@@ -0,0 +1,158 @@
+# 파일 위치: tests/test_ingest.py
+"""ingest.py: (ocid, date) 중복 제거, 파티션 version 관리, 활동 마트 연동, Open API 응답 코드 처리."""
+
+import json
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import ingest
+from activity_mart import MART_ROOT
+from ingest import fixture_source, ingest_snapshot, nexon_api_source
+from utils import partition_path, read_growth_log, read_store_manifest, source_fingerprint
+
+
+@pytest.fixture(scope='module')
+def raw_log(growth_csv):
+    return fixture_source(growth_csv)()
+
+
+def _dates(raw):
+    return sorted(raw['date'].unique())
+
+
+def _week(store_dir, date):
+    return read_growth_log(store_dir, dates=[date], shared=False).set_index('ocid')
+
+
+def test_initial_load_and_reingest_is_noop(raw_log, tmp_path):
+    store = tmp_path / 'store'
+    assert ingest_snapshot(raw_log, store) == _dates(raw_log)
+    manifest = read_store_manifest(store)
+    assert {part['version'] for part in manifest['partitions'].values()} == {1}
+    assert sum(part['rows'] for part in manifest['partitions'].values()) == len(raw_log)
+
+    fingerprint = source_fingerprint(store)
+    files = {path: path.stat().st_mtime_ns for path in store.iterdir()}
+    assert ingest_snapshot(raw_log, store) == []
+    assert source_fingerprint(store) == fingerprint
+    assert {path: path.stat().st_mtime_ns for path in store.iterdir()} == files
+
+
+def test_duplicates_keep_last_row(raw_log, tmp_path):
+    date = _dates(raw_log)[0]
+    week = raw_log[raw_log['date'] == date]
+    ocid = week['ocid'].iloc[0]
+    newer = week.iloc[[0]].assign(전투력=123.0)
+    ingest_snapshot(pd.concat([week, newer], ignore_index=True), tmp_path / 'store', update_marts=False)
+
+    stored = _week(tmp_path / 'store', date)
+    assert stored.index.is_unique and len(stored) == len(week)
+    assert stored.loc[ocid, '전투력'] == 123.0
+
+
+def test_changed_partition_bumps_only_its_version(raw_log, tmp_path):
+    store = tmp_path / 'store'
+    dates = _dates(raw_log)
+    ingest_snapshot(raw_log, store, update_marts=False)
+    untouched = partition_path(store, dates[0]).stat().st_mtime_ns
+
+    week = raw_log[raw_log['date'] == dates[2]]
+    ocid = week['ocid'].iloc[5]
+    assert ingest_snapshot(week.iloc[[5]].assign(스타포스=999.0), store, update_marts=False) == [dates[2]]
+
+    partitions = read_store_manifest(store)['partitions']
+    assert partitions[dates[2]]['version'] == 2
+    assert partitions[dates[2]]['rows'] == len(week)  # 기존 행을 대체했을 뿐 늘지 않았습니다.
+    assert all(partitions[d]['version'] == 1 for d in dates if d != dates[2])
+    assert partition_path(store, dates[0]).stat().st_mtime_ns == untouched
+    assert _week(store, dates[2]).loc[ocid, '스타포스'] == 999.0
+
+
+def test_new_week_appends_to_activity_mart(raw_log, tmp_path):
+    store = tmp_path / 'store'
+    dates = _dates(raw_log)
+    ingest_snapshot(raw_log[raw_log['date'].isin(dates[:-1])], store)
+    mart_dir = MART_ROOT / store.stem
+    first = (mart_dir / f"date={dates[0]}.arrow").stat().st_ino
+
+    assert ingest_snapshot(raw_log[raw_log['date'] == dates[-1]], store) == [dates[-1]]
+    meta = json.loads((mart_dir / 'meta.json').read_text(encoding='utf-8'))
+    assert meta['dates'] == dates
+    assert (mart_dir / f"date={dates[0]}.arrow").stat().st_ino == first  # 새 주차만 추가했습니다.
+
+
+# --- Open API 응답 처리 ---
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    """ocid에 따라 정해진 응답을 돌려주는 가짜 Open API. 호출 기록은 server.calls에 남깁니다."""
+
+    def do_GET(self):
+        endpoint = urllib.parse.urlparse(self.path).path.rsplit('/', 1)[-1]
+        ocid = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)['ocid'][0]
+        self.server.calls.append((endpoint, ocid))
+        attempts = self.server.calls.count((endpoint, ocid))
+        if ocid == 'missing':
+            self._reply(404, {'error': {'name': 'OPENAPI00004', 'message': 'not found'}})
+        elif ocid == 'invalid':
+            self._reply(400, {'error': {'name': 'OPENAPI00003', 'message': 'invalid identifier'}})
+        elif ocid == 'denied':
+            self._reply(403, {'error': {'name': 'OPENAPI00002', 'message': 'forbidden'}})
+        elif ocid == 'busy' and attempts == 1:
+            self._reply(429, {'error': {'name': 'OPENAPI00007', 'message': 'too many requests'}})
+        elif endpoint == 'basic':
+            self._reply(200, {
+                'character_name': f"name-{ocid}", 'world_name': '스카니아', 'character_level': 270,
+                'character_exp': 1000, 'access_flag': 'true', 'liberation_quest_clear_flag': 'false',
+            })
+        else:
+            self._reply(200, {'final_stat': [{'stat_name': '전투력', 'stat_value': '123456789'}]})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ApiHandler)
+    server.calls = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(ingest, 'NEXON_API_URL', f"http://127.0.0.1:{server.server_port}/maplestory/v1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _source(ocids):
+    return nexon_api_source('key', ocids, request_interval=0, retries=2, retry_interval=0)
+
+
+def test_api_not_found_becomes_empty_row(api_server):
+    raw = _source(['ok', 'missing', 'invalid', 'busy'])('2025-10-23').set_index('ocid')
+    assert raw.loc['ok', 'character_name'] == 'name-ok'
+    assert raw.loc['ok', '전투력'] == 123456789
+    assert raw.loc['busy', 'character_level'] == 270  # 429는 다시 시도해 채웁니다.
+    assert raw.loc[['missing', 'invalid'], 'character_name'].isna().all()
+    assert (raw['date'] == '2025-10-23').all()
+    # 캐릭터가 없으면 stat은 조회하지 않습니다.
+    assert ('stat', 'missing') not in api_server.calls and ('stat', 'invalid') not in api_server.calls
+
+
+def test_api_other_errors_raise(api_server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _source(['ok', 'denied'])('2025-10-23')
+    assert error.value.code == 403
+    assert api_server.calls.count(('basic', 'denied')) == 1  # 인증 오류는 다시 시도하지 않습니다.
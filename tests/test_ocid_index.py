@@ -0,0 +1,51 @@
+# 파일 위치: tests/test_ocid_index.py
+"""ocid_index.py: 대리 키 부여·인코딩·디코딩과 정수 조인."""
+
+import numpy as np
+import pandas as pd
+
+from ocid_index import OcidIndex
+
+
+def test_build_assigns_ids_in_first_seen_order():
+    index = OcidIndex.build(['b', 'a', 'b', None], pd.Categorical(['c', 'a']))
+    assert list(index.keys) == ['b', 'a', 'c']
+    assert len(index) == 3
+
+
+def test_extend_keeps_existing_ids():
+    index = OcidIndex.build(['b', 'a'])
+    assert index.extend(['a']) is index
+    extended = index.extend(['d', 'a', 'd'])
+    assert list(extended.keys) == ['b', 'a', 'd']
+    np.testing.assert_array_equal(extended.encode(['a', 'b']), index.encode(['a', 'b']))
+
+
+def test_encode_decode_round_trip():
+    index = OcidIndex.build(['b', 'a', 'c'])
+    ids = index.encode(['c', 'x', None, 'b'])
+    assert ids.dtype == np.int32
+    np.testing.assert_array_equal(ids, [2, -1, -1, 0])
+    decoded = index.decode(ids)
+    assert decoded[0] == 'c' and decoded[3] == 'b'
+    assert pd.isna(decoded[1]) and pd.isna(decoded[2])
+
+
+def test_join_positions_last_duplicate_wins():
+    index = OcidIndex.build(['a', 'b', 'c', 'd'])
+    target = index.encode(['c', 'a', 'x', 'b', 'd'])
+    source = index.encode(['a', 'c', 'a', 'x', 'b'])
+    np.testing.assert_array_equal(index.join_positions(target, source), [1, 2, -1, 4, -1])
+
+
+def test_join_positions_matches_merge():
+    rng = np.random.default_rng(0)
+    pool = np.array([f"{i:032x}" for i in range(200)])
+    target_ocids, source_ocids = rng.choice(pool, 500), np.unique(rng.choice(pool, 120))
+    index = OcidIndex.build(target_ocids, source_ocids)
+    positions = index.join_positions(index.encode(target_ocids), index.encode(source_ocids))
+
+    merged = pd.DataFrame({'ocid': target_ocids}).merge(
+        pd.DataFrame({'ocid': source_ocids, 'position': np.arange(len(source_ocids))}), on='ocid', how='left',
+    )
+    np.testing.assert_array_equal(positions, merged['position'].fillna(-1).astype('int64'))
@@ -0,0 +1,85 @@
+# 파일 위치: tests/test_ranking.py
+"""ranking.py: 부분 선택 TOP K와 리더보드가 전체 안정 정렬과 같은 결과를 내는지."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking import Leaderboard, build_leaderboards, stat_values, top_k_indices
+
+
+def _reference_top(values, k):
+    """전체 안정 정렬의 앞 K개. (NaN 제외, 동점은 앞선 위치부터)"""
+    present = np.flatnonzero(~np.isnan(values))
+    return present[np.argsort(-values[present], kind='stable')][:k]
+
+
+def _random_values(rng, n):
+    # 동점이 많이 생기도록 작은 정수 범위에서 뽑고 일부를 NaN으로 둡니다.
+    values = rng.integers(0, 20, n).astype('float64')
+    values[rng.random(n) < 0.2] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_top_k_matches_stable_sort(seed):
+    rng = np.random.default_rng(seed)
+    values = _random_values(rng, int(rng.integers(1, 300)))
+    for k in (0, 1, 5, 50, len(values), len(values) + 10):
+        np.testing.assert_array_equal(top_k_indices(values, k), _reference_top(values, k))
+
+
+def test_top_k_edge_cases():
+    assert len(top_k_indices([], 3)) == 0
+    assert len(top_k_indices([np.nan, np.nan], 1)) == 0
+    np.testing.assert_array_equal(top_k_indices([1.0, 3.0, 3.0, 2.0, 3.0], 2), [1, 2])
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_leaderboard_top_beyond_precomputed(seed):
+    rng = np.random.default_rng(seed)
+    values = _random_values(rng, 500)
+    board = Leaderboard.build(values, k=10)
+    assert len(board.leaders) == 10
+    for k in (3, 10, 11, 200, 1000):
+        np.testing.assert_array_equal(board.top(k), _reference_top(values, k))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_top_by_group_matches_per_group_sort(seed):
+    rng = np.random.default_rng(seed)
+    values = _random_values(rng, 400)
+    codes = rng.integers(-1, 5, len(values))  # -1은 그룹 없음
+    board = Leaderboard.build(values)
+    picked = board.top_by_group(codes, 7)
+
+    # 전체 값 내림차순(동점은 앞선 위치부터)이므로 그룹별로 잘라도 그 그룹의 순위 순서입니다.
+    ranked = _reference_top(values, len(values))
+    np.testing.assert_array_equal(picked, ranked[np.isin(ranked, picked)])
+    for code in range(5):
+        in_group = np.where(codes == code, values, np.nan)
+        np.testing.assert_array_equal(picked[codes[picked] == code], _reference_top(in_group, 7))
+    assert not (codes[picked] < 0).any()
+
+
+def test_rank_counts_strictly_greater_values():
+    board = Leaderboard.build([5.0, np.nan, 3.0, 5.0, 1.0])
+    assert len(board) == 4
+    assert board.rank(6.0) == 1
+    assert board.rank(5.0) == 1  # 동점은 같은 순위
+    assert board.rank(4.0) == 3
+    assert board.rank(3.0) == 3
+    assert board.rank(0.0) == 5
+    assert board.rank(np.nan) is None
+    assert board.rank(None) is None
+
+
+def test_build_leaderboards_from_frame():
+    frame = pd.DataFrame({
+        '전투력': pd.array([100, None, 300, 200], dtype='Int64'),
+        '스타포스': [10.0, 20.0, np.nan, 20.0],
+    })
+    boards = build_leaderboards(frame, stats=['전투력', '스타포스'])
+    np.testing.assert_array_equal(boards['전투력'].top(10), [2, 3, 0])
+    np.testing.assert_array_equal(boards['스타포스'].top(2), [1, 3])
+    np.testing.assert_array_equal(stat_values(frame, '전투력'), [100.0, np.nan, 300.0, 200.0])
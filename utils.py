@@ -1,44 +1,363 @@
 # 파일 위치: utils.py
 
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 import streamlit as st
 
-# @st.cache_data 데코레이터를 사용하여 데이터 로딩을 캐싱합니다.
-@st.cache_data
-def load_and_preprocess_data(file_path):
+from cache import cached
+
+# --- 성장 로그 컬럼 스키마 ---
+# 파싱 단계에서 바로 dtype을 지정해 object 컬럼이 생기지 않도록 합니다.
+# - ocid·캐릭터 이름은 주차마다 같은 값이 반복되므로 범주(사전 코드)로 둡니다.
+# - 레벨은 Int16, 직업 차수는 UInt8, 접속·해방 여부는 boolean (모두 결측 허용)
+# - 전투력은 최대 수억 단위라 float32로는 정확한 값을 표현할 수 없어 float64를 유지합니다.
+# 컬럼별 메모리 사용량은 memory_report로 확인합니다.
+GROWTH_LOG_DTYPES = {
+    'ocid': 'category',
+    'date': 'string',
+    'character_name': 'category',
+    'world_name': 'category',
+    'character_gender': 'category',
+    'character_class': 'category',
+    'character_class_level': 'UInt8',
+    'character_level': 'Int16',
+    'character_exp': 'Int64',
+    'character_exp_rate': 'float32',
+    'character_guild_name': 'category',
+    'character_date_create': 'string',
+    'access_flag': 'boolean',
+    'liberation_quest_clear': 'boolean',
+    '전투력': 'float64',
+    '보스_데미지': 'float32',
+    '방어율_무시': 'float32',
+    '크리티컬_데미지': 'float32',
+    '아케인포스': 'float32',
+    '어센틱포스': 'float32',
+    '스타포스': 'float32',
+}
+
+# 후보 유저 목록(레벨 260+)은 KPI 계산에 레벨만 필요하므로 이름 컬럼은 읽지 않습니다.
+CANDIDATES_DTYPES = {'level': 'int16'}
+
+# 레벨 구간 (활동 분석·랭킹 등에서 공통으로 사용하는 5레벨 단위 구간)
+LEVEL_BINS = range(260, 301, 5)
+LEVEL_LABELS = [f"{i}~{i+4}" for i in LEVEL_BINS[:-1]]
+
+# 스키마나 전처리 로직이 바뀌면 이 값을 올려 기존 캐시 파일을 무효화합니다.
+SCHEMA_VERSION = 3
+CACHE_DIR = Path('.cache')
+
+# 성장 로그 데이터 위치. CSV 파일이나 ingest.py가 관리하는 날짜별 파티션 저장소(디렉터리)를 가리킵니다.
+GROWTH_LOG_PATH = os.environ.get('GROWTH_LOG_PATH', 'growth_log_v2_f_v2.csv')
+STORE_MANIFEST = 'manifest.json'
+
+# 성장 로그 로딩 방식: memory(전체를 한 프레임으로), stream(growth_stream.py의 청크 집계),
+# auto(원본 크기가 GROWTH_LOG_STREAM_BYTES를 넘으면 stream)
+GROWTH_LOG_MODE = os.environ.get('GROWTH_LOG_MODE', 'auto')
+GROWTH_LOG_STREAM_BYTES = int(os.environ.get('GROWTH_LOG_STREAM_BYTES', 2 * 1024 ** 3))
+
+# 페이지 집계 엔진: pandas(기본) 또는 duckdb(sql_backend.py의 임베디드 DuckDB, duckdb 패키지 필요)
+QUERY_BACKEND = os.environ.get('QUERY_BACKEND', 'pandas')
+
+
+def is_partitioned_store(file_path):
+    return Path(file_path).is_dir()
+
+
+def read_store_manifest(store_dir):
+    """파티션 저장소의 manifest ({'partitions': {'YYYY-MM-DD': {'rows', 'version'}}})를 읽습니다."""
+    path = Path(store_dir) / STORE_MANIFEST
+    if not path.exists():
+        return {'partitions': {}}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def partition_path(store_dir, date):
+    return Path(store_dir) / f"date={pd.Timestamp(date):%Y-%m-%d}.arrow"
+
+
+def use_duckdb():
+    """페이지 집계를 sql_backend.py(DuckDB)로 할지 여부."""
+    return QUERY_BACKEND == 'duckdb'
+
+
+def use_streaming(file_path, mode=None):
+    """성장 로그를 스트리밍 모드로 다룰지 여부. 파티션 저장소는 파티션 파일 크기의 합으로 판단합니다."""
+    mode = mode or GROWTH_LOG_MODE
+    if mode in ('stream', 'memory'):
+        return mode == 'stream'
+    path = Path(file_path)
+    try:
+        size = sum(p.stat().st_size for p in path.glob('date=*.arrow')) if path.is_dir() else path.stat().st_size
+    except OSError:
+        return False
+    return size > GROWTH_LOG_STREAM_BYTES
+
+
+def derivation_variant(file_path=GROWTH_LOG_PATH):
+    """
+    파생 데이터(아티팩트, 미리 만든 차트 JSON)를 가르는 계산 방식: (로딩 모드, 집계 엔진, 스키마 버전).
+    같은 원본이라도 스트리밍 모드의 근사 집계나 DuckDB 결과가 다른 모드에 쓰이지 않도록 키에 넣습니다.
+    """
+    return ('stream' if use_streaming(file_path) else 'memory', QUERY_BACKEND, SCHEMA_VERSION)
+
+
+def _fingerprint(raw):
+    return hashlib.sha1(f"{raw}:{SCHEMA_VERSION}".encode()).hexdigest()[:16]
+
+
+def partition_fingerprints(store_dir):
+    """파티션 저장소의 {'YYYY-MM-DD': 지문}. 지문은 manifest에 기록된 파티션의 version·digest로 만듭니다."""
+    partitions = read_store_manifest(store_dir)['partitions']
+    return {date: _fingerprint(f"{part.get('version')}:{part.get('digest')}") for date, part in partitions.items()}
+
+
+def week_source(file_path, date):
+    """
+    한 주차만 쓰는 캐시의 원본 경로. 파티션 저장소면 그 주차의 파티션 파일이라
+    다른 주차를 적재해도 지문이 그대로이고, CSV면 파일 전체입니다.
+    """
+    return partition_path(file_path, date) if is_partitioned_store(file_path) else file_path
+
+
+def source_fingerprint(file_path):
+    """
+    원본 파일의 크기·수정 시각과 스키마 버전으로 캐시 키를 만듭니다.
+    파티션 저장소는 manifest에 기록된 파티션별 version으로 만들므로, 저장소 전체의 지문은 어느 파티션이
+    바뀌어도 바뀌고, 파티션 파일(week_source)의 지문은 그 파티션이 바뀔 때만 바뀝니다.
+    """
+    path = Path(file_path)
+    if is_partitioned_store(path):
+        os.stat(path / STORE_MANIFEST)  # manifest가 없으면 CSV처럼 FileNotFoundError
+        return _fingerprint(json.dumps(partition_fingerprints(path), sort_keys=True))
+    if path.name.startswith('date=') and (path.parent / STORE_MANIFEST).exists():
+        return partition_fingerprints(path.parent).get(path.stem.split('=', 1)[1], _fingerprint('missing'))
+    stat = os.stat(path)
+    return _fingerprint(f"{stat.st_size}:{stat.st_mtime_ns}")
+
+
+def _snapshot_path(file_path):
+    return CACHE_DIR / f"{Path(file_path).stem}.{source_fingerprint(file_path)}.arrow"
+
+
+def _read_snapshot(snapshot_path, columns=None):
+    # memory_map=True로 열면 여러 워커가 같은 페이지 캐시를 공유합니다.
+    table = feather.read_table(snapshot_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+# 파티션 Arrow 테이블은 (경로, version) 기준으로 프로세스 안에서 재사용하므로,
+# 적재 후에는 version이 바뀐 파티션만 다시 엽니다.
+_PARTITION_TABLES = {}
+
+
+def _partition_table(store_dir, date, version):
+    path = partition_path(store_dir, date)
+    key = str(path.resolve())
+    entry = _PARTITION_TABLES.get(key)
+    if entry is None or entry[0] != version:
+        _PARTITION_TABLES[key] = (version, feather.read_table(path, memory_map=True))
+    return _PARTITION_TABLES[key][1]
+
+
+def read_partition_table(store_dir, date):
+    """파티션 저장소에서 date 주차의 Arrow 테이블 (메모리 매핑, version이 같으면 재사용)."""
+    key = f"{pd.Timestamp(date):%Y-%m-%d}"
+    return _partition_table(store_dir, key, read_store_manifest(store_dir)['partitions'][key]['version'])
+
+
+def _read_partitions(store_dir, dates=None, columns=None):
+    partitions = read_store_manifest(store_dir)['partitions']
+    selected = sorted(partitions)
+    if dates is not None:
+        wanted = {f"{pd.Timestamp(d):%Y-%m-%d}" for d in dates}
+        selected = [d for d in selected if d in wanted]
+    tables = [_partition_table(store_dir, d, partitions[d]['version']) for d in selected]
+    if columns is not None:
+        tables = [table.select(columns) for table in tables]
+    if not tables:
+        return pd.DataFrame(columns=columns or list(GROWTH_LOG_DTYPES))
+    # 파티션마다 범주 사전이 달라도 하나의 categorical로 합쳐집니다.
+    return pa.concat_tables(tables).to_pandas(split_blocks=True)
+
+
+def _write_snapshot(df, snapshot_path):
+    """전처리 결과를 비압축 Arrow IPC 파일로 저장합니다. (압축하면 mmap 이점이 사라집니다)"""
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, snapshot_path)  # 다른 워커가 반쯤 쓰인 파일을 읽지 않도록 원자적으로 교체
+        # 같은 원본에 대한 오래된 스냅샷은 정리합니다.
+        for stale in snapshot_path.parent.glob(f"{snapshot_path.name.rsplit('.', 2)[0]}.*.arrow"):
+            if stale != snapshot_path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        # 읽기 전용 배포 환경 등에서는 캐시 없이 그대로 진행합니다.
+        pass
+
+
+USER_STATUS_LABELS = ['챌린저스 잔류 유저', '월드 리프 유저']
+
+
+def _user_status(df):
+    # 월드 리프한 캐릭터는 캐릭터 정보가 비어 있으므로 이름 결측 여부를 그대로 범주 코드로 씁니다.
+    codes = df['character_name'].isna().to_numpy().astype('int8')
+    return pd.Series(pd.Categorical.from_codes(codes, categories=USER_STATUS_LABELS), index=df.index)
+
+
+def _to_datetime(series):
+    # 날짜 값은 종류가 적으므로 고유값만 파싱한 뒤 코드로 펼칩니다.
+    codes, uniques = pd.factorize(series)
+    parsed = pd.DatetimeIndex(pd.to_datetime(pd.Series(uniques, dtype='string'), errors='coerce'))
+    return pd.Series(parsed.take(codes.clip(min=0)), index=series.index).mask(codes < 0)
+
+
+# --- 모든 페이지에 필요한 공통 전처리 ---
+# (컬럼명, 변환 함수) 목록으로 선언하며, 각 함수는 행 단위 파이썬 콜백 없이
+# 컬럼 전체를 한 번에 처리하는 벡터 연산이어야 합니다.
+PREPROCESS_STEPS = [
+    # 1. 'user_status' 컬럼 생성
+    ('user_status', _user_status),
+    # 2. 날짜 형식 변환
+    ('date', lambda df: _to_datetime(df['date'])),
+    ('character_date_create', lambda df: _to_datetime(df['character_date_create'])),
+    # 3. 숫자 형식 변환 (스키마에 없는 값이 섞여 있어도 안전하게)
+    ('전투력', lambda df: pd.to_numeric(df['전투력'], errors='coerce')),
+    ('character_level', lambda df: pd.to_numeric(df['character_level'], errors='coerce')),
+    # 4. 길드 가입 여부 컬럼 생성
+    ('has_guild', lambda df: df['character_guild_name'].notna()),
+]
+
+
+def preprocess_growth_log(df):
+    """원시 성장 로그 프레임에 PREPROCESS_STEPS를 순서대로 적용합니다."""
+    for column, transform in PREPROCESS_STEPS:
+        df[column] = transform(df)
+
+    # 5. 데이터 정제
+    df.dropna(subset=['ocid'], inplace=True)
+    return df
+
+
+def memory_report(df):
+    """컬럼별 dtype·메모리 사용량(바이트, 행당 바이트, 비중 %) 표. 마지막 행은 합계입니다."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': usage,
+        'bytes_per_row': usage / max(len(df), 1),
+        'share(%)': usage / max(usage.sum(), 1) * 100,
+    })
+    report.loc['(합계)'] = ['', usage.sum(), usage.sum() / max(len(df), 1), 100.0]
+    return report
+
+
+def format_percent(values):
+    """숫자 배열을 '12.3%' 형태의 문자열 배열로 한 번에 변환합니다. (차트 텍스트 라벨용)"""
+    return np.char.mod('%.1f%%', np.asarray(values, dtype='float64'))
+
+
+def _preprocess_growth_log(file_path):
+    return preprocess_growth_log(pd.read_csv(file_path, dtype=GROWTH_LOG_DTYPES))
+
+
+def read_growth_log(file_path, dates=None, columns=None, shared=True):
+    """
+    Streamlit에 의존하지 않는 성장 로그 로더. (오프라인 빌드 스크립트에서도 사용)
+    shared면 dataset_server.py가 같은 원본 지문으로 게시한 프레임(공유 버퍼, 읽기 전용)에 먼저 붙습니다.
+    그렇지 않으면 유효한 Arrow 스냅샷을 메모리 매핑으로 읽고, 없으면 CSV를 전처리한 뒤 스냅샷을 남깁니다.
+    파티션 저장소라면 필요한 날짜(dates)의 파티션만 읽습니다.
+    """
+    if shared:
+        from dataset_server import attach_dataset  # dataset_server가 이 모듈을 임포트하므로 호출 시점에 가져옵니다.
+
+        df = attach_dataset('growth_log', file_path)
+        if df is not None:
+            if columns is not None:
+                df = df[columns]
+            if dates is not None:
+                df = df[df['date'].isin(pd.DatetimeIndex(dates))]
+            return df
+
+    if is_partitioned_store(file_path):
+        return _read_partitions(file_path, dates=dates, columns=columns)
+
+    snapshot_path = _snapshot_path(file_path)
+    if snapshot_path.exists():
+        df = _read_snapshot(snapshot_path, columns=columns)
+    else:
+        df = _preprocess_growth_log(file_path)
+        _write_snapshot(df, snapshot_path)
+        if columns is not None:
+            df = df[columns]
+
+    if dates is not None:
+        df = df[df['date'].isin(pd.DatetimeIndex(dates))]
+    return df
+
+
+def growth_log_dates(file_path):
+    """성장 로그에 들어 있는 날짜 목록(오름차순 Timestamp)."""
+    if is_partitioned_store(file_path):
+        return [pd.Timestamp(d) for d in sorted(read_store_manifest(file_path)['partitions'])]
+    dates = read_growth_log(file_path, columns=['date'])['date'].dropna().unique()
+    return [pd.Timestamp(d) for d in sorted(dates)]
+
+
+# 공용 캐시(cache.py)로 데이터 로딩을 캐싱합니다.
+# 키는 경로 + 원본(또는 저장소 manifest) 지문이라, 파일이 바뀌면 새 항목으로 다시 읽고 옛 항목은 LRU로 밀려납니다.
+@cached('growth_log', max_entries=2, sources=lambda file_path: [file_path])
+def _load_growth_log(file_path):
+    return read_growth_log(file_path)
+
+
+def load_and_preprocess_data(file_path=GROWTH_LOG_PATH):
     """
     데이터를 로드하고 모든 페이지에 필요한 공통 전처리를 수행하는 함수.
     이 함수가 이제 '데이터의 유일한 진실 공급원'이 됩니다.
+
+    전처리 결과는 원본 파일 지문으로 키를 잡은 Arrow 스냅샷(.cache/)으로 저장되며,
+    이후 프로세스는 CSV 파싱 대신 이 파일을 메모리 매핑해서 읽습니다.
     """
     try:
-        df = pd.read_csv(file_path)
-        
-        # --- 모든 페이지에 필요한 공통 전처리 ---
-        
-        # 1. 'user_status' 컬럼 생성
-        df['user_status'] = df['character_name'].apply(
-            lambda x: '월드 리프 유저' if pd.isna(x) else '챌린저스 잔류 유저'
-        )
-        
-        # 2. 날짜 형식 변환
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        df['character_date_create'] = pd.to_datetime(df['character_date_create'], errors='coerce')
-
-        # 3. 숫자 형식 변환
-        df['전투력'] = pd.to_numeric(df['전투력'], errors='coerce')
-        df['character_level'] = pd.to_numeric(df['character_level'], errors='coerce')
-        
-        # 4. 길드 가입 여부 컬럼 생성
-        df['has_guild'] = df['character_guild_name'].notna()
-
-        # 5. 데이터 정제
-        df.dropna(subset=['ocid'], inplace=True)
-        
-        return df
+        return _load_growth_log(file_path)
 
     except FileNotFoundError:
         st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
         return pd.DataFrame() # 오류 발생 시 빈 데이터프레임 반환
     except Exception as e:
         st.error(f"데이터 처리 중 오류 발생: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+
+@cached('candidate_levels', max_entries=2, sources=lambda file_path: [file_path])
+def _load_candidate_level_histogram(file_path):
+    levels = pd.read_csv(file_path, usecols=list(CANDIDATES_DTYPES), dtype=CANDIDATES_DTYPES)['level']
+    return np.bincount(levels.to_numpy())
+
+
+def load_candidate_level_histogram(file_path):
+    """
+    후보 유저 파일의 레벨별 인원수 배열(인덱스 = 레벨)을 반환합니다.
+    레벨 구간 KPI는 count_level_band로 이 배열에서 바로 계산합니다.
+    """
+    try:
+        return _load_candidate_level_histogram(file_path)
+    except FileNotFoundError:
+        st.error(f"데이터 파일을 찾을 수 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return np.zeros(0, dtype='int64')
+
+
+def count_level_band(level_histogram, low=None, high=None):
+    """레벨 low 이상 high 이하(각각 생략 가능) 유저 수."""
+    start = 0 if low is None else low
+    stop = len(level_histogram) if high is None else high + 1
+    return int(level_histogram[start:stop].sum())